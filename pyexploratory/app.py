@@ -15,18 +15,32 @@ import dash
 import dash_bootstrap_components as dbc
 import pandas as pd
 import plotly.express as px
-from dash import Dash, dcc, html
-from dash.dependencies import Input, Output
+from dash import Dash, dcc, html, no_update
+from dash.dependencies import Input, Output, State
 
+from pyexploratory.background import background_callback_manager
 from pyexploratory.components.styles import DOWNLOAD_BUTTON_STYLE
 from pyexploratory.config import (
     CONTENT_STYLE,
     DARK_GREEN,
-    DATA_FILE,
     GREY,
     SIDEBAR_BG,
     SIDEBAR_STYLE,
 )
+from pyexploratory.core.data_store import (
+    export_csv,
+    export_feather,
+    export_parquet,
+    export_xlsx,
+    is_chunked_mode,
+    read_data,
+)
+from pyexploratory.routes import register_routes
+
+# Copy-on-Write is always on from pandas 3.0; opt in explicitly before that.
+# read_data shares cached columns with every caller and relies on it.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
 
 # Set the default template for Plotly Express
 px.defaults.template = "plotly_dark"
@@ -38,7 +52,10 @@ app = Dash(
     use_pages=True,
     external_stylesheets=[dbc.themes.BOOTSTRAP],
     suppress_callback_exceptions=True,
+    background_callback_manager=background_callback_manager,
 )
+# JSON endpoints served next to the Dash app (resumable uploads)
+register_routes(app.server)
 
 # Sidebar navigation
 sidebar = html.Div(
@@ -68,12 +85,28 @@ app.layout = dbc.Container(
                         ),
                         sidebar,
                         dcc.Download(id="download-data"),
+                        dcc.Dropdown(
+                            id="download-format",
+                            options=[
+                                {"label": "Excel (.xlsx)", "value": "xlsx"},
+                                {"label": "CSV (.csv)", "value": "csv"},
+                                {"label": "Parquet (.parquet)", "value": "parquet"},
+                                {"label": "Feather (.feather)", "value": "feather"},
+                            ],
+                            value="xlsx",
+                            clearable=False,
+                            style={"marginTop": "10px"},
+                        ),
                         html.Button(
                             "Download Data",
                             id="btn-download",
                             n_clicks=0,
                             style=DOWNLOAD_BUTTON_STYLE,
                         ),
+                        html.Div(
+                            id="download-error",
+                            style={"color": "#e67e22", "fontSize": "13px"},
+                        ),
                     ],
                     xs=4,
                     sm=4,
@@ -125,16 +158,31 @@ def update_sidebar(pathname):
     ]
 
 
+# Formats streamed from the store without loading the dataset into pandas
+_EXPORTERS = {"csv": export_csv, "parquet": export_parquet, "feather": export_feather}
+
+
 @dash.callback(
     Output("download-data", "data"),
+    Output("download-error", "children"),
     Input("btn-download", "n_clicks"),
+    State("download-format", "value"),
     prevent_initial_call=True,
 )
-def download_data(n_clicks):
-    """Download current data as Excel."""
-    if n_clicks:
-        df = pd.read_csv(DATA_FILE)
-        return dcc.send_data_frame(df.to_excel, "mydata.xlsx")
+def download_data(n_clicks, fmt):
+    """Download current data in the chosen format."""
+    if not n_clicks:
+        return no_update, no_update
+    if fmt in _EXPORTERS:
+        return dcc.send_bytes(_EXPORTERS[fmt], f"mydata.{fmt}"), ""
+    if is_chunked_mode():
+        # Streamed, so the large dataset is never loaded whole
+        try:
+            return dcc.send_bytes(export_xlsx, "mydata.xlsx"), ""
+        except ValueError as e:
+            return no_update, str(e)
+    df = read_data()
+    return dcc.send_data_frame(df.to_excel, "mydata.xlsx"), ""
 
 
 # Import callback modules to trigger their @dash.callback() registrations
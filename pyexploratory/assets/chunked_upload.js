@@ -0,0 +1,106 @@
+/*
+ * Resumable chunked upload for files too large for dcc.Upload.
+ *
+ * The file is sent as raw byte ranges to /api/uploads (see
+ * pyexploratory/routes/uploads.py), never base64-encoded or held in memory
+ * whole. The upload id is remembered per file, so choosing the same file
+ * again after a failure resumes where the server's copy ends. When every
+ * byte has arrived, the id is handed to Dash through the
+ * "chunked-upload-done" store and a server callback parses the file.
+ */
+(function () {
+    const API = "/api/uploads";
+    const MAX_RETRIES = 5;
+
+    function storageKey(file) {
+        return `pyexploratory-upload:${file.name}:${file.size}:${file.lastModified}`;
+    }
+
+    function setStatus(text) {
+        window.dash_clientside.set_props("chunked-upload-status", {children: text});
+    }
+
+    async function startOrResume(file) {
+        const saved = localStorage.getItem(storageKey(file));
+        if (saved) {
+            const response = await fetch(`${API}/${saved}`);
+            if (response.ok) {
+                return response.json();
+            }
+        }
+        const response = await fetch(API, {
+            method: "POST",
+            headers: {"Content-Type": "application/json"},
+            body: JSON.stringify({filename: file.name, size: file.size}),
+        });
+        const state = await response.json();
+        if (!response.ok) {
+            throw new Error(state.error);
+        }
+        localStorage.setItem(storageKey(file), state.upload_id);
+        return state;
+    }
+
+    async function sendChunks(file, state) {
+        let offset = state.received;
+        let retries = 0;
+        while (offset < file.size) {
+            setStatus(`Uploading ${file.name}: ${Math.floor((100 * offset) / file.size)}%`);
+            let response;
+            try {
+                response = await fetch(`${API}/${state.upload_id}`, {
+                    method: "PATCH",
+                    headers: {
+                        "Content-Type": "application/octet-stream",
+                        "Upload-Offset": String(offset),
+                    },
+                    body: file.slice(offset, offset + state.chunk_size),
+                });
+            } catch (error) {
+                // Connection dropped: wait, ask the server where to resume
+                if (++retries > MAX_RETRIES) {
+                    throw error;
+                }
+                await new Promise((resolve) => setTimeout(resolve, 1000 * retries));
+                const current = await fetch(`${API}/${state.upload_id}`);
+                offset = (await current.json()).received;
+                continue;
+            }
+            const body = await response.json();
+            if (!response.ok && response.status !== 409) {
+                throw new Error(body.error);
+            }
+            // 409: the server holds a different byte count; resume from it
+            offset = body.received;
+            retries = 0;
+        }
+    }
+
+    async function upload(file) {
+        try {
+            const state = await startOrResume(file);
+            await sendChunks(file, state);
+            localStorage.removeItem(storageKey(file));
+            setStatus(`Processing ${file.name}...`);
+            window.dash_clientside.set_props("chunked-upload-done", {
+                data: {upload_id: state.upload_id, filename: file.name},
+            });
+        } catch (error) {
+            setStatus(`Upload of ${file.name} failed: ${error.message}. Choose the file again to resume.`);
+        }
+    }
+
+    document.addEventListener("click", (event) => {
+        if (!event.target.closest("#chunked-upload-button")) {
+            return;
+        }
+        const input = document.createElement("input");
+        input.type = "file";
+        input.addEventListener("change", () => {
+            if (input.files.length) {
+                upload(input.files[0]);
+            }
+        });
+        input.click();
+    });
+})();
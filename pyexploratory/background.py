@@ -0,0 +1,27 @@
+"""
+Manager for Dash background callbacks.
+
+A background callback runs in its own process while the browser polls
+for its result, so a long upload neither holds a request open nor blocks
+the page, and it can report progress as it goes. This needs the optional
+dash[diskcache] extra; without it BACKGROUND_CALLBACKS is False and such
+callbacks run as regular ones, showing their progress only at the end.
+"""
+
+from typing import Optional
+
+from pyexploratory.config import BACKGROUND_CACHE_DIR
+
+background_callback_manager: Optional["DiskcacheManager"]
+
+try:
+    import diskcache
+    from dash import DiskcacheManager
+
+    background_callback_manager = DiskcacheManager(
+        diskcache.Cache(BACKGROUND_CACHE_DIR)
+    )
+except ImportError:
+    background_callback_manager = None
+
+BACKGROUND_CALLBACKS = background_callback_manager is not None
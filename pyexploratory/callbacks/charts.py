@@ -14,7 +14,8 @@ from dash import dcc, html
 from dash.dependencies import Input, Output, State
 
 from pyexploratory.config import LIGHT_GREEN
-from pyexploratory.core.data_store import read_data
+from pyexploratory.core.data_store import get_catalog, read_data
+from pyexploratory.core.result_cache import cached_result
 from pyexploratory.tabs.charts import CHART_CONTROLS
 
 _DARK_LAYOUT = dict(
@@ -23,6 +24,8 @@ _DARK_LAYOUT = dict(
     plot_bgcolor="rgba(0,0,0,0)",
 )
 
+_NUMERIC_MATRIX_CHARTS = {"heatmap", "pairplot", "correlation"}
+
 
 # ---------------------------------------------------------------------------
 # Toggle chart controls visibility based on chart type
@@ -78,15 +81,23 @@ def generate_chart(n_clicks, chart_type, x_col, y_col, color_col, size_col):
         return html.Div("Select a chart type and click Generate.", style={"color": "white"})
 
     try:
-        df = read_data()
+        catalog = get_catalog()
     except FileNotFoundError:
         return dbc.Alert("Upload data first.", color="warning")
+    available = catalog.columns
 
     # Clear empty strings to None for cleaner logic
     x_col = x_col or None
     y_col = y_col or None
-    color_col = color_col if color_col and color_col in df.columns else None
-    size_col = size_col if size_col and size_col in df.columns else None
+    color_col = color_col if color_col and color_col in available else None
+    size_col = size_col if size_col and size_col in available else None
+
+    # Matrix charts scan every numeric column; the rest only need the
+    # selected ones
+    selected = [x_col, y_col, color_col, size_col]
+    if chart_type in _NUMERIC_MATRIX_CHARTS:
+        selected = [c for c, info in available.items() if info.numeric] + [color_col]
+    columns = [c for c in selected if c in available]
 
     try:
         builders = {
@@ -108,7 +119,20 @@ def generate_chart(n_clicks, chart_type, x_col, y_col, color_col, size_col):
         builder = builders.get(chart_type)
         if not builder:
             return html.Div("Unknown chart type.", style={"color": "white"})
-        return builder(df, x_col, y_col, color_col, size_col)
+        params = {
+            "type": chart_type,
+            "x": x_col,
+            "y": y_col,
+            "color": color_col,
+            "size": size_col,
+        }
+        return cached_result(
+            "chart",
+            params,
+            lambda: builder(
+                read_data(columns=columns), x_col, y_col, color_col, size_col
+            ),
+        )
     except Exception as e:
         return dbc.Alert(f"Chart error: {e}", color="danger")
 
@@ -16,6 +16,7 @@ from dash.dependencies import Input, Output, State
 from pyexploratory.config import LIGHT_GREEN
 from pyexploratory.core.data_store import (
     categorical_column_options,
+    get_catalog,
     numeric_column_options,
     read_data,
 )
@@ -24,7 +25,11 @@ from pyexploratory.core.ml_clustering import compute_elbow, run_kmeans
 from pyexploratory.core.ml_decision_tree import run_decision_tree
 from pyexploratory.core.ml_random_forest import run_random_forest
 from pyexploratory.core.ml_regression import run_linear_regression
-from pyexploratory.core.validators import validate_ml_inputs
+from pyexploratory.core.result_cache import cached_result
+from pyexploratory.core.validators import (
+    validate_classification_target,
+    validate_ml_inputs,
+)
 
 _DARK_LAYOUT = dict(
     template="plotly_dark",
@@ -72,12 +77,12 @@ def toggle_ml_controls(task):
 def update_ml_dropdowns(task):
     """Populate feature and target dropdowns based on task type."""
     try:
-        df = read_data()
+        catalog = get_catalog()
     except FileNotFoundError:
         return [], [], [], [], [], []
 
-    feature_opts = numeric_column_options(df)
-    cat_opts = categorical_column_options(df)
+    feature_opts = numeric_column_options(catalog)
+    cat_opts = categorical_column_options(catalog)
 
     return feature_opts, feature_opts, cat_opts, cat_opts, cat_opts, feature_opts
 
@@ -114,8 +119,16 @@ def perform_machine_learning(
     reg_target, reg_test_size,
 ):
     """Run the selected ML task and return visualization."""
+    # Only load the columns the selected task actually uses
+    task_columns = {
+        "clustering": [x_variable, y_variable],
+        "classification": [x_variable, y_variable, target_variable],
+        "decision_tree": [x_variable, y_variable, dt_target],
+        "random_forest": [x_variable, y_variable, rf_target],
+        "regression": [x_variable, reg_target],
+    }
     try:
-        df = read_data()
+        catalog = get_catalog()
     except FileNotFoundError:
         return dbc.Alert("Data file not found. Please upload data.", color="warning")
 
@@ -123,6 +136,9 @@ def perform_machine_learning(
     if task not in valid_tasks:
         return html.Div("Select a valid task.", style={"color": "white"})
 
+    needed = [c for c in task_columns[task] if c in catalog.columns]
+    df = read_data(columns=needed)
+
     # Regression uses x-variable and regression-target (both numeric)
     if task == "regression":
         if not x_variable or not reg_target:
@@ -136,7 +152,15 @@ def perform_machine_learning(
     if not x_variable or not y_variable:
         return html.Div("Select x and y variables.", style={"color": "white"})
 
-    error = validate_ml_inputs(df, x_variable, y_variable)
+    # Validate against the write-time catalog, not the row data
+    error = validate_ml_inputs(catalog, x_variable, y_variable)
+    target = {
+        "classification": target_variable,
+        "decision_tree": dt_target,
+        "random_forest": rf_target,
+    }.get(task)
+    if not error and target in catalog.columns:
+        error = validate_classification_target(catalog, target)
     if error:
         return dbc.Alert(error, color="warning")
 
@@ -175,8 +199,13 @@ def perform_machine_learning(
 
 def _render_clustering(df, x_variable, y_variable, n_clusters):
     """Build clustering visualization components."""
-    result = run_kmeans(df, x_variable, y_variable, n_clusters)
-    elbow = compute_elbow(df, x_variable, y_variable)
+    params = {"x": x_variable, "y": y_variable, "n_clusters": n_clusters}
+    result = cached_result(
+        "kmeans", params, lambda: run_kmeans(df, x_variable, y_variable, n_clusters)
+    )
+    elbow = cached_result(
+        "elbow", params, lambda: compute_elbow(df, x_variable, y_variable)
+    )
 
     fig = go.Figure()
     fig.add_trace(
@@ -228,7 +257,18 @@ def _render_clustering(df, x_variable, y_variable, n_clusters):
 
 def _render_classification(df, x_variable, y_variable, target_variable, kernel, test_size):
     """Build SVM classification visualization components."""
-    result = run_svm(df, x_variable, y_variable, target_variable, kernel, test_size)
+    params = {
+        "x": x_variable,
+        "y": y_variable,
+        "target": target_variable,
+        "kernel": kernel,
+        "test_size": test_size,
+    }
+    result = cached_result(
+        "svm",
+        params,
+        lambda: run_svm(df, x_variable, y_variable, target_variable, kernel, test_size),
+    )
 
     fig_cm = go.Figure(go.Heatmap(
         z=result.cm, x=result.display_labels, y=result.display_labels,
@@ -267,7 +307,20 @@ def _render_classification(df, x_variable, y_variable, target_variable, kernel,
 
 def _render_decision_tree(df, x_variable, y_variable, target, max_depth, test_size):
     """Build Decision Tree visualization components."""
-    result = run_decision_tree(df, x_variable, y_variable, target, max_depth, test_size)
+    params = {
+        "x": x_variable,
+        "y": y_variable,
+        "target": target,
+        "max_depth": max_depth,
+        "test_size": test_size,
+    }
+    result = cached_result(
+        "decision_tree",
+        params,
+        lambda: run_decision_tree(
+            df, x_variable, y_variable, target, max_depth, test_size
+        ),
+    )
 
     fig_cm = go.Figure(go.Heatmap(
         z=result.cm, x=result.display_labels, y=result.display_labels,
@@ -292,7 +345,21 @@ def _render_decision_tree(df, x_variable, y_variable, target, max_depth, test_si
 
 def _render_random_forest(df, x_variable, y_variable, target, n_estimators, max_depth, test_size):
     """Build Random Forest visualization components."""
-    result = run_random_forest(df, x_variable, y_variable, target, n_estimators, max_depth, test_size)
+    params = {
+        "x": x_variable,
+        "y": y_variable,
+        "target": target,
+        "n_estimators": n_estimators,
+        "max_depth": max_depth,
+        "test_size": test_size,
+    }
+    result = cached_result(
+        "random_forest",
+        params,
+        lambda: run_random_forest(
+            df, x_variable, y_variable, target, n_estimators, max_depth, test_size
+        ),
+    )
 
     fig_cm = go.Figure(go.Heatmap(
         z=result.cm, x=result.display_labels, y=result.display_labels,
@@ -323,7 +390,12 @@ def _render_random_forest(df, x_variable, y_variable, target, n_estimators, max_
 
 def _render_regression(df, x_col, y_col, test_size):
     """Build Linear Regression visualization components."""
-    result = run_linear_regression(df, x_col, y_col, test_size)
+    params = {"x": x_col, "y": y_col, "test_size": test_size}
+    result = cached_result(
+        "linear_regression",
+        params,
+        lambda: run_linear_regression(df, x_col, y_col, test_size),
+    )
 
     # Actual vs Predicted scatter
     fig_pred = go.Figure()
@@ -1,6 +1,6 @@
 """
 Callbacks for the Table tab — save edits, cleaning with confirmation,
-undo/redo, preview, and history log.
+queued cleaning steps, undo/redo, preview, and history log.
 """
 
 import json
@@ -11,11 +11,38 @@ import pandas as pd
 from dash import html, no_update
 from dash.dependencies import Input, Output, State
 
-from pyexploratory.core.cleaning_ops import OPERATIONS, apply_operation
-from pyexploratory.core.data_store import read_data, write_data
+from pyexploratory.core.cleaning_ops import (
+    OPERATIONS,
+    CleaningStep,
+    can_stream,
+    column_label,
+    parse_columns,
+    recipe_description,
+)
+from pyexploratory.core.cleaning_plan import CleaningPlan
+from pyexploratory.core.data_store import (
+    get_catalog,
+    is_chunked_mode,
+    iter_chunks,
+    list_columns,
+    read_data,
+    transform_chunks,
+    write_data,
+)
 from pyexploratory.core import history
-from pyexploratory.core.validators import validate_cleaning_compatibility
-from pyexploratory.tabs.table import DESTRUCTIVE_OPS
+from pyexploratory.core.preview import preview_chunks, preview_operation
+from pyexploratory.core.result_cache import cached_result
+from pyexploratory.core.validators import (
+    validate_cleaning_compatibility,
+    validate_columns,
+    validate_recipe,
+)
+from pyexploratory.tabs.table import CHUNKED_PREVIEW_ROWS, DESTRUCTIVE_OPS
+
+_CHUNKED_UNSUPPORTED = (
+    "'{operation}' needs the whole dataset in memory and is not available "
+    "for a dataset this large."
+)
 
 # ---------------------------------------------------------------------------
 # Save inline table edits
@@ -28,8 +55,9 @@ from pyexploratory.tabs.table import DESTRUCTIVE_OPS
     State("table", "data"),
 )
 def save_changes(n_clicks, rows):
-    """Save inline table edits back to CSV."""
-    if n_clicks is not None and n_clicks > 0:
+    """Save inline table edits back to disk."""
+    # In chunked mode the table only holds a read-only preview of the rows
+    if n_clicks is not None and n_clicks > 0 and not is_chunked_mode():
         write_data(pd.DataFrame(rows))
     return rows
 
@@ -41,6 +69,8 @@ def save_changes(n_clicks, rows):
 def save_table_feedback(n_clicks):
     """Show confirmation after saving."""
     if n_clicks is not None:
+        if is_chunked_mode():
+            return "Inline edits are not available for a dataset this large."
         return "Changes have been saved."
 
 
@@ -68,9 +98,9 @@ def handle_clean_click(
     if not n_clicks:
         return no_update, no_update, no_update, no_update
 
-    # Validate inputs first
+    # Validate inputs first, against the catalog rather than the row data
     try:
-        df = read_data()
+        catalog = get_catalog()
     except FileNotFoundError:
         return (
             dbc.Alert("Data file not found. Upload data first.", color="warning"),
@@ -79,10 +109,14 @@ def handle_clean_click(
             "",
         )
 
-    if not column_to_clean or column_to_clean not in df.columns:
+    # One column, several separated by commas, or a selector such as "@text"
+    column_to_clean = parse_columns(column_to_clean, list(catalog.columns))
+    error = validate_columns(catalog, column_to_clean) if column_to_clean else None
+    if not column_to_clean or error:
         return (
             dbc.Alert(
-                f"Column '{column_to_clean}' not found in data.", color="warning"
+                error or f"Column '{column_to_clean}' not found in data.",
+                color="warning",
             ),
             None,
             False,
@@ -98,10 +132,21 @@ def handle_clean_click(
         )
 
     # Type compatibility check (e.g. lowercase on numeric column)
-    error = validate_cleaning_compatibility(df, operation, column_to_clean)
+    error = validate_cleaning_compatibility(catalog, operation, column_to_clean)
     if error:
         return dbc.Alert(error, color="warning"), None, False, ""
 
+    # Large datasets are cleaned chunk by chunk, which needs a row-local op
+    if is_chunked_mode() and not can_stream(operation, fill_value):
+        return (
+            dbc.Alert(
+                _CHUNKED_UNSUPPORTED.format(operation=operation), color="warning"
+            ),
+            None,
+            False,
+            "",
+        )
+
     # Destructive? → open confirmation modal
     if operation in DESTRUCTIVE_OPS:
         op_label = next(
@@ -116,12 +161,15 @@ def handle_clean_click(
                 "new_name": new_column_name,
             }
         )
-        body = f'Are you sure you want to apply "{op_label}" on column "{column_to_clean}"? This may remove data.'
+        body = (
+            f'Are you sure you want to apply "{op_label}" on '
+            f'"{column_label(column_to_clean)}"? This may remove data.'
+        )
         return no_update, pending, True, body
 
     # Non-destructive → execute immediately
     return (
-        _execute_cleaning(df, operation, column_to_clean, fill_value, new_column_name),
+        _execute_cleaning(operation, column_to_clean, fill_value, new_column_name),
         None,
         False,
         "",
@@ -145,31 +193,159 @@ def _get_op_labels():
     Output("cleaning-toast", "icon"),
     Output("cleaning-toast", "is_open"),
     Output("confirm-modal", "is_open", allow_duplicate=True),
+    Output("cleaning-queue", "data", allow_duplicate=True),
     Input("confirm-execute", "n_clicks"),
     Input("confirm-cancel", "n_clicks"),
     State("pending-operation", "data"),
     prevent_initial_call=True,
 )
 def handle_confirm(confirm_clicks, cancel_clicks, pending_data):
-    """Execute or cancel the pending destructive operation."""
+    """Execute or cancel the pending destructive operation or queue."""
     triggered = dash.ctx.triggered_id
 
     if triggered == "confirm-cancel" or not pending_data:
-        return "Operation cancelled.", "warning", True, False
+        return "Operation cancelled.", "warning", True, False, no_update
 
-    # Execute the stored operation
+    # Execute the stored operation, or the queue it came from
     try:
         op = json.loads(pending_data)
-        df = read_data()
-        # Save snapshot before destructive operation
-        history.save_snapshot(op["operation"], op["column"], f"{op['operation']} on {op['column']}")
-        df = apply_operation(
-            df, op["operation"], op["column"], op["fill_value"], op["new_name"]
+        if "steps" in op:
+            _apply_recipe_and_save(_queued_steps(op["steps"]))
+            return "Queued steps applied and saved.", "success", True, False, []
+        _apply_and_save(op["operation"], op["column"], op["fill_value"], op["new_name"])
+        return "Data cleaning applied and saved.", "success", True, False, no_update
+    except Exception as e:
+        return f"Cleaning error: {e}", "danger", True, False, no_update
+
+
+# ---------------------------------------------------------------------------
+# Cleaning queue: collect steps, then apply them with one read and write
+# ---------------------------------------------------------------------------
+
+
+@dash.callback(
+    Output("cleaning-queue", "data"),
+    Output("cleaning-result", "children", allow_duplicate=True),
+    Input("queue-add-btn", "n_clicks"),
+    Input("queue-clear-btn", "n_clicks"),
+    State("column-to-clean", "value"),
+    State("cleaning-operation", "value"),
+    State("fill-value", "value"),
+    State("new-column-name", "value"),
+    State("cleaning-queue", "data"),
+    prevent_initial_call=True,
+)
+def update_queue(
+    add_clicks, clear_clicks, column, operation, fill_value, new_name, queue
+):
+    """Add the selected operation to the queue, or empty the queue."""
+    if dash.ctx.triggered_id == "queue-clear-btn":
+        return [], None
+    if not add_clicks:
+        return no_update, no_update
+    if not operation or operation not in OPERATIONS:
+        return no_update, dbc.Alert(
+            "Select a valid cleaning operation.", color="warning"
+        )
+    try:
+        catalog = get_catalog()
+    except FileNotFoundError:
+        return no_update, dbc.Alert(
+            "Data file not found. Upload data first.", color="warning"
+        )
+
+    column = parse_columns(column, list(catalog.columns))
+    steps = _queued_steps(queue) + [
+        CleaningStep(operation, column, fill_value, new_name)
+    ]
+    # Checked against the columns as the earlier queued steps leave them
+    error = validate_recipe(catalog, steps)
+    if error:
+        return no_update, dbc.Alert(error, color="warning")
+    if is_chunked_mode() and not can_stream(operation, fill_value):
+        return no_update, dbc.Alert(
+            _CHUNKED_UNSUPPORTED.format(operation=operation), color="warning"
+        )
+    return [step._asdict() for step in steps], None
+
+
+@dash.callback(
+    Output("cleaning-queue-list", "children"),
+    Input("cleaning-queue", "data"),
+)
+def render_queue(queue):
+    """List the queued steps in the order they will run."""
+    steps = _queued_steps(queue)
+    if not steps:
+        return html.Div("No steps queued.", style={"color": "#888"})
+    items = [
+        html.Div(f"{i}. {step.description}", style={"padding": "2px 0"})
+        for i, step in enumerate(steps, 1)
+    ]
+    optimized = CleaningPlan(tuple(steps)).optimized()
+    if len(steps) > 1 and optimized.steps != tuple(steps):
+        items.append(
+            html.Div(
+                "Runs as: " + ", ".join(optimized.explain()),
+                style={"color": "#888", "padding": "2px 0"},
+            )
+        )
+    return items
+
+
+@dash.callback(
+    Output("cleaning-result", "children", allow_duplicate=True),
+    Output("pending-operation", "data", allow_duplicate=True),
+    Output("confirm-modal", "is_open", allow_duplicate=True),
+    Output("confirm-modal-body", "children", allow_duplicate=True),
+    Output("cleaning-queue", "data", allow_duplicate=True),
+    Input("queue-apply-btn", "n_clicks"),
+    State("cleaning-queue", "data"),
+    prevent_initial_call=True,
+)
+def handle_queue_apply(n_clicks, queue):
+    """Apply the queued steps; a queue that may remove data is confirmed first."""
+    steps = _queued_steps(queue)
+    if not n_clicks or not steps:
+        return (
+            dbc.Alert("No steps queued.", color="info"),
+            no_update,
+            no_update,
+            no_update,
+            no_update,
         )
-        write_data(df)
-        return "Data cleaning applied and saved.", "success", True, False
+
+    destructive = [s.description for s in steps if s.operation in DESTRUCTIVE_OPS]
+    if destructive:
+        body = (
+            f"The queue includes {', '.join(destructive)}, which may remove "
+            f"data. Apply all {len(steps)} steps?"
+        )
+        return no_update, json.dumps({"steps": queue}), True, body, no_update
+
+    try:
+        _apply_recipe_and_save(steps)
     except Exception as e:
-        return f"Cleaning error: {e}", "danger", True, False
+        # The queue is kept so a step can be fixed and the queue retried
+        return (
+            dbc.Alert(f"Cleaning error: {e}", color="danger"),
+            None,
+            False,
+            "",
+            no_update,
+        )
+    return (
+        dbc.Alert(f"Applied {len(steps)} queued steps and saved.", color="success"),
+        None,
+        False,
+        "",
+        [],
+    )
+
+
+def _queued_steps(queue):
+    """CleaningSteps from the queue store's JSON."""
+    return [CleaningStep(**step) for step in queue or []]
 
 
 # ---------------------------------------------------------------------------
@@ -187,10 +363,9 @@ def undo_callback(n_clicks):
     """Undo the last cleaning operation."""
     if not n_clicks:
         return no_update, no_update
-    df = history.undo()
-    if df is None:
+    if not history.restore_previous():
         return no_update, dbc.Alert("Nothing to undo.", color="info")
-    return df.to_dict("records"), dbc.Alert("Undo successful.", color="success")
+    return _table_rows(), dbc.Alert("Undo successful.", color="success")
 
 
 @dash.callback(
@@ -203,10 +378,9 @@ def redo_callback(n_clicks):
     """Redo a previously undone operation."""
     if not n_clicks:
         return no_update, no_update
-    df = history.redo()
-    if df is None:
+    if not history.restore_next():
         return no_update, dbc.Alert("Nothing to redo.", color="info")
-    return df.to_dict("records"), dbc.Alert("Redo successful.", color="success")
+    return _table_rows(), dbc.Alert("Redo successful.", color="success")
 
 
 # ---------------------------------------------------------------------------
@@ -219,6 +393,7 @@ def redo_callback(n_clicks):
     [
         Input("clean-data-btn", "n_clicks"),
         Input("confirm-execute", "n_clicks"),
+        Input("queue-apply-btn", "n_clicks"),
         Input("undo-btn", "n_clicks"),
         Input("redo-btn", "n_clicks"),
     ],
@@ -258,10 +433,20 @@ def update_history_log(*_):
     State("cleaning-operation", "value"),
     State("fill-value", "value"),
     State("new-column-name", "value"),
+    State("preview-exact", "value"),
     State("preview-modal", "is_open"),
     prevent_initial_call=True,
 )
-def preview_callback(preview_clicks, close_clicks, column, operation, fill_value, new_name, is_open):
+def preview_callback(
+    preview_clicks,
+    close_clicks,
+    column,
+    operation,
+    fill_value,
+    new_name,
+    exact,
+    is_open,
+):
     """Show a preview of the cleaning operation's effect."""
     triggered = dash.ctx.triggered_id
 
@@ -272,37 +457,132 @@ def preview_callback(preview_clicks, close_clicks, column, operation, fill_value
         return False, ""
 
     try:
-        df = read_data()
-        if column not in df.columns:
-            return True, dbc.Alert(f"Column '{column}' not found.", color="warning")
-        result = history.preview_operation(df, operation, column, fill_value, new_name)
-        body = html.Div(
-            [
-                html.P(f"Rows before: {result['rows_before']}", style={"color": "white"}),
-                html.P(f"Rows after: {result['rows_after']}", style={"color": "white"}),
-                html.P(
-                    f"Rows affected: {result['rows_affected']}",
-                    style={"color": "#e67e22", "fontWeight": "600"},
-                ),
-            ]
+        catalog = get_catalog()
+        column = parse_columns(column, list(catalog.columns))
+        error = validate_columns(catalog, column)
+        if error:
+            return True, dbc.Alert(error, color="warning")
+        # Large datasets are sampled chunk by chunk, never loaded whole
+        chunked = is_chunked_mode()
+        if chunked and not can_stream(operation, fill_value):
+            return True, dbc.Alert(
+                _CHUNKED_UNSUPPORTED.format(operation=operation), color="warning"
+            )
+        exact = bool(exact) and not chunked
+        params = {
+            "operation": operation,
+            "column": column,
+            "fill_value": fill_value,
+            "new_name": new_name,
+            "exact": exact,
+        }
+        result = cached_result(
+            "preview",
+            params,
+            lambda: (
+                preview_chunks(
+                    iter_chunks(), catalog.rows, operation, column, fill_value, new_name
+                )
+                if chunked
+                else preview_operation(
+                    read_data(), operation, column, fill_value, new_name, exact=exact
+                )
+            ),
         )
-        return True, body
+        return True, _preview_body(result)
     except Exception as e:
         return True, dbc.Alert(f"Preview error: {e}", color="danger")
 
 
+def _preview_body(result):
+    """Render an OperationPreview; sampled counts are marked as estimates."""
+    estimate = "~" if result.sample_rows is not None else ""
+    white = {"color": "white"}
+    children = [
+        html.P(f"Rows before: {result.rows_before}", style=white),
+        html.P(f"Rows after: {estimate}{result.rows_after}", style=white),
+        html.P(
+            f"Rows affected: {estimate}{result.rows_affected}",
+            style={"color": "#e67e22", "fontWeight": "600"},
+        ),
+        html.P(f"Cells changed: {estimate}{result.changed_cells}", style=white),
+    ]
+    for name, delta in result.null_delta.items():
+        children.append(
+            html.P(f"Missing values in {name}: {estimate}{delta:+d}", style=white)
+        )
+    for name, (before, after) in result.dtype_changes.items():
+        children.append(html.P(f"Type of {name}: {before} -> {after}", style=white))
+    if result.columns_dropped:
+        dropped = ", ".join(str(name) for name in result.columns_dropped)
+        children.append(html.P(f"Columns dropped: {dropped}", style=white))
+    children.append(
+        html.P(
+            f"Estimated time on the full dataset: {result.estimated_seconds:.2f} s",
+            style=white,
+        )
+    )
+    if result.sample_rows is not None:
+        children.append(
+            html.P(
+                f"Estimated from a stratified sample of {result.sample_rows} rows.",
+                style={"color": "#888"},
+            )
+        )
+    return html.Div(children)
+
+
 # ---------------------------------------------------------------------------
 # Helper to run a non-destructive cleaning operation
 # ---------------------------------------------------------------------------
 
 
-def _execute_cleaning(df, operation, column, fill_value, new_name):
+def _execute_cleaning(operation, column, fill_value, new_name):
     """Run cleaning, save snapshot first, then return an alert."""
     try:
-        # Save snapshot before operation
-        history.save_snapshot(operation, column, f"{operation} on {column}")
-        df = apply_operation(df, operation, column, fill_value, new_name)
-        write_data(df)
+        _apply_and_save(operation, column, fill_value, new_name)
         return dbc.Alert("Data cleaning applied and saved.", color="success")
     except Exception as e:
         return dbc.Alert(f"Cleaning error: {e}", color="danger")
+
+
+def _apply_and_save(operation, column, fill_value, new_name):
+    """Snapshot the dataset, then apply one operation to it and persist it."""
+    _apply_recipe_and_save([CleaningStep(operation, column, fill_value, new_name)])
+
+
+def _apply_recipe_and_save(steps):
+    """
+    Apply cleaning steps with one snapshot and one write of the dataset.
+
+    The steps run as an optimized CleaningPlan, and columns the plan drops
+    without reading are not loaded. Datasets in chunked mode are streamed
+    through all the steps in a single pass instead of being loaded whole.
+    """
+    operation = steps[0].operation if len(steps) == 1 else "recipe"
+    columns = ", ".join(dict.fromkeys(column_label(step.column) for step in steps))
+    description = recipe_description(steps)
+    read_columns, plan = (
+        CleaningPlan(tuple(steps)).optimized().projection(list_columns())
+    )
+    if is_chunked_mode():
+        for step in steps:
+            if not can_stream(step.operation, step.fill_value):
+                raise ValueError(_CHUNKED_UNSUPPORTED.format(operation=step.operation))
+        history.save_snapshot(operation, columns, description)
+        transform_chunks(plan.stream, columns=read_columns)
+        return
+    # Cleaned in memory first, so a failing step leaves no snapshot behind
+    df = plan.collect(read_data(read_columns))
+    history.save_snapshot(operation, columns, description)
+    # Kept for the Summary tab's "saved vs. parsed" note, as transform_chunks does
+    write_data(df, source_memory=get_catalog().source_memory)
+
+
+def _table_rows():
+    """Rows for the data table: all of them, or a preview in chunked mode."""
+    if is_chunked_mode():
+        df = next(iter_chunks(chunk_rows=CHUNKED_PREVIEW_ROWS))
+    else:
+        df = read_data()
+    return df.to_dict("records")
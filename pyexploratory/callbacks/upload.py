@@ -1,62 +1,339 @@
 """
-Callbacks for file upload and page refresh.
+Callbacks for file upload, dataset switching, and page refresh.
 """
 
 import datetime
+import os
+import tempfile
+from typing import Tuple
 
 import dash
 import dash_bootstrap_components as dbc
-from dash import dcc, html
+from dash import dcc, html, no_update
 from dash.dependencies import Input, Output, State
 
-from pyexploratory.core.data_store import write_data
-from pyexploratory.core.file_parser import parse_upload
-
+from pyexploratory.background import BACKGROUND_CALLBACKS
+from pyexploratory.core import history
+from pyexploratory.core.chunked_upload import completed_file, discard_upload
+from pyexploratory.core.datasets import (
+    activate_dataset,
+    active_dataset,
+    concat_files,
+    dataset_name,
+    dataset_path,
+    list_datasets,
+)
+from pyexploratory.core.excel_stream import ExcelOptions
+from pyexploratory.core.file_parser import file_sheets, upload_sheets
+from pyexploratory.core.ingest import (
+    IngestProgress,
+    UploadResult,
+    ingest_files,
+    ingest_uploads,
+)
 
-def _parse_and_save(contents: str, filename: str, date: int) -> html.Div:
-    """Parse an uploaded file, save to disk, and return feedback."""
-    try:
-        df = parse_upload(contents, filename)
-    except Exception as e:
-        return dbc.Alert(f"Error processing {filename}: {e}", color="danger")
 
-    if df is None:
+def _result_alert(result: UploadResult) -> dbc.Alert:
+    """Build the feedback alert for one ingested file."""
+    if result.status == "unsupported":
         return dbc.Alert("Unsupported file format.", color="warning")
+    if result.status == "error":
+        return dbc.Alert(
+            f"Error processing {result.filename}: {result.error}", color="danger"
+        )
 
-    write_data(df)
-
+    columns = list(result.columns)
+    details = []
+    if result.report is not None:
+        details = [
+            html.Br(),
+            f"Compact dtypes: {len(result.report.converted)} columns converted, "
+            f"{result.report.saved_pct:.0f}% less memory",
+        ]
+    if result.optimize_skipped:
+        details += [
+            html.Br(),
+            "Compact dtypes skipped: the file is too large to analyze in memory.",
+        ]
+    if result.reused:
+        details += [
+            html.Br(),
+            "Same file as an earlier upload: reused without parsing.",
+        ]
+    stats = result.parse_stats
+    if stats is not None:
+        details += [
+            html.Br(),
+            f"Parsed with {stats.engine} engine at {stats.mb_per_s:.1f} MB/s",
+        ]
+        if stats.fallback:
+            details.append(" (pyarrow could not parse the file)")
+        if stats.skipped_rows:
+            details += [
+                html.Br(),
+                f"Skipped {stats.skipped_rows} malformed rows",
+            ]
+    if result.chunked:
+        details += [html.Br(), "Large file: stored and processed in chunks."]
     return dbc.Alert(
         [
-            html.Strong(f"Successfully imported {filename}"),
+            html.Strong(f"Successfully imported {result.filename}"),
+            html.Br(),
+            f"{result.rows} rows, {len(columns)} columns",
             html.Br(),
-            f"{len(df)} rows, {len(df.columns)} columns",
+            f"Columns: {', '.join(columns[:8])}{'...' if len(columns) > 8 else ''}",
+            *details,
+        ],
+        color="success",
+    )
+
+
+_PHASES = {
+    "checking": "Checking for earlier uploads",
+    "parsing": "Parsing",
+    "writing": "Writing",
+    "done": "Finishing",
+}
+
+
+def _show_progress(update: IngestProgress) -> None:
+    """Show an ingest batch's progress while the upload callback runs."""
+    details = [f"{update.rows:,} rows"]
+    if update.bytes_parsed:
+        size = f"{update.bytes_parsed / 1024**2:,.1f}"
+        if update.bytes_total:
+            size += f" of {update.bytes_total / 1024**2:,.1f}"
+        details.insert(0, f"{size} MB")
+    if update.files_total > 1:
+        details.append(
+            f"file {min(update.files_done + 1, update.files_total)} "
+            f"of {update.files_total}"
+        )
+    percent = round(100 * update.fraction)
+    dash.set_props(
+        "upload-progress",
+        {
+            "children": [
+                dbc.Progress(
+                    value=percent, label=f"{percent}%", color="success", striped=True
+                ),
+                html.Small(
+                    f"{_PHASES.get(update.phase, update.phase)}: {', '.join(details)}",
+                    style={"color": "#cccccc"},
+                ),
+            ]
+        },
+    )
+
+
+def _unique_names(bases):
+    """Dataset names for a batch, suffixed where two uploads share a name."""
+    names = []
+    for base in bases:
+        name = base
+        n = 2
+        while name in names:
+            name = f"{base}_{n}"
+            n += 1
+        names.append(name)
+    return names
+
+
+def _activate(name: str) -> None:
+    """Switch the current dataset; undo history belongs to the old one."""
+    activate_dataset(name)
+    history.clear_history()
+
+
+def _combine(results, name: str) -> Tuple[dbc.Alert, bool]:
+    """
+    Concatenate the ingested files into one dataset and activate it.
+
+    Returns:
+        The feedback alert and whether the combined dataset was activated.
+    """
+    try:
+        concat_files([r.path for r in results], dataset_path(name))
+        _activate(name)
+    except Exception as e:
+        return dbc.Alert(f"Error combining files: {e}", color="danger"), False
+    alert = dbc.Alert(
+        [
+            html.Strong(f"Combined {len(results)} files into '{name}'"),
             html.Br(),
-            f"Columns: {', '.join(df.columns[:8])}{'...' if len(df.columns) > 8 else ''}",
+            f"{sum(r.rows for r in results)} rows",
         ],
         color="success",
     )
+    return alert, True
+
+
+def _excel_jobs(
+    sources, list_of_names, sheet_mode, nrows, usecols, sheets_of=upload_sheets
+):
+    """
+    Expand uploads into ingest jobs, one per sheet for workbooks when every
+    sheet is wanted, so sheets are parsed in parallel.
+
+    Args:
+        sources: Upload contents (or received file paths), one per file.
+        sheets_of: Lists a source's sheets; None for non-workbooks.
+
+    Returns:
+        Parallel lists of (source, filename) pairs, display labels,
+        dataset base names and ExcelOptions.
+    """
+    columns = tuple(c.strip() for c in (usecols or "").split(",") if c.strip())
+    uploads, labels, bases, options = [], [], [], []
+    for source, filename in zip(sources, list_of_names):
+        sheets = [None]
+        if sheet_mode == "all":
+            try:
+                sheets = sheets_of(source, filename) or [None]
+            except Exception:
+                # Not a readable workbook; ingesting it reports the error
+                pass
+        for sheet in sheets:
+            uploads.append((source, filename))
+            labels.append(filename if sheet is None else f"{filename} [{sheet}]")
+            bases.append(dataset_name(filename, sheet))
+            options.append(ExcelOptions(sheet, nrows or None, columns or None))
+    return uploads, labels, bases, options
+
+
+# While an upload is processed: no second upload, and the progress is shown
+_RUNNING = [
+    (Output("upload-data", "disabled"), True, False),
+    (Output("upload-progress", "style"), {"display": "block"}, {"display": "none"}),
+]
 
 
 @dash.callback(
     Output("output-data-upload", "children"),
+    Output("refresh", "pathname", allow_duplicate=True),
     Input("upload-data", "contents"),
     State("upload-data", "filename"),
     State("upload-data", "last_modified"),
+    State("upload-options", "value"),
+    State("multi-file-mode", "value"),
+    State("excel-sheets", "value"),
+    State("excel-nrows", "value"),
+    State("excel-usecols", "value"),
+    background=BACKGROUND_CALLBACKS,
+    running=_RUNNING,
+    prevent_initial_call=True,
 )
-def update_output(list_of_contents, list_of_names, list_of_dates):
-    """Update the output area with parsed file info."""
-    if list_of_contents is not None:
-        return [
-            _parse_and_save(c, n, d)
-            for c, n, d in zip(list_of_contents, list_of_names, list_of_dates)
-        ]
+def update_output(
+    list_of_contents,
+    list_of_names,
+    list_of_dates,
+    options,
+    mode,
+    sheet_mode,
+    nrows,
+    usecols,
+):
+    """
+    Ingest all uploaded files in parallel and report on each, then reload
+    the page once the new data is in place.
+    """
+    if list_of_contents is None:
+        return None, no_update
+    optimize = "optimize" in (options or [])
+    uploads, labels, bases, excel = _excel_jobs(
+        list_of_contents, list_of_names, sheet_mode, nrows, usecols
+    )
+    names = _unique_names(bases)
+
+    def ingest(paths):
+        results = ingest_uploads(uploads, paths, optimize, excel, _show_progress)
+        return [r._replace(filename=label) for r, label in zip(results, labels)]
+
+    if mode == "concat" and len(uploads) > 1:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            results = ingest(
+                [os.path.join(tmp_dir, f"{name}.parquet") for name in names]
+            )
+            ok = [r for r in results if r.status == "ok"]
+            alerts = [_result_alert(r) for r in results]
+            if not ok:
+                return alerts, no_update
+            alert, combined = _combine(ok, f"{names[0]}_combined")
+        return alerts + [alert], "./data_analysis" if combined else no_update
+
+    results = ingest([dataset_path(n) for n in names])
+    return _activate_results(names, results)
+
+
+@dash.callback(
+    Output("output-data-upload", "children", allow_duplicate=True),
+    Output("refresh", "pathname", allow_duplicate=True),
+    Input("chunked-upload-done", "data"),
+    State("upload-options", "value"),
+    State("excel-sheets", "value"),
+    State("excel-nrows", "value"),
+    State("excel-usecols", "value"),
+    background=BACKGROUND_CALLBACKS,
+    running=_RUNNING,
+    prevent_initial_call=True,
+)
+def finish_chunked_upload(done, options, sheet_mode, nrows, usecols):
+    """Parse a file received through the chunked upload endpoint."""
+    if not done:
+        return no_update, no_update
+    try:
+        source = completed_file(done["upload_id"])
+    except (KeyError, ValueError) as e:
+        return dbc.Alert(f"Upload failed: {e.args[0]}", color="danger"), no_update
+
+    files, labels, bases, excel = _excel_jobs(
+        [source],
+        [done["filename"]],
+        sheet_mode,
+        nrows,
+        usecols,
+        sheets_of=file_sheets,
+    )
+    names = _unique_names(bases)
+    optimize = "optimize" in (options or [])
+    try:
+        results = ingest_files(
+            files, [dataset_path(n) for n in names], optimize, excel, _show_progress
+        )
+    finally:
+        discard_upload(done["upload_id"])
+    results = [r._replace(filename=label) for r, label in zip(results, labels)]
+    return _activate_results(names, results)
+
+
+def _activate_results(names, results):
+    """Activate the last dataset that was ingested; reload only if there is one."""
+    alerts = [_result_alert(r) for r in results]
+    ok_names = [n for n, r in zip(names, results) if r.status == "ok"]
+    if not ok_names:
+        return alerts, no_update
+    _activate(ok_names[-1])
+    return alerts, "./data_analysis"
+
+
+@dash.callback(
+    Output("active-dataset", "options"),
+    Output("active-dataset", "value"),
+    Input("output-data-upload", "children"),
+)
+def update_dataset_options(_):
+    """List stored datasets and mark the active one."""
+    return list_datasets(), active_dataset()
 
 
 @dash.callback(
-    Output("refresh", "pathname"),
-    [Input("upload-data", "contents")],
+    Output("refresh", "pathname", allow_duplicate=True),
+    Input("active-dataset", "value"),
+    prevent_initial_call=True,
 )
-def refresh_page(contents):
-    """Refresh to data_analysis page after upload."""
-    if contents is not None:
-        return "./data_analysis"
+def switch_dataset(name):
+    """Make the chosen dataset current and reload the page."""
+    if not name or name == active_dataset():
+        return no_update
+    _activate(name)
+    return "./data_analysis"
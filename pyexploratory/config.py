@@ -10,7 +10,37 @@ import os
 # Paths
 # ---------------------------------------------------------------------------
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DATA_FILE = os.path.join(PROJECT_ROOT, "local_data.csv")
+DATA_FILE = os.path.join(PROJECT_ROOT, "local_data.parquet")
+
+# ---------------------------------------------------------------------------
+# Data store
+# ---------------------------------------------------------------------------
+PARQUET_COMPRESSION = "zstd"
+# pyarrow's default for Feather files
+FEATHER_COMPRESSION = "lz4"
+# In-memory dataset cache budget; override per host via the environment
+DATA_CACHE_BUDGET_MB = int(os.environ.get("PYEXPLORATORY_CACHE_BUDGET_MB", "1024"))
+RESULT_CACHE_DIR = os.path.join(PROJECT_ROOT, ".pyexploratory_cache")
+# Every uploaded dataset; the active one is copied to DATA_FILE
+DATASETS_DIR = os.path.join(PROJECT_ROOT, ".pyexploratory_datasets")
+RESULT_CACHE_MAX_VERSIONS = 20
+# Parsed uploads, keyed by content hash, so re-uploading a file skips parsing
+INGEST_CACHE_DIR = os.path.join(PROJECT_ROOT, ".pyexploratory_ingest")
+INGEST_CACHE_MAX_ENTRIES = 20
+# Job state of Dash background callbacks (needs the dash[diskcache] extra)
+BACKGROUND_CACHE_DIR = os.path.join(PROJECT_ROOT, ".pyexploratory_jobs")
+# Rows per Parquet row group, and per chunk when streaming a dataset
+CHUNK_ROWS = 100_000
+# Datasets larger than this in memory are processed chunk by chunk
+CHUNKED_MODE_THRESHOLD_MB = int(
+    os.environ.get("PYEXPLORATORY_CHUNKED_THRESHOLD_MB", "512")
+)
+# Workers for cleaning the columns of a wide frame in parallel
+CLEANING_WORKERS = os.cpu_count() or 1
+# Smaller frames are cleaned one column after another
+PARALLEL_CLEANING_MIN_ROWS = 100_000
+# Rows of the stratified sample that cleaning previews run on
+PREVIEW_SAMPLE_ROWS = 10_000
 
 # ---------------------------------------------------------------------------
 # Colors (SCREAMING_SNAKE_CASE constants)
@@ -70,6 +100,21 @@ CONTENT_STYLE = {
 # Upload limits
 # ---------------------------------------------------------------------------
 MAX_UPLOAD_SIZE_MB = 50
+# Files received in chunks by the resumable upload endpoint
+UPLOADS_DIR = os.path.join(PROJECT_ROOT, ".pyexploratory_uploads")
+MAX_CHUNKED_UPLOAD_MB = int(
+    os.environ.get("PYEXPLORATORY_MAX_CHUNKED_UPLOAD_MB", "4096")
+)
+# Bytes per request sent by the browser; the server accepts up to twice this
+UPLOAD_CHUNK_MB = 8
+# Unfinished chunked uploads are deleted after this long
+UPLOAD_EXPIRY_HOURS = 24
+# "pyarrow" (multi-threaded, sampled type inference) or "c" (pd.read_csv)
+CSV_ENGINE = os.environ.get("PYEXPLORATORY_CSV_ENGINE", "pyarrow")
+# Worker processes for parsing the files of a multi-file upload
+UPLOAD_WORKERS = os.cpu_count() or 1
+# Default for the "compact dtypes" upload option
+OPTIMIZE_DTYPES_ON_UPLOAD = False
 
 # ---------------------------------------------------------------------------
 # ML defaults
@@ -0,0 +1,135 @@
+"""
+Multi-threaded CSV parsing with pyarrow.
+
+Column types are inferred from a sample at the start of the file and then
+fixed for the full, parallel parse. Results match pd.read_csv's defaults:
+dates stay text and empty strings are missing values. Rows with too many
+fields, which pd.read_csv rejects, are skipped and counted instead of
+failing the upload. Rows with too few fields make the parse fail, so the
+caller falls back to pd.read_csv, which pads them with missing values.
+In-memory buffers are parsed without a copy; other streams (e.g. a
+decompressing reader) are parsed block by block as they are read.
+
+Pure business logic — no Dash dependencies.
+"""
+
+import io
+from typing import IO, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+# Bytes of the file used to infer column types
+SAMPLE_BYTES = 1024 * 1024
+
+
+def read_csv_arrow(
+    buffer: IO[bytes], encoding: str = "utf-8"
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Parse a CSV byte stream with the pyarrow engine.
+
+    Args:
+        buffer: The whole file, positioned at its start.
+        encoding: Text encoding, e.g. from file_parser.sniff_encoding.
+
+    Returns:
+        The DataFrame and the number of rows with too many fields skipped.
+
+    Raises:
+        pyarrow.ArrowException: If the file does not fit the sampled types
+            (a value later in the file has another type), has a row with
+            too few fields or cannot be decoded; callers fall back to
+            pd.read_csv.
+        ValueError: If the header has empty or duplicate column names,
+            which pd.read_csv renames and pyarrow does not.
+    """
+    skipped = []
+
+    def skip_row(row) -> str:
+        if row.actual_columns < row.expected_columns:
+            return "error"
+        skipped.append(row.number)
+        return "skip"
+
+    read_options = pacsv.ReadOptions(
+        encoding="utf8" if encoding.startswith("utf-8") else encoding
+    )
+    parse_options = pacsv.ParseOptions(invalid_row_handler=skip_row)
+    if isinstance(buffer, io.BytesIO):
+        head = bytes(buffer.getbuffer()[:SAMPLE_BYTES])
+        source = pa.py_buffer(buffer.getbuffer())
+    else:
+        head = buffer.read(SAMPLE_BYTES)
+        source = io.BufferedReader(_ReplayStream(head, buffer))
+
+    sample = head
+    if len(head) == SAMPLE_BYTES:
+        # Drop the partial last line
+        sample = head[: head.rfind(b"\n") + 1]
+    schema = pacsv.read_csv(
+        pa.py_buffer(sample), read_options=read_options, parse_options=parse_options
+    ).schema
+    names = schema.names
+    if "" in names or len(set(names)) != len(names):
+        raise ValueError("Header has empty or duplicate column names.")
+
+    skipped.clear()
+    table = pacsv.read_csv(
+        source,
+        read_options=read_options,
+        parse_options=parse_options,
+        convert_options=pacsv.ConvertOptions(
+            column_types=_sampled_types(schema), strings_can_be_null=True
+        ),
+    )
+    for i, field in enumerate(table.schema):
+        if pa.types.is_binary(field.type):
+            # A column empty in the sample holds undecodable bytes further on
+            raise ValueError("File is not valid text in the sniffed encoding.")
+        if pa.types.is_null(field.type):
+            # pd.read_csv reads an all-empty column as float NaN
+            table = table.set_column(i, field.name, table.column(i).cast(pa.float64()))
+    return table.to_pandas(split_blocks=True, self_destruct=True), len(skipped)
+
+
+def _sampled_types(schema: pa.Schema) -> dict:
+    """
+    Fix the sample's column types for the full parse.
+
+    Dates and timestamps are kept as text like pd.read_csv does; columns
+    that were empty in the sample are left for pyarrow to infer. Bytes that
+    are not valid text in the encoding make pyarrow infer binary; forcing
+    text makes the full parse fail instead, so the caller can fall back.
+    """
+    types = {}
+    for field in schema:
+        if pa.types.is_null(field.type):
+            continue
+        if pa.types.is_temporal(field.type) or pa.types.is_binary(field.type):
+            types[field.name] = pa.string()
+        else:
+            types[field.name] = field.type
+    return types
+
+
+class _ReplayStream(io.RawIOBase):
+    """A stream whose first bytes were already read, with them put back."""
+
+    def __init__(self, head: bytes, rest: IO[bytes]):
+        self._head = memoryview(head)
+        self._rest = rest
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        if self._head:
+            n = min(len(b), len(self._head))
+            b[:n] = self._head[:n]
+            self._head = self._head[n:]
+            return n
+        data = self._rest.read(len(b))
+        b[: len(data)] = data
+        return len(data)
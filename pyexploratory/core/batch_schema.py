@@ -0,0 +1,63 @@
+"""
+Shared dtypes for a file parsed in independent row batches.
+
+Batches of JSON records or spreadsheet rows are converted to DataFrames one
+at a time. Each infers its own dtypes and sees only its own keys, so the
+batches are aligned to one set of columns and one dtype per column before
+they are concatenated or written as chunks.
+
+Pure business logic — no Dash dependencies.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def widest_schema(
+    frames: Iterable[pd.DataFrame],
+) -> Tuple[List[str], Dict[str, object]]:
+    """
+    Union of the batches' columns, in order of appearance, and the widest
+    dtype of each. A column missing or all-null in some batch has missing
+    values, so integers widen to float64 and booleans to object; a column
+    that is never set is float64, as pd.read_csv reads an empty column.
+    """
+    widest: Dict[str, object] = {}
+    filled: Dict[str, int] = {}
+    batches = 0
+    for frame in frames:
+        batches += 1
+        for col, dtype in frame.dtypes.items():
+            widest.setdefault(col, None)
+            if frame[col].isna().all():
+                continue
+            filled[col] = filled.get(col, 0) + 1
+            seen = widest[col]
+            if seen is None or seen == dtype:
+                widest[col] = dtype
+            elif all(
+                pd.api.types.is_numeric_dtype(d) and not pd.api.types.is_bool_dtype(d)
+                for d in (seen, dtype)
+            ):
+                widest[col] = np.dtype("float64")
+            else:
+                widest[col] = np.dtype(object)
+
+    for col, dtype in widest.items():
+        if dtype is None:
+            widest[col] = np.dtype("float64")
+        elif filled[col] < batches:
+            if pd.api.types.is_bool_dtype(dtype):
+                widest[col] = np.dtype(object)
+            elif pd.api.types.is_integer_dtype(dtype):
+                widest[col] = np.dtype("float64")
+    return list(widest), widest
+
+
+def align_batch(
+    frame: pd.DataFrame, columns: List[str], dtypes: Dict[str, object]
+) -> pd.DataFrame:
+    """Reindex a batch to the full column list and cast to shared dtypes."""
+    return frame.reindex(columns=columns).astype(dtypes)
@@ -0,0 +1,184 @@
+"""
+Per-dataset column metadata catalog.
+
+The catalog is computed once when a dataset is written and stored in the
+Parquet footer, so dropdown builders and validators can answer questions
+about dtypes, nulls and cardinality without touching row data.
+
+Pure business logic — no Dash dependencies.
+"""
+
+import json
+from typing import Any, Dict, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+# Distinct counts are exact up to this many values and estimated above it
+DISTINCT_SKETCH_SIZE = 2048
+
+
+class ColumnInfo(NamedTuple):
+    """Write-time statistics for a single column."""
+
+    dtype: str
+    numeric: bool
+    text: bool
+    categorical: bool
+    nulls: int
+    distinct: Optional[int]
+    min: Any
+    max: Any
+    memory: int
+
+
+class DatasetCatalog(NamedTuple):
+    """Write-time statistics for a whole dataset."""
+
+    rows: int
+    columns: Dict[str, ColumnInfo]
+    # In-memory size of the data as parsed, before ingest-time optimization
+    source_memory: Optional[int] = None
+
+    @property
+    def memory(self) -> int:
+        """Total in-memory size of all columns in bytes."""
+        return sum(info.memory for info in self.columns.values())
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "rows": self.rows,
+                "columns": {
+                    name: info._asdict() for name, info in self.columns.items()
+                },
+                "source_memory": self.source_memory,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, payload) -> "DatasetCatalog":
+        data = json.loads(payload)
+        return cls(
+            rows=data["rows"],
+            columns={
+                name: ColumnInfo(**info) for name, info in data["columns"].items()
+            },
+            source_memory=data.get("source_memory"),
+        )
+
+
+class CatalogBuilder:
+    """
+    Accumulate a catalog chunk by chunk.
+
+    Null counts, min/max and memory add up exactly across chunks. Distinct
+    counts come from a k-minimum-values sketch over the value hashes: exact
+    below DISTINCT_SKETCH_SIZE distinct values, an estimate above it.
+    """
+
+    def __init__(self, source_memory: Optional[int] = None):
+        self.source_memory = source_memory
+        self.rows = 0
+        self._columns: Dict[str, _ColumnAccumulator] = {}
+
+    def add(self, df: pd.DataFrame) -> "CatalogBuilder":
+        """Fold one chunk of rows into the catalog."""
+        self.rows += len(df)
+        for col in df.columns:
+            if col not in self._columns:
+                self._columns[col] = _ColumnAccumulator(df[col])
+            self._columns[col].add(df[col])
+        return self
+
+    def result(self) -> DatasetCatalog:
+        return DatasetCatalog(
+            rows=self.rows,
+            columns={col: acc.result() for col, acc in self._columns.items()},
+            source_memory=self.source_memory,
+        )
+
+
+class _ColumnAccumulator:
+    def __init__(self, series: pd.Series):
+        is_numeric = pd.api.types.is_numeric_dtype(series)
+        is_text = pd.api.types.is_string_dtype(series)
+        is_category = isinstance(series.dtype, pd.CategoricalDtype)
+        self.dtype = str(series.dtype)
+        self.numeric = is_numeric
+        self.text = is_text
+        self.categorical = is_category or (is_text and not is_numeric)
+        self.has_range = (
+            is_numeric and not pd.api.types.is_bool_dtype(series)
+        ) or pd.api.types.is_datetime64_any_dtype(series)
+        self.nulls = 0
+        self.memory = 0
+        self.min = self.max = None
+        self.sketch: Optional[np.ndarray] = np.empty(0, dtype=np.uint64)
+
+    def add(self, series: pd.Series) -> None:
+        self.nulls += int(series.isna().sum())
+        self.memory += int(series.memory_usage(deep=True, index=False))
+        if self.has_range:
+            low, high = series.min(), series.max()
+            if not pd.isna(low):
+                self.min = low if self.min is None else min(self.min, low)
+                self.max = high if self.max is None else max(self.max, high)
+        if self.sketch is not None:
+            try:
+                hashes = pd.util.hash_pandas_object(series.dropna(), index=False)
+            except TypeError:
+                # Unhashable cells, e.g. lists from nested JSON
+                self.sketch = None
+                return
+            unique = pd.unique(hashes.to_numpy())
+            if len(unique) > DISTINCT_SKETCH_SIZE:
+                unique = np.partition(unique, DISTINCT_SKETCH_SIZE - 1)[
+                    :DISTINCT_SKETCH_SIZE
+                ]
+            self.sketch = np.union1d(self.sketch, unique)[:DISTINCT_SKETCH_SIZE]
+
+    def distinct(self) -> Optional[int]:
+        if self.sketch is None:
+            return None
+        if len(self.sketch) < DISTINCT_SKETCH_SIZE:
+            return len(self.sketch)
+        # k-th smallest of uniformly spread hashes ~ k / distinct of the range
+        kth = float(self.sketch[-1]) / 2.0**64
+        return int((DISTINCT_SKETCH_SIZE - 1) / kth)
+
+    def result(self) -> ColumnInfo:
+        return ColumnInfo(
+            dtype=self.dtype,
+            numeric=self.numeric,
+            text=self.text,
+            categorical=self.categorical,
+            nulls=self.nulls,
+            distinct=self.distinct(),
+            min=_json_scalar(self.min),
+            max=_json_scalar(self.max),
+            memory=self.memory,
+        )
+
+
+def describe_column(series: pd.Series) -> ColumnInfo:
+    """Compute the catalog entry for one column."""
+    accumulator = _ColumnAccumulator(series)
+    accumulator.add(series)
+    return accumulator.result()
+
+
+def build_catalog(
+    df: pd.DataFrame, source_memory: Optional[int] = None
+) -> DatasetCatalog:
+    """Compute the catalog for a whole DataFrame."""
+    return CatalogBuilder(source_memory).add(df).result()
+
+
+def _json_scalar(value) -> Any:
+    """Convert a pandas/numpy scalar into a JSON-serialisable value."""
+    if value is None or pd.isna(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return value.item() if hasattr(value, "item") else value
@@ -0,0 +1,183 @@
+"""
+Resumable uploads received in chunks and written straight to disk.
+
+The browser sends a file as a sequence of raw byte ranges, each appended
+to a partial file under UPLOADS_DIR. The partial file's size is the
+resume point: after a dropped connection the client asks for it and
+continues from there. Nothing is base64-encoded and no request carries
+more than one chunk, so file size is bounded by disk space (and
+MAX_CHUNKED_UPLOAD_MB), not by request size or memory.
+
+Pure business logic — no Dash dependencies.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from typing import Dict, NamedTuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: only requests within this process are serialized
+    fcntl = None  # type: ignore[assignment]
+
+from pyexploratory.config import MAX_CHUNKED_UPLOAD_MB, UPLOAD_EXPIRY_HOURS, UPLOADS_DIR
+
+_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+# One lock per upload id, so concurrent chunks of an upload append in turn
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+class UploadState(NamedTuple):
+    """Progress of one chunked upload."""
+
+    upload_id: str
+    filename: str
+    size: int
+    received: int
+
+    @property
+    def complete(self) -> bool:
+        return self.received == self.size
+
+
+class OffsetMismatch(ValueError):
+    """A chunk does not start where the received data ends."""
+
+    def __init__(self, state: UploadState):
+        super().__init__(
+            f"Upload {state.upload_id} has {state.received} bytes; "
+            "resume from there."
+        )
+        self.state = state
+
+
+def create_upload(filename: str, size: int) -> UploadState:
+    """
+    Start a chunked upload of size bytes.
+
+    Raises:
+        ValueError: If the size is negative or above MAX_CHUNKED_UPLOAD_MB.
+    """
+    if size < 0 or size > MAX_CHUNKED_UPLOAD_MB * 1024 * 1024:
+        raise ValueError(
+            f"Upload size must be between 0 and {MAX_CHUNKED_UPLOAD_MB} MB."
+        )
+    purge_expired_uploads()
+    os.makedirs(UPLOADS_DIR, exist_ok=True)
+    upload_id = uuid.uuid4().hex
+    # The partial file first: purge_expired_uploads drops metadata without one
+    open(_part_path(upload_id), "wb").close()
+    with open(_meta_path(upload_id), "w") as f:
+        json.dump({"filename": os.path.basename(filename), "size": size}, f)
+    return UploadState(upload_id, os.path.basename(filename), size, 0)
+
+
+def upload_state(upload_id: str) -> UploadState:
+    """
+    Return how much of an upload has been received.
+
+    Raises:
+        KeyError: If there is no such upload.
+    """
+    meta = _meta_path(upload_id)
+    if not os.path.exists(meta):
+        raise KeyError(f"Unknown upload '{upload_id}'.")
+    with open(meta) as f:
+        info = json.load(f)
+    received = os.path.getsize(_part_path(upload_id))
+    return UploadState(upload_id, info["filename"], info["size"], received)
+
+
+def append_chunk(upload_id: str, offset: int, data: bytes) -> UploadState:
+    """
+    Write a chunk that starts at byte offset of the file.
+
+    Raises:
+        KeyError: If there is no such upload.
+        OffsetMismatch: If offset is not the number of bytes received so
+            far (a chunk was lost or is being resent).
+        ValueError: If the chunk would run past the declared size.
+    """
+    state = upload_state(upload_id)
+    with _upload_lock(upload_id), open(_part_path(upload_id), "ab") as f:
+        if fcntl is not None:
+            # Also serializes requests handled by other server processes
+            fcntl.flock(f, fcntl.LOCK_EX)
+        # Checked under the lock: a concurrent or retried request for the
+        # same range may have appended since upload_state read the size
+        state = state._replace(received=os.fstat(f.fileno()).st_size)
+        if offset != state.received:
+            raise OffsetMismatch(state)
+        if state.received + len(data) > state.size:
+            raise ValueError(
+                f"Chunk runs past the declared size of {state.size} bytes."
+            )
+        f.write(data)
+    return state._replace(received=state.received + len(data))
+
+
+def completed_file(upload_id: str) -> str:
+    """
+    Return the path of a fully received upload.
+
+    Raises:
+        KeyError: If there is no such upload.
+        ValueError: If bytes are still missing.
+    """
+    state = upload_state(upload_id)
+    if not state.complete:
+        raise ValueError(
+            f"Upload {upload_id} is incomplete: {state.received} of "
+            f"{state.size} bytes received."
+        )
+    return _part_path(upload_id)
+
+
+def discard_upload(upload_id: str) -> None:
+    """Delete an upload's files; unknown ids are ignored."""
+    with _locks_guard:
+        _locks.pop(upload_id, None)
+    for path in (_part_path(upload_id), _meta_path(upload_id)):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def purge_expired_uploads() -> None:
+    """Delete uploads untouched for UPLOAD_EXPIRY_HOURS (abandoned ones)."""
+    if not os.path.exists(UPLOADS_DIR):
+        return
+    cutoff = time.time() - UPLOAD_EXPIRY_HOURS * 3600
+    upload_ids = {name.split(".")[0] for name in os.listdir(UPLOADS_DIR)}
+    for upload_id in upload_ids:
+        if not _ID_PATTERN.match(upload_id):
+            continue
+        # The partial file's mtime is the time of the last chunk
+        part = _part_path(upload_id)
+        if not os.path.exists(part) or os.path.getmtime(part) < cutoff:
+            discard_upload(upload_id)
+
+
+def _upload_lock(upload_id: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(upload_id, threading.Lock())
+
+
+def _part_path(upload_id: str) -> str:
+    return os.path.join(UPLOADS_DIR, f"{_checked(upload_id)}.part")
+
+
+def _meta_path(upload_id: str) -> str:
+    return os.path.join(UPLOADS_DIR, f"{_checked(upload_id)}.json")
+
+
+def _checked(upload_id: str) -> str:
+    """Reject ids that could name a path outside UPLOADS_DIR."""
+    if not _ID_PATTERN.match(upload_id):
+        raise KeyError(f"Unknown upload '{upload_id}'.")
+    return upload_id
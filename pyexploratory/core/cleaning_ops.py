@@ -2,131 +2,354 @@
 Data cleaning operations using a strategy-pattern dispatch.
 
 Each operation is a standalone function with a consistent signature:
-    (df, column, fill_value, new_name) -> df
+    (df, cols, fill_value, new_name) -> df
 
 The OPERATIONS dict maps operation keys to their implementations.
+apply_operation takes a single column, a list of columns or a dtype
+selector such as "@text" (see resolve_columns), and runs the operation
+on all of them in one call.
+Row-local operations in STREAMING_OPS can also run chunk by chunk on
+datasets too large for memory (see can_stream). A recipe of CleaningSteps
+applies several operations with a single read and write of the dataset
+(see core.cleaning_plan).
 """
 
-from typing import Optional
+from functools import partial
+from typing import (
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+)
 
 import numpy as np
 import pandas as pd
 from scipy import stats
 from sklearn.preprocessing import MinMaxScaler
 
+from pyexploratory.core.catalog import DatasetCatalog
+from pyexploratory.core.column_executor import map_columns
+from pyexploratory.core.dtype_optimizer import as_arrow_strings
+
+# ---------------------------------------------------------------------------
+# Column selection
+# ---------------------------------------------------------------------------
+
+# A step on one of these keys runs on every column of that kind
+COLUMN_SELECTORS = {
+    "@text": "all text columns",
+    "@numeric": "all numeric columns",
+    "@datetime": "all datetime columns",
+    "@all": "all columns",
+}
+
+# A column name, a list of names, or a COLUMN_SELECTORS key
+Columns = Union[str, Sequence[str]]
+
+
+def resolve_columns(
+    df: Union[pd.DataFrame, DatasetCatalog], column: Columns
+) -> List[str]:
+    """
+    Expand a step's columns into the names it runs on.
+
+    A name that is also a selector key refers to the column itself when the
+    dataset has a column of that name.
+
+    Args:
+        df: A DataFrame, or a catalog to answer from without row data.
+        column: A column name, a list of names, or a COLUMN_SELECTORS key.
+
+    Returns:
+        The column names, in dataset order for a selector.
+
+    Raises:
+        KeyError: If a named column does not exist.
+        ValueError: If no columns are given or none match the selector.
+    """
+    names = list(df.columns)
+    if isinstance(column, str):
+        if column in COLUMN_SELECTORS and column not in names:
+            selected = [name for name in names if _is_kind(df, name, column)]
+            if not selected:
+                raise ValueError(f"The dataset has no {COLUMN_SELECTORS[column]}.")
+            return selected
+        column = [column]
+    selected = list(dict.fromkeys(column))
+    if not selected:
+        raise ValueError("Select at least one column.")
+    for name in selected:
+        if name not in names:
+            raise KeyError(f"Column '{name}' not found. Available: {names}")
+    return selected
+
+
+def parse_columns(text: str, columns: Sequence[str]) -> Columns:
+    """
+    Read the columns typed into the cleaning form.
+
+    Args:
+        text: A column name, a selector such as "@text", or names separated
+            by commas.
+        columns: The dataset's columns; a name that contains a comma is
+            taken whole.
+    """
+    text = (text or "").strip()
+    if text in columns or text in COLUMN_SELECTORS or "," not in text:
+        return text
+    names = [name.strip() for name in text.split(",") if name.strip()]
+    return names[0] if len(names) == 1 else names
+
+
+def column_label(column: Columns) -> str:
+    """Describe a step's columns for messages and the history log."""
+    if isinstance(column, str):
+        return COLUMN_SELECTORS.get(column, column)
+    return ", ".join(str(name) for name in column)
+
+
+def _is_kind(df: Union[pd.DataFrame, DatasetCatalog], name: str, kind: str) -> bool:
+    if kind == "@all":
+        return True
+    if isinstance(df, DatasetCatalog):
+        info = df.columns[name]
+        numeric = info.numeric and not info.dtype.startswith("bool")
+        text, dtype = info.text, info.dtype
+    else:
+        series = df[name]
+        numeric = pd.api.types.is_numeric_dtype(
+            series
+        ) and not pd.api.types.is_bool_dtype(series)
+        text, dtype = pd.api.types.is_string_dtype(series), str(series.dtype)
+    if kind == "@numeric":
+        return numeric
+    if kind == "@text":
+        return text
+    return dtype.startswith("datetime64")
+
+
 # ---------------------------------------------------------------------------
 # Individual cleaning operations
 # ---------------------------------------------------------------------------
+#
+# Each operation receives the resolved list of columns and handles all of
+# them in one call: frame-level pandas methods where they exist, otherwise
+# map_columns, which cleans the columns of a wide frame in parallel. Its
+# per-column functions are module-level so worker processes can load them.
+# String operations run on Arrow strings: object text columns are converted
+# first, so .str uses Arrow's compute kernels rather than a Python loop. On
+# a categorical column they run on the categories, not on every row (see
+# _clean_text).
+
+
+def _lstrip(series: pd.Series, chars: Optional[str]) -> pd.Series:
+    return as_arrow_strings(series).str.lstrip(chars)
+
+
+def _rstrip(series: pd.Series, chars: Optional[str]) -> pd.Series:
+    return as_arrow_strings(series).str.rstrip(chars)
+
+
+def _alnum(series: pd.Series) -> pd.Series:
+    return as_arrow_strings(series).str.replace("[^a-zA-Z0-9]", "", regex=True)
+
+
+def _to_numeric(series: pd.Series) -> pd.Series:
+    return pd.to_numeric(series, errors="coerce")
+
+
+def _to_datetime(series: pd.Series) -> pd.Series:
+    return pd.to_datetime(series, errors="coerce")
+
+
+def _lowercase(series: pd.Series) -> pd.Series:
+    return as_arrow_strings(series).str.lower()
+
+
+def _uppercase(series: pd.Series) -> pd.Series:
+    return as_arrow_strings(series).str.upper()
+
+
+def _trim(series: pd.Series) -> pd.Series:
+    return as_arrow_strings(series).str.strip()
+
+
+_STRING_FUNCTIONS: Dict[str, Callable[..., pd.Series]] = {
+    "lstrip": _lstrip,
+    "rstrip": _rstrip,
+    "alnum": _alnum,
+    "lowercase": _lowercase,
+    "uppercase": _uppercase,
+    "trim": _trim,
+}
+
+
+def string_function(
+    operation: str, fill_value: Optional[str] = None
+) -> Callable[[pd.Series], pd.Series]:
+    """The per-column function behind a string operation."""
+    transform: Callable[[pd.Series], pd.Series] = _STRING_FUNCTIONS[operation]
+    if operation in ("lstrip", "rstrip"):
+        transform = partial(_STRING_FUNCTIONS[operation], chars=fill_value)
+    return partial(_clean_text, transform=transform)
+
+
+def _clean_text(
+    series: pd.Series, transform: Callable[[pd.Series], pd.Series]
+) -> pd.Series:
+    """
+    Apply a string transform to a column.
+
+    A categorical column stays categorical: the transform runs once per
+    category instead of once per row, and categories that become equal
+    (e.g. "NY" and "ny " after lowercase and trim) are merged into one.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return transform(series)
+    categories = transform(pd.Series(series.cat.categories))
+    # Position of each new category among the distinct ones, -1 for missing
+    merged, distinct = pd.factorize(categories)
+    if len(distinct) == len(categories):
+        # Nothing merged: only the labels change, the codes are kept
+        return series.cat.rename_categories(distinct)
+    # The last entry maps missing rows (code -1) to -1 again
+    codes = np.append(merged, -1)[series.cat.codes.to_numpy()]
+    return pd.Series(
+        pd.Categorical.from_codes(codes, distinct, ordered=series.cat.ordered),
+        index=series.index,
+        name=series.name,
+    )
 
 
 def lstrip_op(
-    df: pd.DataFrame, col: str, fill_value: Optional[str] = None, **_
+    df: pd.DataFrame, cols: List[str], fill_value: Optional[str] = None, **_
 ) -> pd.DataFrame:
-    df[col] = df[col].str.lstrip(fill_value)
-    return df
+    return map_columns(df, cols, string_function("lstrip", fill_value))
 
 
 def rstrip_op(
-    df: pd.DataFrame, col: str, fill_value: Optional[str] = None, **_
+    df: pd.DataFrame, cols: List[str], fill_value: Optional[str] = None, **_
 ) -> pd.DataFrame:
-    df[col] = df[col].str.rstrip(fill_value)
-    return df
+    return map_columns(df, cols, string_function("rstrip", fill_value))
 
 
-def alnum_op(df: pd.DataFrame, col: str, **_) -> pd.DataFrame:
-    df[col] = df[col].str.replace("[^a-zA-Z0-9]", "", regex=True)
-    return df
+def alnum_op(df: pd.DataFrame, cols: List[str], **_) -> pd.DataFrame:
+    return map_columns(df, cols, string_function("alnum"))
 
 
-def dropna_op(df: pd.DataFrame, col: str, **_) -> pd.DataFrame:
-    df = df.dropna(subset=[col])
+def dropna_op(df: pd.DataFrame, cols: List[str], **_) -> pd.DataFrame:
+    df = df.dropna(subset=cols)
     return df
 
 
 def fillna_op(
-    df: pd.DataFrame, col: str, fill_value: Optional[str] = None, **_
+    df: pd.DataFrame, cols: List[str], fill_value: Optional[str] = None, **_
 ) -> pd.DataFrame:
-    if fill_value is None:
-        if pd.api.types.is_numeric_dtype(df[col]):
-            fill_value = df[col].mean()
-        else:
-            fill_value = df[col].mode()[0]
-    df[col] = df[col].fillna(fill_value)
+    fills = {}
+    for col in cols:
+        fills[col] = _fill_value(df[col], fill_value)
+        if (
+            isinstance(df[col].dtype, pd.CategoricalDtype)
+            and fills[col] not in df[col].cat.categories
+        ):
+            df[col] = df[col].cat.add_categories([fills[col]])
+    df = df.fillna(fills)
     return df
 
 
-def to_numeric_op(df: pd.DataFrame, col: str, **_) -> pd.DataFrame:
-    df[col] = pd.to_numeric(df[col], errors="coerce")
-    return df
-
-
-def to_string_op(df: pd.DataFrame, col: str, **_) -> pd.DataFrame:
-    df[col] = df[col].astype(str)
+def _fill_value(series: pd.Series, fill_value: Optional[str]):
+    if fill_value is None:
+        if pd.api.types.is_numeric_dtype(series):
+            return series.mean()
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Count the codes: one bin per category, no values compared
+            codes = series.cat.codes.to_numpy()
+            categories = series.cat.categories
+            counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+            if counts.any():
+                return categories[counts.argmax()]
+        return series.mode()[0]
+    if isinstance(fill_value, str) and pd.api.types.is_numeric_dtype(series):
+        # Values typed into the UI arrive as text; keep numeric columns numeric
+        try:
+            return pd.to_numeric(fill_value)
+        except ValueError:
+            pass
+    return fill_value
+
+
+def to_numeric_op(df: pd.DataFrame, cols: List[str], **_) -> pd.DataFrame:
+    return map_columns(df, cols, _to_numeric)
+
+
+def to_string_op(df: pd.DataFrame, cols: List[str], **_) -> pd.DataFrame:
+    df = df.astype(dict.fromkeys(cols, str))
     return df
 
 
-def to_datetime_op(df: pd.DataFrame, col: str, **_) -> pd.DataFrame:
-    df[col] = pd.to_datetime(df[col], errors="coerce")
-    return df
+def to_datetime_op(df: pd.DataFrame, cols: List[str], **_) -> pd.DataFrame:
+    return map_columns(df, cols, _to_datetime)
 
 
-def lowercase_op(df: pd.DataFrame, col: str, **_) -> pd.DataFrame:
-    df[col] = df[col].str.lower()
-    return df
+def lowercase_op(df: pd.DataFrame, cols: List[str], **_) -> pd.DataFrame:
+    return map_columns(df, cols, string_function("lowercase"))
 
 
-def uppercase_op(df: pd.DataFrame, col: str, **_) -> pd.DataFrame:
-    df[col] = df[col].str.upper()
-    return df
+def uppercase_op(df: pd.DataFrame, cols: List[str], **_) -> pd.DataFrame:
+    return map_columns(df, cols, string_function("uppercase"))
 
 
-def trim_op(df: pd.DataFrame, col: str, **_) -> pd.DataFrame:
-    df[col] = df[col].str.strip()
-    return df
+def trim_op(df: pd.DataFrame, cols: List[str], **_) -> pd.DataFrame:
+    return map_columns(df, cols, string_function("trim"))
 
 
-def drop_column_op(df: pd.DataFrame, col: str, **_) -> pd.DataFrame:
-    df = df.drop(columns=[col])
+def drop_column_op(df: pd.DataFrame, cols: List[str], **_) -> pd.DataFrame:
+    df = df.drop(columns=cols)
     return df
 
 
 def rename_column_op(
-    df: pd.DataFrame, col: str, new_name: Optional[str] = None, **_
+    df: pd.DataFrame, cols: List[str], new_name: Optional[str] = None, **_
 ) -> pd.DataFrame:
+    if len(cols) != 1:
+        raise ValueError("Rename one column at a time.")
     if new_name:
-        df = df.rename(columns={col: new_name})
+        df = df.rename(columns={cols[0]: new_name})
     return df
 
 
-def normalize_op(df: pd.DataFrame, col: str, **_) -> pd.DataFrame:
-    df[col] = pd.to_numeric(df[col], errors="coerce")
-    df[col] = df[col].fillna(0)
-    scaler = MinMaxScaler()
-    df[col] = scaler.fit_transform(df[[col]])
+def normalize_op(df: pd.DataFrame, cols: List[str], **_) -> pd.DataFrame:
+    df = map_columns(df, cols, _to_numeric)
+    df[cols] = df[cols].fillna(0)
+    # Scales each column to [0, 1] on its own, all in one fit
+    df[cols] = MinMaxScaler().fit_transform(df[cols])
     return df
 
 
-def remove_outliers_op(df: pd.DataFrame, col: str, **_) -> pd.DataFrame:
-    df[col] = pd.to_numeric(df[col], errors="coerce")
-    z_scores = np.abs(stats.zscore(df[col].dropna()))
-    full_mask = df[col].notna()
-    full_mask.loc[df[col].notna()] = z_scores >= 3
-    df.loc[full_mask, col] = None
+def remove_outliers_op(df: pd.DataFrame, cols: List[str], **_) -> pd.DataFrame:
+    df = map_columns(df, cols, _to_numeric)
+    values = df[cols]
+    # Each column's z-scores over its non-missing values, in one call
+    z_scores = np.abs(stats.zscore(values.to_numpy(dtype=float), nan_policy="omit"))
+    df[cols] = values.mask(z_scores >= 3)
     return df
 
 
-def drop_duplicates_op(df: pd.DataFrame, col: str, **_) -> pd.DataFrame:
-    df = df.drop_duplicates(subset=[col])
+def drop_duplicates_op(df: pd.DataFrame, cols: List[str], **_) -> pd.DataFrame:
+    df = df.drop_duplicates(subset=cols)
     return df
 
 
-def sort_asc_op(df: pd.DataFrame, col: str, **_) -> pd.DataFrame:
-    df = df.sort_values(by=col, ascending=True)
+def sort_asc_op(df: pd.DataFrame, cols: List[str], **_) -> pd.DataFrame:
+    df = df.sort_values(by=cols, ascending=True, kind="stable")
     return df
 
 
-def sort_desc_op(df: pd.DataFrame, col: str, **_) -> pd.DataFrame:
-    df = df.sort_values(by=col, ascending=False)
+def sort_desc_op(df: pd.DataFrame, cols: List[str], **_) -> pd.DataFrame:
+    df = df.sort_values(by=cols, ascending=False, kind="stable")
     return df
 
 
@@ -159,17 +382,21 @@ OPERATIONS = {
 def apply_operation(
     df: pd.DataFrame,
     operation: str,
-    column: str,
+    column: Columns,
     fill_value: Optional[str] = None,
     new_name: Optional[str] = None,
 ) -> pd.DataFrame:
     """
-    Apply a named cleaning operation to a DataFrame column.
+    Apply a named cleaning operation to one or more DataFrame columns.
+
+    Row operations on several columns use them together: dropna drops rows
+    missing any of them, drop_duplicates compares their combination and
+    sorts order by them in turn.
 
     Args:
         df: The input DataFrame.
         operation: Key from OPERATIONS dict.
-        column: Target column name.
+        column: Target column name, list of names, or COLUMN_SELECTORS key.
         fill_value: Optional value for fill/strip operations.
         new_name: Optional new name for rename operation.
 
@@ -177,11 +404,69 @@ def apply_operation(
         The modified DataFrame.
 
     Raises:
-        KeyError: If the operation is not recognized.
+        KeyError: If the operation or a column is not recognized.
+        ValueError: If the DataFrame is empty or no column is selected.
     """
     if df.empty:
         raise ValueError("Cannot apply operations to an empty DataFrame.")
-    if column not in df.columns:
-        raise KeyError(f"Column '{column}' not found. Available: {list(df.columns)}")
+    cols = resolve_columns(df, column)
     fn = OPERATIONS[operation]
-    return fn(df, column, fill_value=fill_value, new_name=new_name)
+    return fn(df, cols, fill_value=fill_value, new_name=new_name)
+
+
+# ---------------------------------------------------------------------------
+# Chunked execution
+# ---------------------------------------------------------------------------
+
+# Operations whose result for a row depends only on that row
+STREAMING_OPS = {
+    "lstrip",
+    "rstrip",
+    "alnum",
+    "dropna",
+    "fillna",
+    "to_numeric",
+    "to_string",
+    "lowercase",
+    "uppercase",
+    "trim",
+    "drop_column",
+    "rename_column",
+}
+
+
+def can_stream(operation: str, fill_value: Optional[str] = None) -> bool:
+    """
+    Whether an operation can run chunk by chunk.
+
+    fillna without a value fills with the column mean/mode, which needs the
+    whole column, so it only streams with an explicit fill_value.
+    """
+    if operation == "fillna":
+        return fill_value is not None
+    return operation in STREAMING_OPS
+
+
+# ---------------------------------------------------------------------------
+# Recipes: several operations applied in one pass
+# ---------------------------------------------------------------------------
+
+
+class CleaningStep(NamedTuple):
+    """One operation of a recipe, with the arguments of apply_operation."""
+
+    operation: str
+    column: Columns
+    fill_value: Optional[str] = None
+    new_name: Optional[str] = None
+
+    @property
+    def description(self) -> str:
+        return f"{self.operation} on {column_label(self.column)}"
+
+
+def recipe_description(steps: Sequence[CleaningStep]) -> str:
+    """Describe a recipe for the history log."""
+    if len(steps) == 1:
+        return steps[0].description
+    return f"{len(steps)} steps: " + ", ".join(step.description for step in steps)
@@ -0,0 +1,371 @@
+"""
+Lazy cleaning plans.
+
+A CleaningPlan records cleaning steps without running them. Nothing is
+computed until a result is needed (collect or stream), and before that
+the plan is rewritten into an equivalent, cheaper one:
+
+- steps on a column that a later step drops are removed, and a dropped
+  column that no step reads is not loaded at all (projection);
+- row filters (dropna, drop_duplicates) move ahead of value-only steps on
+  other columns, so those steps see fewer rows;
+- a sort made redundant by a later sort on the same column is removed;
+- string operations on the same column are fused into one step, which
+  takes the column from the frame and writes it back once.
+
+Steps on a column selector such as "@text" are not rewritten: their
+columns are only known when they run.
+
+Pure business logic — no Dash dependencies.
+"""
+
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+import pandas as pd
+
+from pyexploratory.core.cleaning_ops import (
+    COLUMN_SELECTORS,
+    OPERATIONS,
+    CleaningStep,
+    Columns,
+    can_stream,
+    resolve_columns,
+    string_function,
+)
+
+# Operations that change which rows there are or their order
+ROW_OPS = {"dropna", "drop_duplicates", "sort_asc", "sort_desc"}
+# Row filters that keep the order of the remaining rows
+FILTER_OPS = {"dropna", "drop_duplicates"}
+SORT_OPS = {"sort_asc", "sort_desc"}
+# Operations that map each value of one column on its own
+STRING_OPS = {"lstrip", "rstrip", "alnum", "lowercase", "uppercase", "trim"}
+
+
+class FusedStringStep(NamedTuple):
+    """Several string operations on one column, applied together."""
+
+    column: str
+    steps: Tuple[CleaningStep, ...]
+
+    @property
+    def operation(self) -> str:
+        return "+".join(step.operation for step in self.steps)
+
+    @property
+    def description(self) -> str:
+        return f"{self.operation} on {self.column}"
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Same result as applying the steps one by one, but the column is
+        taken from the frame and written back once, and the Arrow kernels
+        run back to back on it.
+        """
+        series = df[self.column]
+        for step in self.steps:
+            series = string_function(step.operation, step.fill_value)(series)
+        df[self.column] = series
+        return df
+
+
+PlanStep = Union[CleaningStep, FusedStringStep]
+
+
+class CleaningPlan(NamedTuple):
+    """An ordered list of cleaning steps, run only when a result is needed."""
+
+    steps: Tuple[PlanStep, ...] = ()
+
+    def then(
+        self,
+        operation: str,
+        column: Columns,
+        fill_value: Optional[str] = None,
+        new_name: Optional[str] = None,
+    ) -> "CleaningPlan":
+        """Return the plan with one more step; nothing is computed."""
+        step = CleaningStep(operation, column, fill_value, new_name)
+        return CleaningPlan(self.steps + (step,))
+
+    def optimized(self) -> "CleaningPlan":
+        """Return an equivalent plan that does less work."""
+        steps = [s for s in self.steps if isinstance(s, CleaningStep)]
+        if len(steps) != len(self.steps):
+            # Already optimized
+            return self
+        for optimize in (_prune_dropped, _push_filters, _collapse_sorts):
+            steps = optimize(steps)
+        return CleaningPlan(tuple(_fuse_strings(steps)))
+
+    def projection(self, columns: Sequence[str]) -> Tuple[List[str], "CleaningPlan"]:
+        """
+        Split off the columns the plan drops without reading.
+
+        Args:
+            columns: The dataset's columns.
+
+        Returns:
+            The columns to load, and the plan to run on them (without the
+            drop_column steps for the columns left out).
+        """
+        skipped = {column for column in columns if _dropped_unread(self.steps, column)}
+        if len(skipped) == len(columns):
+            # Keep one column so the frame still has its rows
+            skipped.discard(columns[0])
+        steps = []
+        for step in self.steps:
+            names = _named(step)
+            if (
+                isinstance(step, CleaningStep)
+                and step.operation == "drop_column"
+                and names is not None
+            ):
+                names = [name for name in names if name not in skipped]
+                if not names:
+                    continue
+                step = _with_columns(step, names)
+            steps.append(step)
+        return [c for c in columns if c not in skipped], CleaningPlan(tuple(steps))
+
+    def collect(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Optimize the plan and run it on an in-memory DataFrame.
+
+        A frame emptied by a filter is passed through the remaining steps
+        (a filter may have moved ahead of them).
+
+        Raises:
+            ValueError: If the DataFrame is empty to begin with.
+            KeyError: If an operation or column is not recognized.
+        """
+        if df.empty:
+            raise ValueError("Cannot apply operations to an empty DataFrame.")
+        for step in self.optimized().steps:
+            df = _apply_step(df, step)
+        return df
+
+    def stream(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Optimize the plan and run it over a stream of chunks in one pass.
+
+        As in collect, a chunk emptied by a filter goes through the
+        remaining steps instead of failing them.
+
+        Raises:
+            ValueError: If a step cannot run chunk by chunk.
+        """
+        steps = self.optimized().steps
+        for step in steps:
+            if isinstance(step, CleaningStep) and not can_stream(
+                step.operation, step.fill_value
+            ):
+                raise ValueError(
+                    f"Operation '{step.operation}' needs the whole column and "
+                    "cannot run chunk by chunk."
+                )
+        for step in steps:
+            chunks = _stream_step(chunks, step)
+        return iter(chunks)
+
+    def explain(self) -> List[str]:
+        """Describe the steps in the order they run."""
+        return [step.description for step in self.steps]
+
+
+# ---------------------------------------------------------------------------
+# Execution
+# ---------------------------------------------------------------------------
+
+
+def _apply_step(df: pd.DataFrame, step: PlanStep) -> pd.DataFrame:
+    cols = resolve_columns(df, step.column)
+    if isinstance(step, FusedStringStep):
+        return step.apply(df)
+    fn = OPERATIONS[step.operation]
+    return fn(df, cols, fill_value=step.fill_value, new_name=step.new_name)
+
+
+def _stream_step(chunks: Iterable[pd.DataFrame], step: PlanStep):
+    for chunk in chunks:
+        chunk = _apply_step(chunk, step)
+        if step.operation == "to_numeric":
+            # A chunk without decimals or gaps would come out as int64 and
+            # clash with the float64 chunks of the same column
+            cols = resolve_columns(chunk, step.column)
+            chunk[cols] = chunk[cols].astype("float64")
+        yield chunk
+
+
+# ---------------------------------------------------------------------------
+# Optimization passes
+# ---------------------------------------------------------------------------
+
+
+def _named(step: PlanStep) -> Optional[List[str]]:
+    """
+    The columns a step names, or None for a selector: its columns are only
+    known when it runs, so the passes assume it may use any column.
+    """
+    if isinstance(step.column, str):
+        return None if step.column in COLUMN_SELECTORS else [step.column]
+    return list(step.column)
+
+
+def _uses(step: PlanStep, column: str) -> bool:
+    """Whether a step reads, changes or creates a column."""
+    names = _named(step)
+    if names is None:
+        return True
+    return column in names or getattr(step, "new_name", None) == column
+
+
+def _dropped_unread(steps: Sequence[PlanStep], column: str) -> bool:
+    """Whether the first step that uses a column drops it by name."""
+    first = next((s for s in steps if _uses(s, column)), None)
+    return (
+        first is not None
+        and first.operation == "drop_column"
+        and _named(first) is not None
+    )
+
+
+def _with_columns(step: CleaningStep, names: List[str]) -> CleaningStep:
+    """The step on fewer of its named columns."""
+    return step._replace(column=names if isinstance(step.column, list) else names[0])
+
+
+def _value_only(step: CleaningStep) -> bool:
+    """
+    Whether a step maps each value of its column on its own, with a result
+    type that does not depend on the other rows.
+    """
+    if step.operation == "fillna":
+        return step.fill_value is not None
+    return step.operation in STRING_OPS or step.operation == "to_string"
+
+
+def _prune_dropped(steps: List[CleaningStep]) -> List[CleaningStep]:
+    """Remove steps that only change values of a column dropped later."""
+    kept: List[CleaningStep] = []
+    dropped: Set[str] = set()
+    # Walking backwards, dropped holds the columns dropped later on
+    for step in reversed(steps):
+        names = _named(step)
+        if step.operation == "drop_column":
+            dropped.update(names or ())
+        elif names is None:
+            if step.operation in ROW_OPS:
+                dropped.clear()
+        elif step.operation in ROW_OPS:
+            # Rows kept and their order depend on the columns' values
+            dropped.difference_update(names)
+        elif step.operation == "rename_column":
+            if step.new_name and step.new_name in dropped:
+                dropped.discard(step.new_name)
+                dropped.update(names)
+            else:
+                dropped.difference_update(names)
+        else:
+            live = [name for name in names if name not in dropped]
+            if not live:
+                continue
+            if len(live) < len(names):
+                step = _with_columns(step, live)
+        kept.append(step)
+    return kept[::-1]
+
+
+def _push_filters(steps: List[CleaningStep]) -> List[CleaningStep]:
+    """Move row filters ahead of value-only steps on other columns."""
+    steps = list(steps)
+    for i, step in enumerate(steps):
+        names = _named(step)
+        if step.operation not in FILTER_OPS or names is None:
+            continue
+        j = i
+        while (
+            j > 0
+            and _value_only(steps[j - 1])
+            and not any(_uses(steps[j - 1], name) for name in names)
+        ):
+            steps[j - 1], steps[j] = steps[j], steps[j - 1]
+            j -= 1
+    return steps
+
+
+def _collapse_sorts(steps: List[CleaningStep]) -> List[CleaningStep]:
+    """
+    Remove a sort when a later sort on the same column overrides it.
+
+    Sorts are stable, so sorting twice by one column equals the second
+    sort alone, unless something in between changes the column or depends
+    on the row order.
+    """
+    kept: List[CleaningStep] = []
+    for i, step in enumerate(steps):
+        if step.operation in SORT_OPS and _sorted_again(steps[i + 1 :], step):
+            continue
+        kept.append(step)
+    return kept
+
+
+def _sorted_again(later: Sequence[CleaningStep], sort: CleaningStep) -> bool:
+    names = _named(sort)
+    if names is None:
+        return False
+    for step in later:
+        if step.operation in SORT_OPS and _named(step) == names:
+            return True
+        if step.operation in ROW_OPS - {"dropna"} or any(
+            _uses(step, name) for name in names
+        ):
+            return False
+    return False
+
+
+def _fuse_strings(steps: List[CleaningStep]) -> List[PlanStep]:
+    """
+    Fuse string operations on one column into a single step.
+
+    A later string operation joins an earlier one when no step in between
+    uses the column; string operations commute with everything else.
+    """
+    fused: List[PlanStep] = []
+    taken: Set[int] = set()
+    for i, step in enumerate(steps):
+        if i in taken:
+            continue
+        column = step.column
+        # Only steps naming one column; not selectors or lists
+        if (
+            step.operation not in STRING_OPS
+            or not isinstance(column, str)
+            or _named(step) is None
+        ):
+            fused.append(step)
+            continue
+        group = [step]
+        for j in range(i + 1, len(steps)):
+            if j in taken:
+                continue
+            other = steps[j]
+            if other.operation in STRING_OPS and other.column == column:
+                group.append(other)
+                taken.add(j)
+            elif _uses(other, column):
+                break
+        fused.append(
+            group[0] if len(group) == 1 else FusedStringStep(column, tuple(group))
+        )
+    return fused
@@ -0,0 +1,101 @@
+"""
+Column-parallel execution of column-local cleaning operations.
+
+Operations such as alnum (a regex replace), to_datetime and lowercase
+transform each column on its own, so on a wide frame the columns can be
+processed at the same time. map_columns fans them out to a pool and puts
+the results back into the frame in column order:
+
+- object columns go to worker processes: cleaning Python string objects
+  holds the GIL, so threads would take turns;
+- other columns (Arrow-backed strings, numbers, categoricals) go to
+  threads: their kernels run in C/C++ without the GIL, and threads share
+  the data instead of pickling it to another process.
+
+Frames under PARALLEL_CLEANING_MIN_ROWS rows, single columns and
+CLEANING_WORKERS = 1 run serially, where the pool would only add overhead.
+
+Pure business logic — no Dash dependencies.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional, Sequence
+
+import pandas as pd
+
+from pyexploratory.config import CLEANING_WORKERS, PARALLEL_CLEANING_MIN_ROWS
+
+# Pools outlive a single operation so later ones skip start-up
+_threads: Optional[ThreadPoolExecutor] = None
+_processes: Optional[ProcessPoolExecutor] = None
+# Process that started _processes; a forked child must not reuse it
+_processes_pid: Optional[int] = None
+
+
+def map_columns(
+    df: pd.DataFrame, cols: Sequence[str], fn: Callable[[pd.Series], pd.Series]
+) -> pd.DataFrame:
+    """
+    Replace each column in cols with fn(column), in parallel when it pays.
+
+    Args:
+        df: The frame, modified in place and returned.
+        cols: Columns to transform.
+        fn: Maps one column to its new values. Object columns are sent to
+            worker processes, so fn must be picklable: a module-level
+            function or a functools.partial of one.
+
+    Raises:
+        Exception: The first error fn raises for a column.
+    """
+    global _processes
+    if len(cols) < 2 or CLEANING_WORKERS <= 1 or len(df) < PARALLEL_CLEANING_MIN_ROWS:
+        for col in cols:
+            df[col] = fn(df[col])
+        return df
+    columns = [df[col] for col in cols]
+    try:
+        futures = [_pool_for(column).submit(fn, column) for column in columns]
+        results = [future.result() for future in futures]
+    except BrokenProcessPool:
+        # A worker died (e.g. out of memory); start a fresh pool next time
+        _processes = None
+        raise
+    for col, result in zip(cols, results):
+        df[col] = result
+    return df
+
+
+def shutdown_pools() -> None:
+    """Stop the worker pools; they are started again on demand."""
+    global _threads, _processes
+    for pool in (_threads, _processes):
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    _threads = _processes = None
+
+
+def _pool_for(column: pd.Series) -> Executor:
+    return _get_processes() if column.dtype == object else _get_threads()
+
+
+def _get_threads() -> ThreadPoolExecutor:
+    global _threads
+    if _threads is None:
+        _threads = ThreadPoolExecutor(max_workers=CLEANING_WORKERS)
+    return _threads
+
+
+def _get_processes() -> ProcessPoolExecutor:
+    global _processes, _processes_pid
+    if _processes is None or _processes_pid != os.getpid():
+        # spawn: forking a multi-threaded web server can deadlock workers
+        _processes = ProcessPoolExecutor(
+            max_workers=CLEANING_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        _processes_pid = os.getpid()
+    return _processes
@@ -1,62 +1,492 @@
 """
-Abstraction over the local CSV data store.
+Abstraction over the local columnar data store.
+
+The working dataset is persisted as a single Parquet file so that reads are
+fast and dtypes survive a round trip exactly. CSV, Feather and Parquet are
+produced on export.
+
+Reads rely on pandas Copy-on-Write: every caller gets its own DataFrame
+object over the shared cached buffers, and a column is only copied when a
+caller actually modifies it. Read-only callers (summary, charts, ML) never
+duplicate the dataset. Copy-on-Write is always on from pandas 3.0; on
+pandas 2 the app turns it on at startup (see app.py), and this module does
+not change the option itself. Without it, read_data returns deep copies so
+that callers cannot modify the cache. Columns are cached individually in a
+memory-budgeted LRU keyed by dataset version (see core.dataset_cache), so
+undo snapshots and other uploads can stay in memory, and
+read_data(columns=...) only loads the requested columns from disk.
+
+Files are written as a stream of row groups of CHUNK_ROWS rows. Datasets
+larger than CHUNKED_MODE_THRESHOLD_MB in memory are never loaded whole:
+callers check is_chunked_mode() and stream them with iter_chunks() and
+transform_chunks() instead.
+
+Every written file carries a column metadata catalog in its footer (see
+core.catalog), which dropdowns and validators read instead of row data,
+and a content-hash version id that keys every derived result (see
+core.result_cache).
 
 All modules should use these functions instead of directly calling
-pd.read_csv("local_data.csv") or df.to_csv("local_data.csv").
+pd.read_parquet(DATA_FILE) or df.to_parquet(DATA_FILE).
 """
 
+import hashlib
 import os
-from typing import Dict, List
+import shutil
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
 
+import openpyxl
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
-from pyexploratory.config import DATA_FILE
+from pyexploratory.config import (
+    CHUNK_ROWS,
+    CHUNKED_MODE_THRESHOLD_MB,
+    DATA_CACHE_BUDGET_MB,
+    DATA_FILE,
+    FEATHER_COMPRESSION,
+    PARQUET_COMPRESSION,
+)
+from pyexploratory.core.catalog import CatalogBuilder, DatasetCatalog, build_catalog
+from pyexploratory.core.dataset_cache import CacheStats, DatasetCache
 
-_cache: dict = {"mtime": None, "df": None}
+CATALOG_METADATA_KEY = b"pyexploratory.catalog"
+VERSION_METADATA_KEY = b"pyexploratory.version"
+# Rows in an Excel worksheet, including the header row
+EXCEL_MAX_ROWS = 1_048_576
 
+# Metadata of DATA_FILE, valid while its mtime is unchanged
+_cache: dict = {"mtime": None, "names": None, "version": None, "catalog": None}
 
-def read_data() -> pd.DataFrame:
-    """Read the current dataset from disk, with mtime-based caching."""
-    current_mtime = os.path.getmtime(DATA_FILE)
-    if _cache["mtime"] == current_mtime and _cache["df"] is not None:
-        return _cache["df"].copy()
-    df = pd.read_csv(DATA_FILE)
-    _cache["mtime"] = current_mtime
-    _cache["df"] = df
-    return df.copy()
+# Column data of every dataset version read so far
+_frames = DatasetCache(DATA_CACHE_BUDGET_MB * 1024 * 1024)
+
+
+def read_file(path: str) -> pd.DataFrame:
+    """Load a Parquet dataset file from an arbitrary path, through the cache."""
+    names = pq.read_schema(path).names
+    return _read_columns(path, read_version(path), names)
+
+
+def write_file(
+    df: pd.DataFrame, path: str, source_memory: Optional[int] = None
+) -> None:
+    """
+    Write a DataFrame to an arbitrary path in the store's Parquet layout.
+
+    Args:
+        df: Data to persist.
+        path: Destination file.
+        source_memory: Optional in-memory size of the data as originally
+                       parsed, recorded in the catalog to report savings
+                       from ingest-time dtype optimization.
+    """
+    write_chunks([df], path, source_memory=source_memory)
+
+
+def write_chunks(
+    chunks: Iterable[pd.DataFrame],
+    path: str,
+    source_memory: Optional[int] = None,
+    schema: Optional[pa.Schema] = None,
+) -> None:
+    """
+    Write a stream of DataFrames to one Parquet file, one chunk at a time.
+
+    The file is partitioned into row groups of CHUNK_ROWS rows, so it can
+    later be read back chunk by chunk. Catalog and version are accumulated
+    while writing and equal those of the concatenated data. The file is
+    written next to path and moved into place only once complete.
+
+    Args:
+        chunks: DataFrames with the same columns; the first one fixes the
+                schema and later ones are cast to it.
+        path: Destination file.
+        source_memory: See write_file.
+        schema: Arrow schema to cast every chunk to, instead of the first
+                chunk's (whose all-null columns have no usable type).
+
+    Raises:
+        ValueError: If chunks is empty or a chunk does not fit the schema.
+    """
+    tmp_path = f"{path}.tmp"
+    catalog = CatalogBuilder(source_memory)
+    hasher = _ContentHasher()
+    writer = None
+    try:
+        for chunk in chunks:
+            chunk = _prepare_for_parquet(chunk)
+            if writer is None:
+                if schema is None:
+                    schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(
+                    tmp_path, schema, compression=PARQUET_COMPRESSION
+                )
+            try:
+                table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            except pa.ArrowException as e:
+                raise ValueError(
+                    f"Chunk at row {catalog.rows} does not match the "
+                    f"dataset schema: {e}"
+                ) from e
+            writer.write_table(table, row_group_size=CHUNK_ROWS)
+            catalog.add(chunk)
+            hasher.update(chunk)
+        if writer is None:
+            raise ValueError("Cannot write a dataset without any chunks.")
+        writer.add_key_value_metadata(
+            {
+                CATALOG_METADATA_KEY: catalog.result().to_json(),
+                VERSION_METADATA_KEY: hasher.hexdigest(),
+            }
+        )
+        writer.close()
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+
+def iter_file_chunks(
+    path: str,
+    columns: Optional[Sequence[str]] = None,
+    chunk_rows: Optional[int] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a dataset file as DataFrames of at most chunk_rows rows.
+
+    Only one chunk is held in memory at a time and nothing goes through the
+    column cache, so this works for files larger than RAM. chunk_rows
+    defaults to CHUNK_ROWS.
+    """
+    parquet = pq.ParquetFile(path)
+    schema = parquet.schema_arrow
+    if columns is not None:
+        schema = pa.schema([schema.field(c) for c in columns], metadata=schema.metadata)
+    batches = parquet.iter_batches(batch_size=chunk_rows or CHUNK_ROWS, columns=columns)
+    for batch in batches:
+        # The full schema carries the pandas metadata (categoricals, etc.)
+        yield pa.Table.from_batches([batch], schema=schema).to_pandas()
+
+
+def read_catalog(path: str) -> DatasetCatalog:
+    """Load the column catalog of a dataset file from its footer."""
+    metadata = pq.read_metadata(path).metadata or {}
+    if CATALOG_METADATA_KEY in metadata:
+        return DatasetCatalog.from_json(metadata[CATALOG_METADATA_KEY])
+    # Files written outside the store have no catalog yet
+    return build_catalog(pd.read_parquet(path))
+
+
+def read_version(path: str) -> str:
+    """Load the content-hash version id of a dataset file from its footer."""
+    metadata = pq.read_metadata(path).metadata or {}
+    if VERSION_METADATA_KEY in metadata:
+        return metadata[VERSION_METADATA_KEY].decode("utf-8")
+    return content_hash(pd.read_parquet(path))
+
+
+def content_hash(df: pd.DataFrame) -> str:
+    """
+    Hash a DataFrame's column names, storage types and values.
+
+    Identical data always gets the same id, so a state reached again (e.g.
+    by undo) finds the results cached for it earlier.
+    """
+    return _ContentHasher().update(df).hexdigest()
+
+
+class _ContentHasher:
+    """
+    Incremental content_hash: one digest per column, fed chunk by chunk.
+
+    Hashing per column makes the id independent of how the rows were split
+    into chunks.
+    """
+
+    def __init__(self):
+        self._fields: Optional[List[str]] = None
+        self._digests: Dict[str, "hashlib.blake2b"] = {}
+
+    def update(self, df: pd.DataFrame) -> "_ContentHasher":
+        if self._fields is None:
+            schema = pa.Schema.from_pandas(df, preserve_index=False)
+            # string/large_string only differ in offset width, not in content
+            self._fields = [
+                f"{field.name}:{field.type}".replace("large_", "") for field in schema
+            ]
+        for col in df.columns:
+            try:
+                hashes = pd.util.hash_pandas_object(df[col], index=False)
+            except TypeError:
+                # Unhashable cells, e.g. lists from nested JSON
+                hashes = pd.util.hash_pandas_object(df[col].astype(str), index=False)
+            digest = self._digests.setdefault(col, hashlib.blake2b(digest_size=16))
+            digest.update(hashes.to_numpy().tobytes())
+        return self
+
+    def hexdigest(self) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        for field, col_digest in zip(self._fields or [], self._digests.values()):
+            digest.update(field.encode())
+            digest.update(col_digest.digest())
+        return digest.hexdigest()
+
+
+def read_data(columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Read the current dataset from disk, with mtime-based per-column caching.
+
+    The returned frame is a Copy-on-Write view of the cached data: reading
+    it is free, and mutating it copies only the touched columns without
+    affecting the cache or other callers.
+
+    Args:
+        columns: Optional subset of columns to return. Only columns that are
+                 not cached yet are read from disk. Duplicates are ignored.
+
+    Raises:
+        FileNotFoundError: If no dataset has been uploaded.
+        KeyError: If a requested column does not exist.
+    """
+    names = list_columns()
+    wanted = names if columns is None else list(dict.fromkeys(columns))
+    unknown = [c for c in wanted if c not in names]
+    if unknown:
+        raise KeyError(f"Columns not found: {unknown}. Available: {names}")
+    return _read_columns(DATA_FILE, dataset_version(), wanted)
+
+
+def list_columns() -> List[str]:
+    """Return the current dataset's column names without reading any rows."""
+    _sync_cache()
+    return list(_cache["names"])
 
 
-def write_data(df: pd.DataFrame) -> None:
+def get_catalog() -> DatasetCatalog:
+    """Return the current dataset's column catalog without reading any rows."""
+    _sync_cache()
+    if _cache["catalog"] is None:
+        _cache["catalog"] = read_catalog(DATA_FILE)
+    return _cache["catalog"]
+
+
+def dataset_version() -> str:
+    """Return the current dataset's content-hash version id."""
+    _sync_cache()
+    if _cache["version"] is None:
+        _cache["version"] = read_version(DATA_FILE)
+    return _cache["version"]
+
+
+def cache_stats() -> CacheStats:
+    """Return hit/miss/eviction counters of the in-memory dataset cache."""
+    return _frames.stats()
+
+
+def write_data(df: pd.DataFrame, source_memory: Optional[int] = None) -> None:
     """Persist a DataFrame back to disk and invalidate cache."""
-    df.to_csv(DATA_FILE, index=False)
-    _cache["mtime"] = None
-    _cache["df"] = None
+    write_file(df, DATA_FILE, source_memory=source_memory)
+    invalidate_cache()
+
+
+def write_data_chunks(
+    chunks: Iterable[pd.DataFrame], source_memory: Optional[int] = None
+) -> None:
+    """Persist a stream of DataFrames as the current dataset."""
+    write_chunks(chunks, DATA_FILE, source_memory=source_memory)
+    invalidate_cache()
+
+
+def iter_chunks(
+    columns: Optional[Sequence[str]] = None, chunk_rows: Optional[int] = None
+) -> Iterator[pd.DataFrame]:
+    """Stream the current dataset chunk by chunk (see iter_file_chunks)."""
+    return iter_file_chunks(DATA_FILE, columns=columns, chunk_rows=chunk_rows)
+
+
+def transform_chunks(
+    transform: Callable[[Iterator[pd.DataFrame]], Iterable[pd.DataFrame]],
+    columns: Optional[Sequence[str]] = None,
+) -> None:
+    """
+    Rewrite the current dataset by streaming it through a transform.
+
+    Args:
+        transform: Receives an iterator of chunks and yields the new chunks.
+                   Peak memory is about one input and one output chunk.
+        columns: Columns to read; the others are left out of the result.
+    """
+    write_data_chunks(transform(iter_chunks(columns)), get_catalog().source_memory)
+
+
+def is_chunked_mode() -> bool:
+    """
+    Whether the current dataset is too large to load as one DataFrame.
+
+    Callers then stream it with iter_chunks/transform_chunks instead of
+    read_data().
+    """
+    return get_catalog().memory > CHUNKED_MODE_THRESHOLD_MB * 1024 * 1024
+
+
+def export_csv(path_or_buf) -> None:
+    """Export the current dataset as CSV (text is an export format only)."""
+    if isinstance(path_or_buf, (str, os.PathLike)):
+        with open(path_or_buf, "w", newline="", encoding="utf-8") as f:
+            export_csv(f)
+        return
+    # Streamed chunk by chunk so large datasets are never loaded whole
+    for i, chunk in enumerate(iter_chunks()):
+        chunk.to_csv(path_or_buf, index=False, header=i == 0)
+
+
+def export_parquet(path_or_buf) -> None:
+    """Export the current dataset as Parquet: a byte copy of the store."""
+    if isinstance(path_or_buf, (str, os.PathLike)):
+        shutil.copyfile(DATA_FILE, path_or_buf)
+        return
+    with open(DATA_FILE, "rb") as f:
+        shutil.copyfileobj(f, path_or_buf)
+
+
+def export_feather(path_or_buf) -> None:
+    """Export the current dataset as Feather (the Arrow IPC file format)."""
+    if isinstance(path_or_buf, (str, os.PathLike)):
+        with open(path_or_buf, "wb") as f:
+            export_feather(f)
+        return
+    options = pa.ipc.IpcWriteOptions(compression=FEATHER_COMPRESSION)
+    with (
+        pq.ParquetFile(DATA_FILE) as parquet_file,
+        pa.ipc.new_file(
+            path_or_buf, parquet_file.schema_arrow, options=options
+        ) as writer,
+    ):
+        # One row group at a time, straight from Arrow without pandas
+        for i in range(parquet_file.num_row_groups):
+            writer.write_table(parquet_file.read_row_group(i))
+
+
+def export_xlsx(path_or_buf) -> None:
+    """
+    Export the current dataset as an Excel workbook, chunk by chunk.
+
+    openpyxl's write-only mode streams rows to the file, so a dataset in
+    chunked mode is never loaded whole.
+
+    Raises:
+        ValueError: If the dataset has more rows than a worksheet can hold.
+    """
+    rows = get_catalog().rows
+    if rows >= EXCEL_MAX_ROWS:
+        raise ValueError(
+            f"The dataset has {rows} rows, more than an Excel sheet holds "
+            f"({EXCEL_MAX_ROWS - 1}). Download it as CSV or Parquet instead."
+        )
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    sheet.append(list_columns())
+    for chunk in iter_chunks():
+        # Missing values become empty cells
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(path_or_buf)
 
 
 def invalidate_cache() -> None:
-    """Force cache invalidation (used by undo/redo)."""
+    """
+    Force re-reading DATA_FILE's metadata (used by undo/redo).
+
+    Cached column data is keyed by content version and stays valid; a
+    restored state that is still cached is served without a disk read.
+    """
     _cache["mtime"] = None
-    _cache["df"] = None
+    _cache["names"] = None
+    _cache["version"] = None
+    _cache["catalog"] = None
+
+
+def _read_columns(path: str, version: str, columns: List[str]) -> pd.DataFrame:
+    """Assemble a CoW frame of the given columns from the version cache."""
+    cached = _frames.get_columns(
+        version, columns, lambda missing: pd.read_parquet(path, columns=missing)
+    )
+    # Without Copy-on-Write, sharing the buffers would expose the cache
+    return pd.DataFrame(cached, copy=not _copy_on_write())
+
+
+def _copy_on_write() -> bool:
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    return bool(pd.get_option("mode.copy_on_write"))
+
+
+def _sync_cache() -> None:
+    """Drop cached state if the data file changed on disk."""
+    current_mtime = os.path.getmtime(DATA_FILE)
+    if _cache["mtime"] != current_mtime:
+        invalidate_cache()
+        _cache["names"] = pq.read_schema(DATA_FILE).names
+        _cache["mtime"] = current_mtime
+
+
+def _prepare_for_parquet(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Coerce what Parquet cannot store into something it can.
+
+    Parquet needs string column names and a single type per column. CSV
+    silently stringified both, so mixed-type object columns (e.g. after an
+    inline table edit) are stored as text, keeping missing values missing.
+    """
+    out = df
+    if not all(isinstance(c, str) for c in df.columns):
+        out = out.rename(columns=str)
+    for col in out.columns:
+        if out[col].dtype == "object" and pd.api.types.infer_dtype(
+            out[col], skipna=True
+        ).startswith("mixed"):
+            if out is df:
+                out = df.copy()
+            out[col] = out[col].where(out[col].isna(), out[col].astype(str))
+    return out
 
 
-def column_options(df: pd.DataFrame) -> List[Dict[str, str]]:
-    """Build Dash dropdown options from DataFrame columns."""
-    return [{"label": col, "value": col} for col in df.columns]
+def column_options(
+    catalog: Optional[DatasetCatalog] = None,
+) -> List[Dict[str, str]]:
+    """Build Dash dropdown options from the dataset's columns."""
+    if catalog is None:
+        catalog = get_catalog()
+    return [{"label": col, "value": col} for col in catalog.columns]
 
 
-def numeric_column_options(df: pd.DataFrame) -> List[Dict[str, str]]:
+def numeric_column_options(
+    catalog: Optional[DatasetCatalog] = None,
+) -> List[Dict[str, str]]:
     """Build Dash dropdown options for numeric columns only."""
+    if catalog is None:
+        catalog = get_catalog()
     return [
         {"label": col, "value": col}
-        for col in df.columns
-        if df[col].dtype != "object" and df[col].dtype.name != "category"
+        for col, info in catalog.columns.items()
+        if info.numeric
     ]
 
 
-def categorical_column_options(df: pd.DataFrame) -> List[Dict[str, str]]:
+def categorical_column_options(
+    catalog: Optional[DatasetCatalog] = None,
+) -> List[Dict[str, str]]:
     """Build Dash dropdown options for categorical columns only."""
+    if catalog is None:
+        catalog = get_catalog()
     return [
         {"label": col, "value": col}
-        for col in df.columns
-        if df[col].dtype == "object" or df[col].dtype.name == "category"
+        for col, info in catalog.columns.items()
+        if info.categorical
     ]
@@ -0,0 +1,107 @@
+"""
+Memory-budgeted LRU cache of dataset columns, keyed by dataset version.
+
+Several dataset states (the current upload, undo snapshots, other uploaded
+files) can stay in memory at once. Each entry holds the columns loaded so
+far for one version; whole entries are evicted least-recently-used first
+once the byte budget is exceeded.
+
+Pure business logic — no Dash dependencies.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Dict, List, NamedTuple, Sequence
+
+import pandas as pd
+
+
+class CacheStats(NamedTuple):
+    """Counters for sizing the cache budget."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+    budget: int
+
+
+class DatasetCache:
+    """LRU cache mapping dataset version -> {column name: Series}."""
+
+    def __init__(self, budget_bytes: int):
+        self.budget = budget_bytes
+        self._entries: "OrderedDict[str, Dict[str, pd.Series]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_columns(
+        self,
+        version: str,
+        columns: Sequence[str],
+        loader: Callable[[List[str]], pd.DataFrame],
+    ) -> Dict[str, pd.Series]:
+        """
+        Return the requested columns of a version, loading missing ones.
+
+        Args:
+            version: Dataset version id the columns belong to.
+            columns: Column names to return.
+            loader: Called with the missing column names on a miss; must
+                    return a DataFrame containing them.
+
+        Returns:
+            Dict of column name to Series, in the requested order.
+        """
+        entry = self._entries.setdefault(version, {})
+        self._sizes.setdefault(version, 0)
+        self._entries.move_to_end(version)
+
+        missing = [c for c in columns if c not in entry]
+        if missing:
+            self._misses += 1
+            loaded = loader(missing)
+            for col in missing:
+                entry[col] = loaded[col]
+                self._sizes[version] += int(
+                    loaded[col].memory_usage(deep=True, index=False)
+                )
+            self._evict()
+        else:
+            self._hits += 1
+        return {c: entry[c] for c in columns}
+
+    def cached_columns(self, version: str) -> List[str]:
+        """Return the names of the columns cached for a version."""
+        return list(self._entries.get(version, {}))
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            entries=len(self._entries),
+            bytes=sum(self._sizes.values()),
+            budget=self.budget,
+        )
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        self._entries.clear()
+        self._sizes.clear()
+        self._hits = self._misses = self._evictions = 0
+
+    def _evict(self) -> None:
+        """
+        Evict least recently used versions until within budget.
+
+        The most recently used entry always stays, even if it alone is
+        over budget.
+        """
+        while sum(self._sizes.values()) > self.budget and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            del self._entries[oldest]
+            del self._sizes[oldest]
+            self._evictions += 1
@@ -0,0 +1,145 @@
+"""
+Registry of uploaded datasets.
+
+Every upload is kept as its own Parquet file under DATASETS_DIR, in the
+store's layout. Exactly one of them is active: its data lives in DATA_FILE,
+where all tabs read it. Switching datasets saves the active one back first,
+so cleaning done on it is kept.
+
+Pure business logic — no Dash dependencies.
+"""
+
+import json
+import os
+import re
+import shutil
+from typing import Iterator, List, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from pyexploratory.config import CHUNK_ROWS, DATA_FILE, DATASETS_DIR
+from pyexploratory.core.data_store import invalidate_cache, write_chunks
+from pyexploratory.core.file_parser import COMPRESSED_EXTENSIONS
+
+_ACTIVE_FILE = "active.json"
+
+
+def dataset_name(filename: str, sheet: Optional[str] = None) -> str:
+    """
+    Derive a file-system safe dataset name from an upload's filename and,
+    for one sheet of a workbook, the sheet's name.
+    """
+    stem, extension = os.path.splitext(os.path.basename(filename))
+    if extension.lower() in COMPRESSED_EXTENSIONS:
+        # "sales.csv.gz" -> "sales"
+        stem = os.path.splitext(stem)[0]
+    if sheet is not None:
+        stem = f"{stem}_{sheet}"
+    return re.sub(r"[^\w.-]+", "_", stem).strip("._") or "dataset"
+
+
+def dataset_path(name: str) -> str:
+    """Return the file a dataset is stored in."""
+    return os.path.join(DATASETS_DIR, f"{name}.parquet")
+
+
+def list_datasets() -> List[str]:
+    """Return the names of all stored datasets, alphabetically."""
+    if not os.path.exists(DATASETS_DIR):
+        return []
+    return sorted(
+        name[: -len(".parquet")]
+        for name in os.listdir(DATASETS_DIR)
+        if name.endswith(".parquet")
+    )
+
+
+def active_dataset() -> Optional[str]:
+    """Return the name of the dataset currently in DATA_FILE, if any."""
+    path = os.path.join(DATASETS_DIR, _ACTIVE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        name = json.load(f).get("name")
+    return name if name in list_datasets() else None
+
+
+def activate_dataset(name: str) -> None:
+    """
+    Make a stored dataset the current one.
+
+    The previously active dataset is saved back to the registry first, so
+    its current state (including cleaning) is not lost.
+
+    Raises:
+        KeyError: If no dataset with that name is stored.
+    """
+    if name not in list_datasets():
+        raise KeyError(f"Dataset '{name}' not found. Available: {list_datasets()}")
+    previous = active_dataset()
+    if previous and previous != name and os.path.exists(DATA_FILE):
+        shutil.copyfile(DATA_FILE, dataset_path(previous))
+    # copyfile, not copy2: DATA_FILE must get a fresh mtime
+    shutil.copyfile(dataset_path(name), DATA_FILE)
+    with open(os.path.join(DATASETS_DIR, _ACTIVE_FILE), "w") as f:
+        json.dump({"name": name}, f)
+    invalidate_cache()
+
+
+def concat_files(paths: Sequence[str], dest: str) -> None:
+    """
+    Concatenate dataset files row-wise into one file, streaming.
+
+    Columns are matched by name; a column missing from a file is null in
+    its rows, and differing types are widened (e.g. int64 and float64 give
+    float64). Categoricals that cannot be merged are stored as text.
+
+    Raises:
+        ValueError: If a column's types cannot be reconciled.
+    """
+    schema = _unified_schema(paths)
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    write_chunks(_aligned_chunks(paths, schema), dest, schema=schema)
+
+
+def _unified_schema(paths: Sequence[str]) -> pa.Schema:
+    schemas = [pq.read_schema(path).remove_metadata() for path in paths]
+    try:
+        return pa.unify_schemas(schemas, promote_options="permissive")
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    decoded = [
+        pa.schema(
+            [
+                (
+                    field.with_type(field.type.value_type)
+                    if pa.types.is_dictionary(field.type)
+                    else field
+                )
+                for field in schema
+            ]
+        )
+        for schema in schemas
+    ]
+    try:
+        return pa.unify_schemas(decoded, promote_options="permissive")
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        raise ValueError(f"Files have incompatible columns: {e}") from e
+
+
+def _aligned_chunks(paths: Sequence[str], schema: pa.Schema) -> Iterator[pd.DataFrame]:
+    """Stream every file's rows, cast to the unified schema."""
+    for path in paths:
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=CHUNK_ROWS):
+            names = batch.schema.names
+            columns = [
+                (
+                    batch.column(field.name).cast(field.type)
+                    if field.name in names
+                    else pa.nulls(batch.num_rows, field.type)
+                )
+                for field in schema
+            ]
+            yield pa.Table.from_arrays(columns, schema=schema).to_pandas()
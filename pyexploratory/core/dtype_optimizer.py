@@ -0,0 +1,125 @@
+"""
+Ingest-time dtype optimization.
+
+Text columns always become Arrow-backed strings (to_arrow_strings): one
+contiguous buffer per column instead of a Python object per value, and
+.str methods that run in Arrow's compute kernels. Optionally, numeric
+columns are downcast to the smallest dtype that holds their values
+exactly and low-cardinality text columns become categoricals
+(optimize_dtypes), an opt-in stage after parse_upload.
+
+Pure business logic — no Dash dependencies.
+"""
+
+from typing import Dict, NamedTuple, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Text columns with at most this share of distinct values become categoricals
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+# The "str" dtype (pandas' default for text from 3.0): Arrow storage, with
+# NaN for missing values like the object columns it replaces
+ARROW_STRING_DTYPE = pd.StringDtype("pyarrow", na_value=np.nan)
+
+
+def as_arrow_strings(series: pd.Series) -> pd.Series:
+    """
+    Store a text column as Arrow strings.
+
+    Object columns qualify when every non-missing value is a str, so mixed
+    columns keep their values as they are; python-backed string columns
+    always do, keeping their missing-value marker.
+    """
+    dtype = series.dtype
+    if dtype == object:
+        if pd.api.types.infer_dtype(series, skipna=True) != "string":
+            return series
+        return series.astype(ARROW_STRING_DTYPE)
+    if isinstance(dtype, pd.StringDtype) and dtype.storage == "python":
+        if dtype.na_value is pd.NA:
+            return series.astype(pd.StringDtype("pyarrow"))
+        return series.astype(ARROW_STRING_DTYPE)
+    return series
+
+
+def to_arrow_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert every text column of a freshly parsed frame to Arrow strings."""
+    out = df
+    for col in df.columns:
+        series = df[col]
+        converted = as_arrow_strings(series)
+        if converted is not series:
+            if out is df:
+                out = df.copy(deep=False)
+            out[col] = converted
+    return out
+
+
+class DtypeReport(NamedTuple):
+    """Memory before/after optimization and the columns that changed."""
+
+    memory_before: int
+    memory_after: int
+    converted: Dict[str, Tuple[str, str]]
+
+    @property
+    def saved_pct(self) -> float:
+        if self.memory_before == 0:
+            return 0.0
+        return (1 - self.memory_after / self.memory_before) * 100
+
+
+def optimize_dtypes(
+    df: pd.DataFrame, category_max_unique_ratio: float = CATEGORY_MAX_UNIQUE_RATIO
+) -> Tuple[pd.DataFrame, DtypeReport]:
+    """
+    Pick compact dtypes for every column without changing any value.
+
+    Args:
+        df: Freshly parsed DataFrame.
+        category_max_unique_ratio: Max distinct/rows ratio for a text
+            column to be stored as a categorical.
+
+    Returns:
+        The optimized DataFrame and a DtypeReport.
+    """
+    memory_before = int(df.memory_usage(deep=True, index=False).sum())
+    out = df.copy(deep=False)
+    converted = {}
+    for col in df.columns:
+        new = _optimize_column(df[col], category_max_unique_ratio)
+        if new.dtype != df[col].dtype:
+            out[col] = new
+            converted[col] = (str(df[col].dtype), str(new.dtype))
+    memory_after = int(out.memory_usage(deep=True, index=False).sum())
+    return out, DtypeReport(memory_before, memory_after, converted)
+
+
+def _optimize_column(series: pd.Series, max_unique_ratio: float) -> pd.Series:
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast="integer")
+    if pd.api.types.is_float_dtype(series):
+        return _downcast_float(series)
+    if pd.api.types.is_string_dtype(series) and not isinstance(
+        series.dtype, pd.CategoricalDtype
+    ):
+        n_rows = len(series)
+        if n_rows and series.nunique(dropna=True) / n_rows <= max_unique_ratio:
+            return series.astype("category")
+    return series
+
+
+def _downcast_float(series: pd.Series) -> pd.Series:
+    """Use float32 only if every value survives the round trip exactly."""
+    if not isinstance(series.dtype, np.dtype):
+        # Nullable extension floats keep their dtype
+        return series
+    values = series.to_numpy()
+    narrowed = values.astype(np.float32)
+    lossless = np.array_equal(narrowed.astype(values.dtype), values, equal_nan=True)
+    return series.astype(np.float32) if lossless else series
@@ -0,0 +1,165 @@
+"""
+Streaming reader for Excel workbooks.
+
+Sheets are read with openpyxl in read-only mode, row by row, and converted
+to DataFrames in batches of EXCEL_BATCH_ROWS rows, so only one batch of
+cell values is held as Python objects at a time. A row limit stops reading
+the sheet early and a column subset skips the other columns' cells. The
+legacy .xls format is read with pd.read_excel.
+
+Pure business logic — no Dash dependencies.
+"""
+
+from typing import IO, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from pyexploratory.core.batch_schema import align_batch, widest_schema
+
+# Rows converted to a DataFrame at a time
+EXCEL_BATCH_ROWS = 10_000
+
+
+class ExcelOptions(NamedTuple):
+    """What to read from a workbook."""
+
+    # Sheet name; None reads the first sheet
+    sheet: Optional[str] = None
+    # Maximum number of data rows; None reads them all
+    nrows: Optional[int] = None
+    # Column names to keep; None keeps every column
+    usecols: Optional[Tuple[str, ...]] = None
+
+
+def list_sheets(stream: IO[bytes], extension: str = ".xlsx") -> List[str]:
+    """Return a workbook's sheet names in workbook order."""
+    if extension == ".xls":
+        return pd.ExcelFile(stream).sheet_names
+    workbook = openpyxl.load_workbook(stream, read_only=True)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+
+def read_excel(
+    stream: IO[bytes],
+    options: Optional[ExcelOptions] = None,
+    extension: str = ".xlsx",
+) -> pd.DataFrame:
+    """
+    Read one sheet of a workbook into a DataFrame.
+
+    The first row holds the column names, named like pd.read_excel does:
+    blanks become "Unnamed: <i>" and repeats get ".1", ".2" suffixes.
+    Columns to the right of the last named header are not read. Empty rows
+    at the end of the sheet are dropped; empty rows in between are kept.
+
+    Args:
+        stream: The workbook file.
+        options: Sheet, row limit and column subset; defaults read the
+            whole first sheet.
+        extension: ".xlsx" or ".xls".
+
+    Raises:
+        KeyError: If the sheet does not exist.
+        ValueError: If a requested column is not in the header.
+    """
+    options = options or ExcelOptions()
+    if extension == ".xls":
+        return pd.read_excel(
+            stream,
+            sheet_name=options.sheet or 0,
+            nrows=options.nrows,
+            usecols=list(options.usecols) if options.usecols else None,
+        )
+
+    workbook = openpyxl.load_workbook(
+        stream, read_only=True, data_only=True, keep_links=False
+    )
+    try:
+        sheet = workbook[options.sheet] if options.sheet else workbook.worksheets[0]
+        header = next(sheet.iter_rows(max_row=1, values_only=True), ())
+        names = _column_names(header)
+        positions = _selected_positions(names, options.usecols)
+        if not positions:
+            return pd.DataFrame(columns=names)
+        # Only the cells between the first and last selected column are read
+        first, last = positions[0], positions[-1]
+        offsets = [p - first for p in positions]
+        rows = sheet.iter_rows(
+            min_row=2,
+            max_row=None if options.nrows is None else options.nrows + 1,
+            min_col=first + 1,
+            max_col=last + 1,
+            values_only=True,
+        )
+        frames = list(_row_batches(rows, offsets, [names[p] for p in positions]))
+    finally:
+        workbook.close()
+
+    if not frames:
+        return pd.DataFrame(columns=[names[p] for p in positions])
+    columns, dtypes = widest_schema(frames)
+    return pd.concat(
+        [align_batch(frame, columns, dtypes) for frame in frames], ignore_index=True
+    )
+
+
+def _column_names(header: Sequence[object]) -> List[object]:
+    """Name header cells up to the last non-empty one, as pd.read_excel does."""
+    width = max((i + 1 for i, v in enumerate(header) if v is not None), default=0)
+    names: List[object] = []
+    counts: Dict[object, int] = {}
+    for i, value in enumerate(header[:width]):
+        name = f"Unnamed: {i}" if value is None else value
+        if name in counts:
+            counts[name] += 1
+            name = f"{name}.{counts[name]}"
+        else:
+            counts[name] = 0
+        names.append(name)
+    return names
+
+
+def _selected_positions(
+    names: List[object], usecols: Optional[Tuple[str, ...]]
+) -> List[int]:
+    """Header positions of the requested columns, left to right."""
+    if usecols is None:
+        return list(range(len(names)))
+    labels = [str(name) for name in names]
+    missing = [col for col in usecols if col not in labels]
+    if missing:
+        raise ValueError(f"Columns not found in the sheet header: {missing}")
+    return sorted(labels.index(col) for col in dict.fromkeys(usecols))
+
+
+def _row_batches(rows, offsets: List[int], names: List[object]):
+    """Group rows into DataFrames, dropping the sheet's trailing empty rows."""
+    batch: List[list] = []
+    blank_run = 0
+    for row in rows:
+        values = [row[i] if i < len(row) else None for i in offsets]
+        if all(v is None for v in values):
+            # Kept only if a non-empty row follows
+            blank_run += 1
+            continue
+        batch.extend([None] * len(values) for _ in range(blank_run))
+        blank_run = 0
+        batch.append(values)
+        if len(batch) >= EXCEL_BATCH_ROWS:
+            yield _batch_frame(batch, names)
+            batch = []
+    if batch:
+        yield _batch_frame(batch, names)
+
+
+def _batch_frame(batch: List[list], names: List[object]) -> pd.DataFrame:
+    """Build a batch's DataFrame; empty cells are NaN, as in pd.read_excel."""
+    frame = pd.DataFrame.from_records(batch, columns=names)
+    for col in frame.columns[frame.dtypes == object]:
+        frame[col] = frame[col].where(frame[col].notna(), np.nan)
+    return frame
@@ -1,26 +1,122 @@
 """
-File parsing logic for uploaded CSV, Excel, and JSON files.
+File parsing logic for uploaded CSV, Excel, JSON, NDJSON, Parquet and Arrow
+files.
+
+Files may arrive compressed (.gz, .bz2 or a single-file .zip); they are
+decompressed as a stream while the parser reads them, so the decompressed
+file is never held in memory alongside the compressed payload.
 
 Pure business logic — no Dash dependencies.
 """
 
 import base64
+import bz2
+import codecs
+import gzip
 import io
-import json
 import os
-from typing import Optional
+import struct
+import time
+import zipfile
+from contextlib import contextmanager
+from typing import (
+    IO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    cast,
+)
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from pyexploratory.config import CHUNK_ROWS, CSV_ENGINE
+from pyexploratory.core.arrow_csv import read_csv_arrow
+from pyexploratory.core.excel_stream import ExcelOptions, list_sheets, read_excel
+from pyexploratory.core.json_stream import iter_json_chunks, read_json
+
+# base64 characters decoded per step; a multiple of 4 so blocks split cleanly
+DECODE_BLOCK_CHARS = 4 * 1024 * 1024
+# Bytes inspected to pick a text encoding
+SNIFF_BYTES = 64 * 1024
+
+SUPPORTED_EXTENSIONS = (
+    ".csv",
+    ".xlsx",
+    ".xls",
+    ".json",
+    ".ndjson",
+    ".jsonl",
+    ".parquet",
+    ".feather",
+    ".arrow",
+)
+# JSON documents and newline-delimited JSON (NDJSON / JSON Lines)
+JSON_EXTENSIONS = (".json", ".ndjson", ".jsonl")
+# Binary columnar formats, read with pyarrow without any type inference
+COLUMNAR_EXTENSIONS = (".parquet", ".feather", ".arrow")
+COMPRESSED_EXTENSIONS = (".gz", ".bz2", ".zip")
+_MAX_DEFLATE_RATIO = 1032
+
+
+class OpenedUpload(NamedTuple):
+    """A decoded upload, ready to parse."""
+
+    # Seekable binary stream of the (decompressed) file
+    stream: IO[bytes]
+    # Extension of the file itself, e.g. ".csv" for "data.csv.gz"
+    extension: str
+    # Uncompressed size of the data in bytes; None if it is not recorded
+    size: Optional[int]
+
+
+class UploadChunks(NamedTuple):
+    """A large upload as a stream of DataFrames."""
+
+    chunks: Iterator[pd.DataFrame]
+    # Arrow schema every chunk is written with, if known before the first
+    # chunk; otherwise the first chunk's own types are used
+    schema: Optional[pa.Schema] = None
+
+
+class ParseStats(NamedTuple):
+    """How an upload was parsed and how fast."""
+
+    engine: str
+    bytes: int
+    seconds: float
+    rows: int
+    skipped_rows: int = 0
+    # The pyarrow CSV engine failed and pd.read_csv parsed the file instead
+    fallback: bool = False
+
+    @property
+    def mb_per_s(self) -> float:
+        if self.seconds <= 0:
+            return float("inf")
+        return self.bytes / (1024 * 1024) / self.seconds
 
 
 def parse_upload(contents: str, filename: str) -> Optional[pd.DataFrame]:
     """
     Parse an uploaded file's base64 contents into a DataFrame.
 
+    The payload is decoded block by block into one bytes buffer that the
+    parser reads directly, so peak memory stays near the file size on top
+    of the base64 string itself. Compressed files are decompressed as the
+    parser reads them.
+
     Args:
         contents: The raw base64 content string from dcc.Upload
                   (format: "data:content_type;base64,<data>").
-        filename: Original filename, used to detect format.
+        filename: Original filename, used to detect format and compression.
 
     Returns:
         A DataFrame on success, or None if the format is unsupported.
@@ -28,19 +124,453 @@ def parse_upload(contents: str, filename: str) -> Optional[pd.DataFrame]:
     Raises:
         ValueError: If the file cannot be parsed.
     """
-    _content_type, content_string = contents.split(",")
-    decoded = base64.b64decode(content_string)
-    extension = os.path.splitext(filename)[1].lower()
+    result = parse_upload_with_stats(contents, filename)
+    return None if result is None else result[0]
 
+
+def parse_upload_with_stats(
+    contents: str, filename: str, csv_engine: Optional[str] = None
+) -> Optional[Tuple[pd.DataFrame, ParseStats]]:
+    """
+    Like parse_upload, but also report engine and parse throughput.
+
+    Args:
+        contents: The raw base64 content string from dcc.Upload.
+        filename: Original filename, used to detect format.
+        csv_engine: "pyarrow" or "c"; defaults to CSV_ENGINE.
+
+    Returns:
+        (DataFrame, ParseStats), or None if the format is unsupported.
+    """
+    upload = open_upload(contents, filename)
+    if upload is None:
+        return None
+    return parse_opened(upload, csv_engine)
+
+
+def parse_opened(
+    upload: OpenedUpload,
+    csv_engine: Optional[str] = None,
+    excel: Optional[ExcelOptions] = None,
+) -> Tuple[pd.DataFrame, ParseStats]:
+    """
+    Parse an upload returned by open_upload.
+
+    Args:
+        upload: The opened upload.
+        csv_engine: "pyarrow" or "c"; defaults to CSV_ENGINE.
+        excel: Sheet, row limit and column subset for workbooks.
+
+    Returns:
+        The DataFrame and its ParseStats.
+    """
+    stream, extension = upload.stream, upload.extension
+    start = time.perf_counter()
+    skipped, fallback = 0, False
     if extension == ".csv":
-        try:
-            return pd.read_csv(io.StringIO(decoded.decode("utf-8")))
-        except UnicodeDecodeError:
-            return pd.read_csv(io.StringIO(decoded.decode("latin-1")))
+        engine = csv_engine or CSV_ENGINE
+        if engine == "pyarrow":
+            try:
+                df, skipped = read_csv_arrow(stream, sniff_encoding(stream))
+            except (pa.ArrowException, ValueError):
+                engine, fallback = "c", True
+        if engine == "c":
+            df = _read_csv_c(stream)
+    elif extension in COLUMNAR_EXTENSIONS:
+        engine = extension[1:]
+        df = _read_columnar(stream, extension).to_pandas(
+            split_blocks=True, self_destruct=True
+        )
     elif extension in (".xlsx", ".xls"):
-        return pd.read_excel(io.BytesIO(decoded))
-    elif extension == ".json":
-        json_data = json.loads(decoded.decode("utf-8"))
-        return pd.json_normalize(json_data)
+        engine = "excel"
+        df = read_excel(stream, excel, extension)
+    else:
+        engine = "json"
+        df = read_json(stream)
+    elapsed = time.perf_counter() - start
+    # A decompressing stream has been read to its end by now
+    size = upload.size if upload.size is not None else stream.tell()
+    return df, ParseStats(engine, size, elapsed, len(df), skipped, fallback)
+
+
+def open_upload(contents: str, filename: str) -> Optional[OpenedUpload]:
+    """
+    Decode an upload and, if it is compressed, open a decompressing stream.
+
+    Args:
+        contents: The raw base64 content string from dcc.Upload.
+        filename: Original filename, used to detect format and compression.
+
+    Returns:
+        The opened upload, or None if the format is unsupported.
+
+    Raises:
+        ValueError: If a zip archive does not hold exactly one file.
+    """
+    if not _may_be_supported(filename):
+        return None
+    return open_stream(decode_upload(contents), filename)
+
+
+@contextmanager
+def open_file(path: str, filename: str) -> Iterator[Optional[OpenedUpload]]:
+    """
+    Open a file on disk (e.g. one uploaded in chunks) like open_upload.
+
+    A context manager: the file is closed when the block exits, whether
+    parsing succeeded or not.
+
+    Args:
+        path: The received file.
+        filename: Original filename, used to detect format and compression.
+    """
+    if not _may_be_supported(filename):
+        yield None
+        return
+    with open(path, "rb") as raw:
+        yield open_stream(raw, filename)
+
+
+def open_stream(raw: IO[bytes], filename: str) -> Optional[OpenedUpload]:
+    """
+    Open a seekable stream holding an uploaded file's bytes.
+
+    Raises:
+        ValueError: If a zip archive does not hold exactly one file.
+    """
+    stem, compression = os.path.splitext(filename.lower())
+    if compression not in COMPRESSED_EXTENSIONS:
+        if compression not in SUPPORTED_EXTENSIONS:
+            return None
+        size = raw.seek(0, io.SEEK_END)
+        raw.seek(0)
+        if compression == ".parquet":
+            # Pages are encoded and compressed; the footer describes the data
+            size = _parquet_memory(pq.read_metadata(_arrow_source(raw)))
+            raw.seek(0)
+        return OpenedUpload(raw, compression, size)
+
+    if compression == ".zip":
+        archive = zipfile.ZipFile(raw)
+        members = [
+            info
+            for info in archive.infolist()
+            if not info.is_dir() and not info.filename.startswith("__MACOSX/")
+        ]
+        if len(members) != 1:
+            raise ValueError(
+                f"Zip archive must contain exactly one file, found {len(members)}."
+            )
+        extension = os.path.splitext(members[0].filename.lower())[1]
+        if extension not in SUPPORTED_EXTENSIONS:
+            return None
+        return OpenedUpload(archive.open(members[0]), extension, members[0].file_size)
+
+    extension = os.path.splitext(stem)[1]
+    if extension not in SUPPORTED_EXTENSIONS:
+        return None
+    if compression == ".gz":
+        stream: IO[bytes] = cast(IO[bytes], gzip.GzipFile(fileobj=raw))
+        return OpenedUpload(stream, extension, _gzip_size(raw))
+    return OpenedUpload(bz2.BZ2File(raw), extension, None)
+
+
+def _may_be_supported(filename: str) -> bool:
+    """Whether a filename's extension is worth decoding the upload for."""
+    extension = os.path.splitext(filename.lower())[1]
+    return extension in SUPPORTED_EXTENSIONS or extension in COMPRESSED_EXTENSIONS
+
+
+def _parquet_memory(metadata: pq.FileMetaData) -> int:
+    """
+    Estimate a Parquet file's size once decoded into Arrow memory.
+
+    Fixed-width columns take their width times the row count; text and
+    nested columns are estimated by their encoded, uncompressed pages.
+    """
+    size, variable_width = 0, False
+    for field in metadata.schema.to_arrow_schema():
+        try:
+            size += metadata.num_rows * field.type.bit_width // 8
+        except ValueError:
+            variable_width = True
+    if variable_width:
+        size += sum(
+            metadata.row_group(i).total_byte_size
+            for i in range(metadata.num_row_groups)
+        )
+    return size
+
+
+def _gzip_size(raw: IO[bytes]) -> Optional[int]:
+    """
+    Read the decompressed size from a gzip trailer.
+
+    The trailer stores it modulo 4 GiB. Deflate expands data at most about
+    1032-fold, so the value is exact for payloads under 4 MB; for larger
+    ones it may have wrapped and is reported as unknown.
+    """
+    compressed = raw.seek(0, io.SEEK_END)
+    if compressed < 4 or compressed * _MAX_DEFLATE_RATIO >= 2**32:
+        raw.seek(0)
+        return None
+    raw.seek(-4, io.SEEK_END)
+    size = struct.unpack("<I", raw.read(4))[0]
+    raw.seek(0)
+    return size
+
+
+def upload_sheets(contents: str, filename: str) -> Optional[List[str]]:
+    """Return the sheet names of an uploaded workbook, or None for other files."""
+    return sheet_names(open_upload(contents, filename))
+
+
+def file_sheets(path: str, filename: str) -> Optional[List[str]]:
+    """Like upload_sheets, for a file on disk."""
+    with open_file(path, filename) as upload:
+        return sheet_names(upload)
+
+
+def sheet_names(upload: Optional[OpenedUpload]) -> Optional[List[str]]:
+    """Return the sheet names of an opened workbook, or None for other files."""
+    if upload is None or upload.extension not in (".xlsx", ".xls"):
+        return None
+    return list_sheets(upload.stream, upload.extension)
+
+
+def _read_columnar(stream: IO[bytes], extension: str) -> pa.Table:
+    """Read a whole Parquet, Feather or Arrow IPC file into a Table."""
+    source = _arrow_source(stream)
+    if extension == ".parquet":
+        return pq.read_table(source)
+    if extension == ".feather":
+        # Handles Feather v1 as well as v2 (the Arrow IPC file format)
+        return feather.read_table(source)
+    try:
+        return pa.ipc.open_file(source).read_all()
+    except pa.ArrowInvalid:
+        # .arrow is also used for the IPC stream format
+        source.seek(0)
+        return pa.ipc.open_stream(source).read_all()
+
+
+def _arrow_source(stream: IO[bytes]):
+    """Wrap a stream for pyarrow; in-memory buffers are not copied."""
+    if isinstance(stream, io.BytesIO):
+        return pa.BufferReader(stream.getbuffer())
+    return pa.PythonFile(stream, mode="r")
+
+
+def _iter_columnar_chunks(
+    stream: IO[bytes], extension: str, chunk_rows: int
+) -> Iterator[pd.DataFrame]:
+    """Stream a Parquet or Arrow IPC file as DataFrames of chunk_rows rows."""
+    source = _arrow_source(stream)
+    if extension == ".parquet":
+        batches = pq.ParquetFile(source).iter_batches(batch_size=chunk_rows)
     else:
+        try:
+            reader = pa.ipc.open_file(source)
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        except pa.ArrowInvalid:
+            source.seek(0)
+            batches = pa.ipc.open_stream(source)
+    # Small batches are merged so each chunk becomes one full row group
+    pending: list = []
+    pending_rows = 0
+    for batch in batches:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        while pending_rows >= chunk_rows:
+            table = pa.Table.from_batches(pending)
+            yield table.slice(0, chunk_rows).to_pandas()
+            rest = table.slice(chunk_rows)
+            pending, pending_rows = rest.to_batches(), rest.num_rows
+    if pending_rows:
+        yield pa.Table.from_batches(pending).to_pandas()
+
+
+def _read_csv_c(buffer: IO[bytes]) -> pd.DataFrame:
+    """Parse a CSV with pandas' C engine."""
+    buffer.seek(0)
+    encoding = sniff_encoding(buffer)
+    try:
+        return pd.read_csv(buffer, encoding=encoding)
+    except UnicodeDecodeError:
+        # The prefix was valid UTF-8 but a later byte is not
+        buffer.seek(0)
+        return pd.read_csv(buffer, encoding="latin-1")
+
+
+def decode_upload(contents: str) -> io.BytesIO:
+    """
+    Decode a dcc.Upload data URL into a bytes buffer, one block at a time.
+
+    Avoids materialising a copy of the base64 text and holds at most one
+    block of intermediate bytes besides the result.
+    """
+    start = contents.index(",") + 1
+    buffer = io.BytesIO()
+    for offset in range(start, len(contents), DECODE_BLOCK_CHARS):
+        buffer.write(base64.b64decode(contents[offset : offset + DECODE_BLOCK_CHARS]))
+    buffer.seek(0)
+    return buffer
+
+
+def sniff_encoding(buffer: IO[bytes]) -> str:
+    """
+    Guess a text encoding from the first SNIFF_BYTES bytes of a buffer.
+
+    Byte-order marks win; otherwise a prefix that decodes as UTF-8 means
+    UTF-8, and anything else is read as latin-1, which accepts every byte.
+    The buffer is rewound afterwards.
+    """
+    prefix = buffer.read(SNIFF_BYTES)
+    buffer.seek(0)
+    if prefix.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if prefix.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    try:
+        # Unless it is the whole file, the prefix may end inside a character
+        whole_file = len(prefix) < SNIFF_BYTES
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=whole_file)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+
+def parse_upload_chunks(
+    contents: str, filename: str, chunk_rows: int = CHUNK_ROWS
+) -> Optional[Iterator[pd.DataFrame]]:
+    """
+    Parse a large uploaded file as a stream of DataFrames.
+
+    CSV, JSON, Parquet and Arrow IPC files can be split into independent
+    row ranges; other formats return None and go through parse_upload.
+
+    Args:
+        contents: The raw base64 content string from dcc.Upload.
+        filename: Original filename, used to detect format.
+        chunk_rows: Rows per yielded DataFrame.
+    """
+    upload = open_upload(contents, filename)
+    if upload is None:
         return None
+    streamed = upload_chunks(upload, chunk_rows)
+    return None if streamed is None else streamed.chunks
+
+
+def upload_chunks(
+    upload: OpenedUpload, chunk_rows: int = CHUNK_ROWS
+) -> Optional[UploadChunks]:
+    """
+    Stream an upload returned by open_upload as DataFrames.
+
+    For a CSV file this reads the whole file once to settle its encoding
+    and column types before returning.
+
+    Returns:
+        The chunks, or None if the format cannot be split into row ranges
+        (Excel and Feather v1).
+    """
+    if upload.extension == ".csv":
+        encoding, dtypes = _csv_layout(upload.stream, chunk_rows)
+        return UploadChunks(
+            _read_csv_chunks(upload.stream, chunk_rows, encoding, dtypes),
+            csv_schema(dtypes),
+        )
+    if upload.extension in JSON_EXTENSIONS:
+        return UploadChunks(iter_json_chunks(upload.stream, chunk_rows))
+    if upload.extension in COLUMNAR_EXTENSIONS and not _is_feather_v1(upload.stream):
+        return UploadChunks(
+            _iter_columnar_chunks(upload.stream, upload.extension, chunk_rows)
+        )
+    return None
+
+
+def _is_feather_v1(stream: IO[bytes]) -> bool:
+    """Feather v1 files start with "FEA1"; v2 files are Arrow IPC files."""
+    magic = stream.read(4)
+    stream.seek(0)
+    return magic == b"FEA1"
+
+
+def iter_csv_chunks(
+    buffer: IO[bytes], chunk_rows: int = CHUNK_ROWS
+) -> Iterator[pd.DataFrame]:
+    """
+    Parse a seekable CSV byte stream in chunks with one dtype per column.
+
+    pd.read_csv infers dtypes chunk by chunk, so a column can be int64 in
+    one chunk and float64 or text in the next. A first pass records the
+    widest dtype each column takes; the second pass parses every chunk with
+    those dtypes. The first pass also settles the encoding (the sniffed
+    one, else latin-1) before any chunk is yielded.
+    """
+    encoding, dtypes = _csv_layout(buffer, chunk_rows)
+    yield from _read_csv_chunks(buffer, chunk_rows, encoding, dtypes)
+
+
+def csv_schema(dtypes: Dict[str, object]) -> pa.Schema:
+    """
+    Arrow schema of CSV chunks parsed with dtypes, once their text columns
+    are Arrow strings.
+
+    Every column that is not numeric or boolean holds text, including one
+    that is empty in the first chunk and would otherwise get Arrow's null
+    type, which no later chunk could be cast to.
+    """
+    return pa.schema(
+        [
+            (
+                col,
+                (
+                    pa.from_numpy_dtype(dtype)
+                    if isinstance(dtype, np.dtype) and dtype.kind in "biuf"
+                    else pa.large_string()
+                ),
+            )
+            for col, dtype in dtypes.items()
+        ]
+    )
+
+
+def _csv_layout(buffer: IO[bytes], chunk_rows: int) -> Tuple[str, Dict[str, object]]:
+    """First pass of iter_csv_chunks: the encoding and widest dtypes."""
+    for encoding in dict.fromkeys((sniff_encoding(buffer), "latin-1")):
+        buffer.seek(0)
+        try:
+            dtypes = _widest_dtypes(
+                pd.read_csv(buffer, chunksize=chunk_rows, encoding=encoding)
+            )
+            break
+        except UnicodeDecodeError:
+            continue
+    buffer.seek(0)
+    return encoding, dtypes
+
+
+def _read_csv_chunks(
+    buffer: IO[bytes], chunk_rows: int, encoding: str, dtypes: Dict[str, object]
+) -> Iterator[pd.DataFrame]:
+    """Second pass of iter_csv_chunks."""
+    yield from pd.read_csv(
+        buffer, chunksize=chunk_rows, encoding=encoding, dtype=dtypes
+    )
+
+
+def _widest_dtypes(chunks: Iterable[pd.DataFrame]) -> Dict[str, object]:
+    """Merge per-chunk dtypes: mixed int/float become float64, else text."""
+    widest: Dict[str, object] = {}
+    for chunk in chunks:
+        for col, dtype in chunk.dtypes.items():
+            seen = widest.setdefault(col, dtype)
+            if seen == dtype:
+                continue
+            both_numeric = all(
+                pd.api.types.is_numeric_dtype(d) and not pd.api.types.is_bool_dtype(d)
+                for d in (seen, dtype)
+            )
+            widest[col] = np.dtype("float64") if both_numeric else object
+    return widest
@@ -8,6 +8,7 @@ from typing import Dict, List, Optional
 import pandas as pd
 
 from pyexploratory.config import DATA_FILE
+from pyexploratory.core.data_store import invalidate_cache, read_file
 
 HISTORY_DIR = os.path.join(os.path.dirname(DATA_FILE), ".pyexploratory_history")
 MAX_HISTORY = 10
@@ -28,7 +29,7 @@ def save_snapshot(operation: str, column: str, description: str) -> None:
     init_history()
     log = get_history_log()
     idx = len(log)
-    snapshot_path = os.path.join(HISTORY_DIR, f"snapshot_{idx}.csv")
+    snapshot_path = os.path.join(HISTORY_DIR, f"snapshot_{idx}.parquet")
     shutil.copy2(DATA_FILE, snapshot_path)
     log.append({
         "index": idx,
@@ -48,12 +49,27 @@ def save_snapshot(operation: str, column: str, description: str) -> None:
 
 def undo() -> Optional[pd.DataFrame]:
     """Undo the last cleaning operation by restoring the snapshot."""
+    return read_file(DATA_FILE) if restore_previous() else None
+
+
+def redo() -> Optional[pd.DataFrame]:
+    """Redo a previously undone operation."""
+    return read_file(DATA_FILE) if restore_next() else None
+
+
+def restore_previous() -> bool:
+    """
+    Undo the last cleaning operation without loading the restored data.
+
+    Returns:
+        False if there was nothing to undo.
+    """
     log = get_history_log()
     if not log:
-        return None
+        return False
     entry = log.pop()
     # Save current state for redo
-    redo_path = os.path.join(HISTORY_DIR, f"redo_{len(_redo_stack)}.csv")
+    redo_path = os.path.join(HISTORY_DIR, f"redo_{len(_redo_stack)}.parquet")
     shutil.copy2(DATA_FILE, redo_path)
     _redo_stack.append(redo_path)
     # Restore snapshot
@@ -61,22 +77,25 @@ def undo() -> Optional[pd.DataFrame]:
     if os.path.exists(entry["snapshot"]):
         os.remove(entry["snapshot"])
     _write_log(log)
-    from pyexploratory.core.data_store import invalidate_cache
     invalidate_cache()
-    return pd.read_csv(DATA_FILE)
+    return True
 
 
-def redo() -> Optional[pd.DataFrame]:
-    """Redo a previously undone operation."""
+def restore_next() -> bool:
+    """
+    Redo a previously undone operation without loading the restored data.
+
+    Returns:
+        False if there was nothing to redo.
+    """
     if not _redo_stack:
-        return None
+        return False
     redo_path = _redo_stack.pop()
     shutil.copy2(redo_path, DATA_FILE)
     if os.path.exists(redo_path):
         os.remove(redo_path)
-    from pyexploratory.core.data_store import invalidate_cache
     invalidate_cache()
-    return pd.read_csv(DATA_FILE)
+    return True
 
 
 def get_history_log() -> List[Dict]:
@@ -93,24 +112,6 @@ def clear_history() -> None:
     init_history()
 
 
-def preview_operation(
-    df: pd.DataFrame,
-    operation: str,
-    column: str,
-    fill_value=None,
-    new_name=None,
-) -> Dict:
-    """Preview the effect of a cleaning operation without modifying the data."""
-    from pyexploratory.core.cleaning_ops import apply_operation
-    df_copy = df.copy()
-    df_after = apply_operation(df_copy, operation, column, fill_value, new_name)
-    return {
-        "rows_before": len(df),
-        "rows_after": len(df_after),
-        "rows_affected": abs(len(df) - len(df_after)),
-    }
-
-
 def _write_log(log: List[Dict]) -> None:
     """Write the history log to disk."""
     with open(HISTORY_LOG_FILE, "w") as f:
@@ -0,0 +1,458 @@
+"""
+Upload ingestion: parse uploaded files and write them in the store layout.
+
+A multi-file upload is parsed in a pool of worker processes, one file per
+worker, so a batch takes about as long as its slowest file. Workers write
+their result straight to disk and only send back a small UploadResult,
+never the parsed DataFrame. A file uploaded before with the same options
+is not parsed again: its stored result is copied (see ingest_cache).
+
+Pure business logic — no Dash dependencies.
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from functools import partial
+from typing import (
+    IO,
+    Callable,
+    ContextManager,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import pandas as pd
+
+from pyexploratory.config import CHUNKED_MODE_THRESHOLD_MB, CSV_ENGINE, UPLOAD_WORKERS
+from pyexploratory.core.data_store import read_catalog, write_chunks, write_file
+from pyexploratory.core.dtype_optimizer import (
+    DtypeReport,
+    optimize_dtypes,
+    to_arrow_strings,
+)
+from pyexploratory.core.excel_stream import ExcelOptions
+from pyexploratory.core.file_parser import (
+    JSON_EXTENSIONS,
+    OpenedUpload,
+    ParseStats,
+    open_file,
+    open_upload,
+    parse_opened,
+    upload_chunks,
+)
+from pyexploratory.core.ingest_cache import (
+    cached_ingest,
+    contents_digest,
+    file_digest,
+    ingest_key,
+    store_ingest,
+)
+
+
+class UploadResult(NamedTuple):
+    """Outcome of ingesting one uploaded file."""
+
+    filename: str
+    status: str  # "ok", "unsupported" or "error"
+    path: Optional[str] = None
+    rows: int = 0
+    columns: Tuple[str, ...] = ()
+    chunked: bool = False
+    report: Optional[DtypeReport] = None
+    error: Optional[str] = None
+    parse_stats: Optional[ParseStats] = None
+    # Identical to an earlier upload; copied instead of parsed
+    reused: bool = False
+    # optimize was asked for, but the file was streamed and keeps its dtypes
+    optimize_skipped: bool = False
+
+
+class IngestProgress(NamedTuple):
+    """How far an ingest batch has got, reported while it runs."""
+
+    phase: str  # "checking", "parsing", "writing" or "done"
+    files_done: int
+    files_total: int
+    # Of the file being parsed in this process; files parsed in worker
+    # processes only report when they finish
+    bytes_parsed: int = 0
+    bytes_total: Optional[int] = None  # None if unknown (e.g. .bz2)
+    # Across the batch, including the current file
+    rows: int = 0
+
+    @property
+    def fraction(self) -> float:
+        """Share of the batch done, between 0 and 1."""
+        current = 0.0
+        if self.bytes_total:
+            current = min(self.bytes_parsed / self.bytes_total, 1.0)
+        return min((self.files_done + current) / max(self.files_total, 1), 1.0)
+
+
+# Called by _ingest with (phase, bytes parsed, bytes total, rows)
+FileProgress = Callable[[str, int, Optional[int], int], None]
+
+# Worker processes outlive a single upload so later batches skip start-up
+_pool: Optional[ProcessPoolExecutor] = None
+# Process that started _pool; a forked child must not reuse its parent's pool
+_pool_pid: Optional[int] = None
+
+
+def ingest_upload(
+    contents: str,
+    filename: str,
+    path: str,
+    optimize: bool = False,
+    excel: Optional[ExcelOptions] = None,
+    progress: Optional[FileProgress] = None,
+) -> UploadResult:
+    """
+    Parse one uploaded file and write it to path.
+
+    Large CSV, JSON, Parquet and Arrow files are parsed and written chunk
+    by chunk, as are such files compressed without a recorded size (.bz2).
+    Errors are reported in the result rather than raised, so one bad file
+    in a batch does not affect the others.
+
+    Args:
+        contents: The raw base64 content string from dcc.Upload.
+        filename: Original filename, used to detect format.
+        path: Destination dataset file.
+        optimize: Apply ingest-time dtype optimization.
+        excel: Sheet, row limit and column subset for workbooks.
+        progress: Called with the phase, bytes parsed, total bytes and
+            rows parsed as the file is read.
+    """
+    return _ingest(
+        lambda: nullcontext(open_upload(contents, filename)),
+        filename,
+        path,
+        optimize,
+        excel,
+        progress,
+    )
+
+
+def ingest_file(
+    source: str,
+    filename: str,
+    path: str,
+    optimize: bool = False,
+    excel: Optional[ExcelOptions] = None,
+    progress: Optional[FileProgress] = None,
+) -> UploadResult:
+    """
+    Like ingest_upload, for a file already on disk, such as one received
+    through the chunked upload endpoint. No base64 payload is involved.
+
+    Args:
+        source: The received file.
+        filename: Original filename, used to detect format.
+        path: Destination dataset file.
+        optimize: Apply ingest-time dtype optimization.
+        excel: Sheet, row limit and column subset for workbooks.
+        progress: As for ingest_upload.
+    """
+    return _ingest(
+        lambda: open_file(source, filename), filename, path, optimize, excel, progress
+    )
+
+
+def _ingest(
+    open_source: Callable[[], ContextManager[Optional[OpenedUpload]]],
+    filename: str,
+    path: str,
+    optimize: bool,
+    excel: Optional[ExcelOptions],
+    progress: Optional[FileProgress] = None,
+) -> UploadResult:
+    """Open, parse and write one file, reporting errors in the result."""
+    notify = progress or _no_progress
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open_source() as upload:
+            if upload is None:
+                return UploadResult(filename, "unsupported")
+            return _write_upload(upload, filename, path, optimize, excel, notify)
+    except Exception as e:
+        return UploadResult(filename, "error", error=str(e))
+
+
+def _write_upload(
+    upload: OpenedUpload,
+    filename: str,
+    path: str,
+    optimize: bool,
+    excel: Optional[ExcelOptions],
+    notify: FileProgress,
+) -> UploadResult:
+    """Parse an opened upload and write it to path."""
+    large = upload.size is None or upload.size > CHUNKED_MODE_THRESHOLD_MB * 1024 * 1024
+    notify("parsing", 0, upload.size, 0)
+    start = time.perf_counter()
+    streamed = upload_chunks(upload) if large else None
+    if streamed is not None:
+        chunks = map(to_arrow_strings, streamed.chunks)
+        write_chunks(_reporting(chunks, upload, notify), path, schema=streamed.schema)
+        catalog = read_catalog(path)
+        stats = ParseStats(
+            _chunk_engine(upload.extension),
+            _position(upload.stream) if upload.size is None else upload.size,
+            time.perf_counter() - start,
+            catalog.rows,
+        )
+        return UploadResult(
+            filename,
+            "ok",
+            path,
+            catalog.rows,
+            tuple(catalog.columns),
+            chunked=True,
+            parse_stats=stats,
+            # Picking compact dtypes needs whole columns in memory
+            optimize_skipped=optimize,
+        )
+
+    df, stats = parse_opened(upload, excel=excel)
+    df = to_arrow_strings(df)
+    notify("writing", stats.bytes, upload.size, len(df))
+    report = None
+    if optimize:
+        df, report = optimize_dtypes(df)
+        write_file(df, path, source_memory=report.memory_before)
+    else:
+        write_file(df, path)
+    return UploadResult(
+        filename,
+        "ok",
+        path,
+        len(df),
+        tuple(map(str, df.columns)),
+        report=report,
+        parse_stats=stats,
+    )
+
+
+def _no_progress(phase: str, parsed: int, total: Optional[int], rows: int) -> None:
+    pass
+
+
+def _reporting(
+    chunks: Iterable[pd.DataFrame], upload: OpenedUpload, notify: FileProgress
+) -> Iterator[pd.DataFrame]:
+    """Pass chunks through, reporting the bytes and rows read so far."""
+    rows = 0
+    for chunk in chunks:
+        rows += len(chunk)
+        notify("parsing", _position(upload.stream), upload.size, rows)
+        yield chunk
+
+
+def _position(stream: IO[bytes]) -> int:
+    """Uncompressed bytes read from a stream; 0 if it cannot tell."""
+    try:
+        return stream.tell()
+    except (OSError, ValueError):
+        return 0
+
+
+def _chunk_engine(extension: str) -> str:
+    """Parser behind upload_chunks for a format, as named in ParseStats."""
+    if extension == ".csv":
+        return "c"
+    if extension in JSON_EXTENSIONS:
+        return "json"
+    return extension[1:]
+
+
+def ingest_uploads(
+    uploads: Sequence[Tuple[str, str]],
+    paths: Sequence[str],
+    optimize: bool = False,
+    excel: Optional[Sequence[Optional[ExcelOptions]]] = None,
+    progress: Optional[Callable[[IngestProgress], None]] = None,
+) -> List[UploadResult]:
+    """
+    Ingest several uploaded files concurrently, in up to UPLOAD_WORKERS
+    processes. A single upload is ingested in-process. Several sheets of
+    one workbook are ingested in parallel by listing the workbook once per
+    sheet.
+
+    Args:
+        uploads: (contents, filename) pairs from dcc.Upload.
+        paths: Destination file for each upload.
+        optimize: Apply ingest-time dtype optimization.
+        excel: Workbook options for each upload; None for defaults.
+        progress: Called with an IngestProgress as the batch advances.
+
+    Returns:
+        One UploadResult per upload, in input order.
+    """
+    return _run(
+        ingest_upload, contents_digest, uploads, paths, optimize, excel, progress
+    )
+
+
+def ingest_files(
+    files: Sequence[Tuple[str, str]],
+    paths: Sequence[str],
+    optimize: bool = False,
+    excel: Optional[Sequence[Optional[ExcelOptions]]] = None,
+    progress: Optional[Callable[[IngestProgress], None]] = None,
+) -> List[UploadResult]:
+    """
+    Like ingest_uploads, for files already on disk.
+
+    Args:
+        files: (source path, original filename) pairs.
+        paths: Destination file for each upload.
+        optimize: Apply ingest-time dtype optimization.
+        excel: Workbook options for each file; None for defaults.
+        progress: Called with an IngestProgress as the batch advances.
+    """
+    return _run(ingest_file, file_digest, files, paths, optimize, excel, progress)
+
+
+def _run(
+    ingest, digest, sources, paths, optimize, excel, progress=None
+) -> List[UploadResult]:
+    """
+    Run one ingest call per source, in the worker pool if there are several.
+
+    Sources already ingested with the same options are copied from the
+    ingest cache instead; newly ingested ones are added to it.
+    """
+    notify = progress or (lambda update: None)
+    excel = excel or [None] * len(sources)
+    jobs = [
+        (source, filename, path, optimize, options)
+        for (source, filename), path, options in zip(sources, paths, excel)
+    ]
+    total = len(jobs)
+    notify(IngestProgress("checking", 0, total))
+    keys = [_cache_key(digest, job) for job in jobs]
+    results: List[Optional[UploadResult]] = [
+        _reuse(key, filename, path)
+        for key, (_, filename, path, _, _) in zip(keys, jobs)
+    ]
+    pending = [i for i, result in enumerate(results) if result is None]
+    reused = [r for r in results if r is not None]
+    parsed = _parse(
+        [jobs[i] for i in pending],
+        ingest,
+        IngestProgress("parsing", len(reused), total, rows=sum(r.rows for r in reused)),
+        notify,
+    )
+    for i, result in zip(pending, parsed):
+        results[i] = result
+        key = keys[i]
+        if result.status == "ok" and key is not None and result.path is not None:
+            try:
+                store_ingest(key, result.path, result._replace(path=None))
+            except OSError:
+                # The upload itself succeeded; it just won't be deduplicated
+                pass
+    # Every source has been reused or parsed by now
+    done = [result for result in results if result is not None]
+    assert len(done) == total
+    notify(IngestProgress("done", total, total, rows=sum(r.rows for r in done)))
+    return done
+
+
+def _cache_key(digest, job) -> Optional[str]:
+    """Ingest cache key of a job; None if its source cannot be read."""
+    source, filename, _, optimize, options = job
+    try:
+        payload = digest(source)
+    except (OSError, ValueError):
+        # Let ingesting it report the problem
+        return None
+    params = {
+        "optimize": optimize,
+        "excel": options,
+        "csv_engine": CSV_ENGINE,
+        # Results stored before text columns became Arrow strings are stale
+        "strings": "arrow",
+    }
+    return ingest_key(payload, filename, params)
+
+
+def _reuse(key: Optional[str], filename: str, path: str) -> Optional[UploadResult]:
+    """Copy a previously ingested file to path, if there is one."""
+    if key is None:
+        return None
+    result = cached_ingest(key, path)
+    if result is None:
+        return None
+    return result._replace(filename=filename, path=path, parse_stats=None, reused=True)
+
+
+def _parse(
+    jobs, ingest, start: IngestProgress, notify: Callable[[IngestProgress], None]
+) -> List[UploadResult]:
+    """
+    Ingest jobs, in the worker pool if there are several.
+
+    In-process jobs report progress while they parse; jobs in the pool
+    report when they finish.
+    """
+    global _pool
+    done, rows = start.files_done, start.rows
+    results: List[UploadResult] = []
+    if len(jobs) <= 1 or UPLOAD_WORKERS <= 1:
+        for job in jobs:
+            on_file = partial(
+                _file_progress, notify, start._replace(files_done=done, rows=rows)
+            )
+            results.append(ingest(*job, on_file))
+            done, rows = done + 1, rows + results[-1].rows
+        return results
+    try:
+        futures = [_get_pool().submit(ingest, *job) for job in jobs]
+        notify(start)
+        for future in as_completed(futures):
+            done, rows = done + 1, rows + future.result().rows
+            notify(start._replace(files_done=done, rows=rows))
+        return [future.result() for future in futures]
+    except BrokenProcessPool:
+        # A worker died (e.g. out of memory); start a fresh pool next time
+        _pool = None
+        raise
+
+
+def _file_progress(
+    notify: Callable[[IngestProgress], None],
+    batch: IngestProgress,
+    phase: str,
+    parsed: int,
+    total: Optional[int],
+    rows: int,
+) -> None:
+    """Report one in-process file's progress as progress of its batch."""
+    notify(
+        batch._replace(
+            phase=phase, bytes_parsed=parsed, bytes_total=total, rows=batch.rows + rows
+        )
+    )
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Return the shared worker pool; workers are started on demand."""
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        # spawn: forking a multi-threaded web server can deadlock workers
+        _pool = ProcessPoolExecutor(
+            max_workers=UPLOAD_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        _pool_pid = os.getpid()
+    return _pool
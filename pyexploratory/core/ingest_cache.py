@@ -0,0 +1,122 @@
+"""
+Content-addressed cache of ingested uploads.
+
+An upload is identified by a hash of its bytes plus everything that
+changes how it is parsed: its format, dtype optimization and workbook
+options. Uploading the same file again copies the stored columnar file
+instead of parsing it. The copy carries the store's content-hash version
+in its footer, so summaries and other results already cached for that
+version (see result_cache) are reused as well.
+
+Pure business logic — no Dash dependencies.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from typing import Any, Dict, Optional
+
+from pyexploratory.config import INGEST_CACHE_DIR, INGEST_CACHE_MAX_ENTRIES
+from pyexploratory.core.file_parser import COMPRESSED_EXTENSIONS
+
+# Bytes hashed per read of a file on disk
+_READ_BYTES = 1024 * 1024
+
+
+def contents_digest(contents: str) -> str:
+    """Hash a dcc.Upload payload, ignoring its browser-dependent MIME header."""
+    _, _, payload = contents.partition(",")
+    return hashlib.blake2b(payload.encode("ascii"), digest_size=16).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """Hash a file's bytes without reading it into memory whole."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_READ_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def ingest_key(digest: str, filename: str, params: Dict[str, Any]) -> str:
+    """
+    Combine a payload digest with what decides how it is parsed.
+
+    Args:
+        digest: contents_digest or file_digest of the upload.
+        filename: Original filename; only its extensions (format and
+            compression) are part of the key.
+        params: JSON-serialisable parsing options.
+    """
+    stem, extension = os.path.splitext(os.path.basename(filename).lower())
+    if extension in COMPRESSED_EXTENSIONS:
+        # "sales.csv.gz" -> ".csv.gz"
+        extension = os.path.splitext(stem)[1] + extension
+    key = json.dumps(
+        {"digest": digest, "format": extension, **params}, sort_keys=True, default=str
+    )
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def cached_ingest(key: str, dest: str) -> Optional[Any]:
+    """
+    Copy the file stored for key to dest.
+
+    Returns:
+        The metadata stored with the file, or None on a miss (dest is
+        left untouched).
+    """
+    data_path, meta_path = _entry_paths(key)
+    if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+        return None
+    try:
+        with open(meta_path, "rb") as f:
+            meta = pickle.load(f)
+    except Exception:
+        # Corrupt or stale entry (e.g. a class changed) — parse again
+        return None
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    # A copy, not a link: dataset files are overwritten in place later
+    shutil.copyfile(data_path, dest)
+    os.utime(meta_path)
+    return meta
+
+
+def store_ingest(key: str, path: str, meta: Any) -> None:
+    """Keep a copy of an ingested file and its metadata under key."""
+    os.makedirs(INGEST_CACHE_DIR, exist_ok=True)
+    data_path, meta_path = _entry_paths(key)
+    shutil.copyfile(path, f"{data_path}.tmp")
+    os.replace(f"{data_path}.tmp", data_path)
+    # Written last: an entry only counts once its metadata exists
+    with open(f"{meta_path}.tmp", "wb") as f:
+        pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(f"{meta_path}.tmp", meta_path)
+    _prune()
+
+
+def clear_ingest_cache() -> None:
+    """Remove every stored upload."""
+    if os.path.exists(INGEST_CACHE_DIR):
+        shutil.rmtree(INGEST_CACHE_DIR)
+
+
+def _entry_paths(key: str):
+    base = os.path.join(INGEST_CACHE_DIR, key)
+    return f"{base}.parquet", f"{base}.pkl"
+
+
+def _prune() -> None:
+    """Drop the least recently used entries beyond INGEST_CACHE_MAX_ENTRIES."""
+    metas = [
+        os.path.join(INGEST_CACHE_DIR, name)
+        for name in os.listdir(INGEST_CACHE_DIR)
+        if name.endswith(".pkl")
+    ]
+    metas.sort(key=os.path.getmtime, reverse=True)
+    for stale in metas[INGEST_CACHE_MAX_ENTRIES:]:
+        for path in (stale, f"{stale[: -len('.pkl')]}.parquet"):
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,129 @@
+"""
+Incremental parsing of JSON uploads.
+
+Accepts a top-level array of records, newline-delimited JSON (NDJSON /
+JSON Lines) or a single object. Records are decoded one at a time from a
+bounded text window and normalized in batches, so memory holds one batch
+of Python objects instead of the whole document's object tree.
+
+Pure business logic — no Dash dependencies.
+"""
+
+import codecs
+import json
+import re
+from typing import IO, Iterator, List
+
+import pandas as pd
+
+from pyexploratory.core.batch_schema import align_batch, widest_schema
+
+# Records normalized together when the whole file is parsed into memory
+JSON_BATCH_RECORDS = 10_000
+# Characters of text decoded per read
+READ_CHARS = 1024 * 1024
+
+_SPACE = re.compile(r"\s*")
+# Between array elements
+_SEPARATOR = re.compile(r"[\s,]*")
+
+
+def read_json(stream: IO[bytes]) -> pd.DataFrame:
+    """
+    Parse a JSON document or NDJSON stream into one flattened DataFrame.
+
+    Args:
+        stream: The whole file, positioned at its start.
+
+    Raises:
+        ValueError: If the text is not valid JSON.
+    """
+    frames = list(_normalized_batches(stream, JSON_BATCH_RECORDS))
+    if not frames:
+        return pd.DataFrame()
+    columns, dtypes = widest_schema(frames)
+    return pd.concat(
+        [align_batch(frame, columns, dtypes) for frame in frames], ignore_index=True
+    )
+
+
+def iter_json_chunks(stream: IO[bytes], chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    Parse a seekable JSON stream into DataFrames with identical columns.
+
+    Records differ in their keys and a field's type can change between
+    batches, so a first pass collects every column and its widest dtype;
+    the second pass yields each batch aligned to them.
+    """
+    columns, dtypes = widest_schema(_normalized_batches(stream, chunk_rows))
+    stream.seek(0)
+    for frame in _normalized_batches(stream, chunk_rows):
+        yield align_batch(frame, columns, dtypes)
+
+
+def iter_records(stream: IO[bytes]) -> Iterator[object]:
+    """
+    Yield the records of a JSON array or NDJSON stream one at a time.
+
+    A top-level array yields its elements; otherwise each top-level value
+    is a record, which covers NDJSON and single-object documents.
+
+    Raises:
+        ValueError: If the text is not valid JSON.
+    """
+    # Like json.loads, detect UTF-8/16/32 from the first bytes
+    encoding = json.detect_encoding(stream.read(4))
+    stream.seek(0)
+    text = codecs.getreader(encoding)(stream)
+
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+    # Grows while one value spans several reads, so total work stays linear
+    read_chars = READ_CHARS
+    in_array = None
+    while True:
+        skipped = (_SEPARATOR if in_array else _SPACE).match(buf, pos)
+        # Both patterns match the empty string, so this always matches
+        assert skipped is not None
+        pos = skipped.end()
+        if pos == len(buf):
+            if eof:
+                return
+            more = text.read(read_chars)
+            buf, pos, eof = buf[pos:] + more, 0, not more
+            continue
+        if in_array is None:
+            in_array = buf[pos] == "["
+            if in_array:
+                pos += 1
+            continue
+        if in_array and buf[pos] == "]":
+            return
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+            # A number at the window's edge may continue in the next read
+            complete = end < len(buf) or eof
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+        if not complete:
+            more = text.read(read_chars)
+            buf, pos, eof = buf[pos:] + more, 0, not more
+            read_chars *= 2
+            continue
+        read_chars = READ_CHARS
+        pos = end
+        yield value
+
+
+def _normalized_batches(stream: IO[bytes], size: int) -> Iterator[pd.DataFrame]:
+    """Flatten records size at a time with pd.json_normalize."""
+    batch: List[object] = []
+    for record in iter_records(stream):
+        batch.append(record)
+        if len(batch) == size:
+            yield pd.json_normalize(batch)
+            batch = []
+    if batch:
+        yield pd.json_normalize(batch)
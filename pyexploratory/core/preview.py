@@ -0,0 +1,243 @@
+"""
+Fast previews of cleaning operations.
+
+A preview runs the operation on a stratified sample of the dataset rather
+than on all of it, and scales what it observed back up to the full row
+count. The sample has two strata: rows missing a value in the operation's
+columns and rows that are complete, so dropna and fillna see missing
+values in the right proportion even when they are rare. Within a stratum
+rows are taken at even intervals from a random start, so every part of the
+file (e.g. each chunk of a large dataset) is represented.
+
+Counts from a sample are estimates, and so are statistics an operation
+computes from its column (the fillna mean or mode, normalize, outliers).
+drop_duplicates always runs on the whole dataset: a sample misses most
+duplicate pairs, so it has no preview on a dataset too large for memory.
+An exact preview runs on every row.
+
+Pure business logic — no Dash dependencies.
+"""
+
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pyexploratory.config import PREVIEW_SAMPLE_ROWS
+from pyexploratory.core.cleaning_ops import (
+    Columns,
+    apply_operation,
+    can_stream,
+    resolve_columns,
+)
+
+# Operations a sample cannot estimate
+EXACT_OPS = {"drop_duplicates"}
+
+
+class OperationPreview(NamedTuple):
+    """What an operation would change, for the whole dataset."""
+
+    rows_before: int
+    rows_after: int
+    # Rows the operation removes
+    rows_affected: int
+    # Cells of the remaining rows whose value changes
+    changed_cells: int
+    # Change in missing values per column, for columns where it is not zero
+    null_delta: Dict[str, int]
+    # Columns whose dtype changes: name -> (before, after)
+    dtype_changes: Dict[str, Tuple[str, str]]
+    columns_dropped: List[str]
+    estimated_seconds: float
+    # Rows the preview ran on, or None if it ran on all of them
+    sample_rows: Optional[int] = None
+
+
+def stratified_sample(
+    df: pd.DataFrame, cols: List[str], size: int, seed: int = 0
+) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    Take about size rows, stratified by missing values in cols.
+
+    Args:
+        df: The frame to sample.
+        cols: Columns whose missing values define the strata.
+        size: Rows to take; each non-empty stratum gets at least one.
+        seed: Seed for the start of the intervals.
+
+    Returns:
+        The sampled rows, indexed by their position in df, and the number
+        of rows of df each one stands for.
+    """
+    n = len(df)
+    if n <= size:
+        return df.set_axis(pd.RangeIndex(n)), np.ones(n)
+    rng = np.random.default_rng(seed)
+    missing = df[cols].isna().any(axis=1).to_numpy()
+    picked, shares = [], []
+    for stratum in (np.flatnonzero(missing), np.flatnonzero(~missing)):
+        if not len(stratum):
+            continue
+        k = min(len(stratum), max(1, round(size * len(stratum) / n)))
+        step = len(stratum) / k
+        picks = (rng.random() * step + step * np.arange(k)).astype(np.int64)
+        picked.append(stratum[picks])
+        shares.append(np.full(k, len(stratum) / k))
+    rows, row_weights = np.concatenate(picked), np.concatenate(shares)
+    order = np.argsort(rows)
+    rows, row_weights = rows[order], row_weights[order]
+    return df.take(rows).set_axis(pd.Index(rows)), row_weights
+
+
+def preview_operation(
+    df: pd.DataFrame,
+    operation: str,
+    column: Columns,
+    fill_value: Optional[str] = None,
+    new_name: Optional[str] = None,
+    exact: bool = False,
+    sample_rows: int = PREVIEW_SAMPLE_ROWS,
+) -> OperationPreview:
+    """
+    Preview a cleaning operation on an in-memory DataFrame.
+
+    The DataFrame is not modified and not copied; only the sample is.
+
+    Args:
+        df: The dataset.
+        operation: Key from OPERATIONS.
+        column: As for apply_operation.
+        fill_value: As for apply_operation.
+        new_name: As for apply_operation.
+        exact: Run on every row instead of a sample.
+        sample_rows: Size of the sample.
+
+    Raises:
+        KeyError: If the operation or a column is not recognized.
+        ValueError: If the DataFrame is empty or no column is selected.
+    """
+    cols = resolve_columns(df, column)
+    if exact or operation in EXACT_OPS:
+        sample_rows = len(df)
+    sample, weights = stratified_sample(df, cols, sample_rows)
+    return _measure(sample, weights, len(df), operation, column, fill_value, new_name)
+
+
+def preview_chunks(
+    chunks: Iterable[pd.DataFrame],
+    total_rows: int,
+    operation: str,
+    column: Columns,
+    fill_value: Optional[str] = None,
+    new_name: Optional[str] = None,
+    sample_rows: int = PREVIEW_SAMPLE_ROWS,
+) -> OperationPreview:
+    """
+    Preview a cleaning operation on a dataset too large for memory.
+
+    Each chunk contributes a stratified sample in proportion to its rows,
+    so only the sample is held in memory.
+
+    Args:
+        chunks: Consecutive row ranges of the dataset.
+        total_rows: Rows in the whole dataset.
+        operation, column, fill_value, new_name: As for preview_operation.
+        sample_rows: Size of the sample across all chunks.
+
+    Raises:
+        ValueError: If the operation cannot run chunk by chunk, since it
+            could not be applied to this dataset either.
+    """
+    if not can_stream(operation, fill_value):
+        raise ValueError(
+            f"Operation '{operation}' needs the whole column and cannot "
+            "run chunk by chunk."
+        )
+    samples, weights = [], []
+    offset = 0
+    for i, chunk in enumerate(chunks):
+        size = max(1, round(sample_rows * len(chunk) / max(total_rows, 1)))
+        sample, chunk_weights = stratified_sample(
+            chunk, resolve_columns(chunk, column), size, seed=i
+        )
+        samples.append(sample.set_axis(sample.index + offset))
+        weights.append(chunk_weights)
+        offset += len(chunk)
+    return _measure(
+        pd.concat(samples),
+        np.concatenate(weights),
+        offset,
+        operation,
+        column,
+        fill_value,
+        new_name,
+    )
+
+
+def _measure(
+    sample: pd.DataFrame,
+    weights: np.ndarray,
+    total_rows: int,
+    operation: str,
+    column: Columns,
+    fill_value: Optional[str],
+    new_name: Optional[str],
+) -> OperationPreview:
+    """Run the operation on a sample and scale its effect to total_rows."""
+    start = time.perf_counter()
+    after = apply_operation(
+        sample.copy(deep=False), operation, column, fill_value, new_name
+    )
+    elapsed = time.perf_counter() - start
+    weight = pd.Series(weights, index=sample.index)
+    kept = weight.loc[after.index]
+    renamed = {}
+    if operation == "rename_column" and new_name:
+        renamed[resolve_columns(sample, column)[0]] = new_name
+    changed, null_delta, dtype_changes, dropped = 0.0, {}, {}, []
+    for col in sample.columns:
+        name = renamed.get(col, col)
+        if name not in after.columns:
+            dropped.append(col)
+            continue
+        before_values, after_values = sample[col], after[name]
+        # Row by row, whatever order the operation left the rows in
+        old = before_values.loc[after.index]
+        changed += kept[~_same_values(old, after_values)].sum()
+        delta = round(
+            kept[after_values.isna()].sum() - weight[before_values.isna()].sum()
+        )
+        if delta:
+            null_delta[name] = delta
+        dtypes = (str(before_values.dtype), str(after_values.dtype))
+        if dtypes[0] != dtypes[1]:
+            dtype_changes[name] = dtypes
+    rows_after = round(kept.sum())
+    return OperationPreview(
+        rows_before=total_rows,
+        rows_after=rows_after,
+        rows_affected=total_rows - rows_after,
+        changed_cells=round(changed),
+        null_delta=null_delta,
+        dtype_changes=dtype_changes,
+        columns_dropped=dropped,
+        estimated_seconds=elapsed * total_rows / max(len(sample), 1),
+        sample_rows=None if len(sample) == total_rows else len(sample),
+    )
+
+
+def _same_values(before: pd.Series, after: pd.Series) -> np.ndarray:
+    """Which cells hold an equal value, or are missing in both."""
+    both_missing = (before.isna() & after.isna()).to_numpy()
+    if before.dtype == after.dtype and not isinstance(
+        before.dtype, pd.CategoricalDtype
+    ):
+        equal = before.eq(after).fillna(False).to_numpy(dtype=bool)
+    else:
+        # Compared as Python objects, so e.g. the text "1" differs from 1.0
+        old = before.astype(object).where(before.notna(), None).to_numpy()
+        new = after.astype(object).where(after.notna(), None).to_numpy()
+        equal = np.asarray(old == new, dtype=bool)
+    return equal | both_missing
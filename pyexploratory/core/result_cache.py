@@ -0,0 +1,89 @@
+"""
+Disk-backed memoization of derived results, keyed by dataset version.
+
+Charts, summaries, ML results and previews are pure functions of the
+dataset content and their parameters. Each result is pickled under
+RESULT_CACHE_DIR/<dataset_version>/, so it survives restarts, and a state
+reached again through undo/redo reuses everything computed for it before.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from pyexploratory.config import RESULT_CACHE_DIR, RESULT_CACHE_MAX_VERSIONS
+from pyexploratory.core.data_store import dataset_version
+
+T = TypeVar("T")
+
+
+def cached_result(
+    namespace: str,
+    params: Dict[str, Any],
+    compute: Callable[[], T],
+    version: Optional[str] = None,
+) -> T:
+    """
+    Return the memoized result for (dataset_version, namespace, params).
+
+    Args:
+        namespace: Kind of result, e.g. "summary" or "kmeans".
+        params: JSON-serialisable parameters that identify the result.
+        compute: Zero-argument function producing the result on a miss.
+        version: Dataset version to key on; defaults to the current one.
+
+    Returns:
+        The cached or freshly computed result. Exceptions raised by
+        compute propagate and nothing is cached.
+
+    Raises:
+        FileNotFoundError: If no dataset has been uploaded.
+    """
+    version = version or dataset_version()
+    path = _entry_path(version, namespace, params)
+    if os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+            os.utime(os.path.dirname(path))
+            return result
+        except Exception:
+            # Corrupt or stale entry (e.g. a class changed) — recompute
+            pass
+    result = compute()
+    _store(path, result)
+    return result
+
+
+def clear_result_cache() -> None:
+    """Remove every cached result for every dataset version."""
+    if os.path.exists(RESULT_CACHE_DIR):
+        shutil.rmtree(RESULT_CACHE_DIR)
+
+
+def _entry_path(version: str, namespace: str, params: Dict[str, Any]) -> str:
+    key = json.dumps(params, sort_keys=True, default=str)
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+    return os.path.join(RESULT_CACHE_DIR, version, f"{namespace}-{digest}.pkl")
+
+
+def _store(path: str, result: Any) -> None:
+    """Write an entry atomically, then drop the least recently used versions."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    _prune()
+
+
+def _prune() -> None:
+    versions = [
+        os.path.join(RESULT_CACHE_DIR, name) for name in os.listdir(RESULT_CACHE_DIR)
+    ]
+    versions.sort(key=os.path.getmtime, reverse=True)
+    for stale in versions[RESULT_CACHE_MAX_VERSIONS:]:
+        shutil.rmtree(stale, ignore_errors=True)
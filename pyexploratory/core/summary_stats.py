@@ -0,0 +1,169 @@
+"""
+Incremental per-column statistics for the Summary tab.
+
+Computes what DataFrame.describe() and the distribution charts show one
+chunk at a time, so datasets in chunked mode are never loaded whole.
+Count, mean, std, min and max are exact. Quartiles are interpolated from a
+fixed-bin histogram spanning the catalog's min/max, so they are approximate.
+
+Pure business logic — no Dash dependencies.
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pyexploratory.core.catalog import ColumnInfo, DatasetCatalog
+
+HISTOGRAM_BINS = 50
+# Value counts are only tracked for columns with at most this many values
+MAX_TRACKED_VALUES = 10_000
+TOP_VALUES = 20
+
+
+class ColumnSummary(NamedTuple):
+    """describe()-style statistics plus the data for a distribution chart."""
+
+    statistics: List[Tuple[str, Any]]
+    # Numeric columns: histogram over bin_edges
+    bin_edges: Optional[np.ndarray] = None
+    bin_counts: Optional[np.ndarray] = None
+    # Other columns: most frequent values, descending
+    top_values: Optional[pd.Series] = None
+
+
+def summarize_chunks(
+    chunks: Iterable[pd.DataFrame],
+    catalog: DatasetCatalog,
+    bins: int = HISTOGRAM_BINS,
+) -> Dict[str, ColumnSummary]:
+    """
+    Summarize every column of a dataset in a single pass over its chunks.
+
+    Args:
+        chunks: Consecutive row ranges of the dataset.
+        catalog: The dataset's catalog; supplies histogram ranges and
+                 distinct counts.
+        bins: Number of histogram bins for numeric columns.
+
+    Returns:
+        Dict of column name to ColumnSummary, in catalog column order.
+    """
+    accumulators = {
+        col: (
+            _NumericAccumulator(info, bins)
+            if info.numeric and info.dtype not in ("bool", "boolean")
+            else _ValueAccumulator(info)
+        )
+        for col, info in catalog.columns.items()
+    }
+    for chunk in chunks:
+        for col, accumulator in accumulators.items():
+            accumulator.add(chunk[col])
+    return {col: acc.result() for col, acc in accumulators.items()}
+
+
+class _NumericAccumulator:
+    def __init__(self, info: ColumnInfo, bins: int):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared deviations from the mean
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.edges: Optional[np.ndarray]
+        if info.min is None:
+            self.edges = None
+        elif info.min == info.max:
+            self.edges = np.array([info.min - 0.5, info.max + 0.5])
+        else:
+            self.edges = np.linspace(info.min, info.max, bins + 1)
+        self.counts: Optional[np.ndarray] = (
+            None if self.edges is None else np.zeros(len(self.edges) - 1)
+        )
+
+    def add(self, series: pd.Series) -> None:
+        values = series.dropna().to_numpy(dtype="float64")
+        n = len(values)
+        if n == 0:
+            return
+        # Chan et al. pairwise update of mean and squared deviations
+        chunk_mean = values.mean()
+        chunk_m2 = ((values - chunk_mean) ** 2).sum()
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta**2 * self.count * n / total
+        self.count = total
+
+        low, high = values.min(), values.max()
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+        if self.edges is not None:
+            self.counts += np.histogram(values, bins=self.edges)[0]
+
+    def quantile(self, q: float) -> float:
+        """Interpolate a quantile linearly within its histogram bin."""
+        if self.counts is None or self.edges is None or self.count == 0:
+            return np.nan
+        target = q * self.count
+        cumulative = np.cumsum(self.counts)
+        i = int(np.searchsorted(cumulative, target))
+        i = min(i, len(self.counts) - 1)
+        before = cumulative[i - 1] if i > 0 else 0.0
+        share = (target - before) / self.counts[i] if self.counts[i] else 0.0
+        value = self.edges[i] + share * (self.edges[i + 1] - self.edges[i])
+        return float(np.clip(value, self.min, self.max))
+
+    def result(self) -> ColumnSummary:
+        std = np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+        statistics = [
+            ("count", float(self.count)),
+            ("mean", float(self.mean) if self.count else np.nan),
+            ("std", float(std)),
+            ("min", _plain(self.min)),
+            ("25%", self.quantile(0.25)),
+            ("50%", self.quantile(0.5)),
+            ("75%", self.quantile(0.75)),
+            ("max", _plain(self.max)),
+        ]
+        return ColumnSummary(statistics, bin_edges=self.edges, bin_counts=self.counts)
+
+
+class _ValueAccumulator:
+    def __init__(self, info: ColumnInfo):
+        self.count = 0
+        self.distinct = info.distinct
+        tracked = info.distinct is not None and info.distinct <= MAX_TRACKED_VALUES
+        self.values: Optional[Counter] = Counter() if tracked else None
+
+    def add(self, series: pd.Series) -> None:
+        self.count += int(series.notna().sum())
+        if self.values is not None:
+            counts = series.value_counts()
+            self.values.update(dict(zip(counts.index, counts.to_numpy())))
+
+    def result(self) -> ColumnSummary:
+        top_values = None
+        top = freq = None
+        if self.values:
+            common = self.values.most_common(TOP_VALUES)
+            top_values = pd.Series(
+                [int(n) for _, n in common], index=[v for v, _ in common]
+            )
+            top, freq = _plain(common[0][0]), int(common[0][1])
+        statistics = [
+            ("count", self.count),
+            ("unique", self.distinct),
+            ("top", top),
+            ("freq", freq),
+        ]
+        return ColumnSummary(statistics, top_values=top_values)
+
+
+def _plain(value) -> Any:
+    """Convert numpy/pandas scalars to plain Python for JSON tables."""
+    if isinstance(value, pd.Timestamp):
+        return str(value)
+    return value.item() if hasattr(value, "item") else value
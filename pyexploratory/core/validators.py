@@ -1,63 +1,150 @@
-"""Input validation for cleaning, ML, and upload operations."""
+"""
+Input validation for cleaning, ML, and upload operations.
 
-from typing import Optional
+Every validator accepts either a DataFrame or a DatasetCatalog. Passing the
+catalog answers from write-time metadata without touching row data.
+"""
+
+from typing import List, Optional, Sequence, Set, Union
 
 import pandas as pd
 
+from pyexploratory.core.catalog import DatasetCatalog
+from pyexploratory.core.cleaning_ops import (
+    COLUMN_SELECTORS,
+    CleaningStep,
+    Columns,
+    resolve_columns,
+)
+
 STRING_OPS = {"lowercase", "uppercase", "trim", "lstrip", "rstrip", "alnum"}
 NUMERIC_OPS = {"normalize", "remove_outliers"}
 
+DataSource = Union[pd.DataFrame, DatasetCatalog]
+
 
-def validate_column_exists(df: pd.DataFrame, column: str) -> Optional[str]:
+def validate_column_exists(df: DataSource, column: str) -> Optional[str]:
     if column not in df.columns:
-        return f"Column '{column}' not found. Available: {', '.join(df.columns[:10])}"
+        available = ", ".join(list(df.columns)[:10])
+        return f"Column '{column}' not found. Available: {available}"
+    return None
+
+
+def validate_columns(df: DataSource, column: Columns) -> Optional[str]:
+    """Check a cleaning step's column, column list or selector."""
+    try:
+        resolve_columns(df, column)
+    except KeyError as e:
+        return e.args[0]
+    except ValueError as e:
+        return str(e)
     return None
 
 
-def validate_numeric_column(df: pd.DataFrame, column: str) -> Optional[str]:
-    if not pd.api.types.is_numeric_dtype(df[column]):
-        return f"Column '{column}' is not numeric (type: {df[column].dtype})."
+def validate_numeric_column(df: DataSource, column: str) -> Optional[str]:
+    if not _is_numeric(df, column):
+        return f"Column '{column}' is not numeric (type: {_dtype(df, column)})."
     return None
 
 
-def validate_string_column(df: pd.DataFrame, column: str) -> Optional[str]:
-    if not pd.api.types.is_string_dtype(df[column]):
-        return f"Column '{column}' is not text (type: {df[column].dtype})."
+def validate_string_column(df: DataSource, column: str) -> Optional[str]:
+    if not _is_text(df, column):
+        return f"Column '{column}' is not text (type: {_dtype(df, column)})."
     return None
 
 
-def validate_not_empty(df: pd.DataFrame) -> Optional[str]:
-    if df.empty:
+def validate_not_empty(df: DataSource) -> Optional[str]:
+    if _row_count(df) == 0 or len(df.columns) == 0:
         return "The dataset is empty. Please upload data first."
     return None
 
 
 def validate_min_rows(
-    df: pd.DataFrame, min_rows: int, context: str = ""
+    df: DataSource, min_rows: int, context: str = ""
 ) -> Optional[str]:
-    if len(df) < min_rows:
-        return f"Need at least {min_rows} rows for {context}, but only {len(df)} available."
+    n_rows = _row_count(df)
+    if n_rows < min_rows:
+        return (
+            f"Need at least {min_rows} rows for {context}, but only {n_rows} available."
+        )
     return None
 
 
-def validate_not_all_nan(df: pd.DataFrame, column: str) -> Optional[str]:
-    if df[column].isna().all():
+def validate_not_all_nan(df: DataSource, column: str) -> Optional[str]:
+    if isinstance(df, DatasetCatalog):
+        all_nan = df.columns[column].nulls == df.rows
+    else:
+        all_nan = df[column].isna().all()
+    if all_nan:
         return f"Column '{column}' contains only missing values."
     return None
 
 
 def validate_cleaning_compatibility(
-    df: pd.DataFrame, operation: str, column: str
+    df: DataSource, operation: str, column: Columns
 ) -> Optional[str]:
-    if operation in STRING_OPS and not pd.api.types.is_string_dtype(df[column]):
-        return f"Cannot apply '{operation}' to non-text column '{column}'."
-    if operation in NUMERIC_OPS and not pd.api.types.is_numeric_dtype(df[column]):
-        return f"Cannot apply '{operation}' to non-numeric column '{column}'."
+    names = resolve_columns(df, column)
+    if operation == "rename_column" and len(names) != 1:
+        return "Rename one column at a time."
+    for name in names:
+        if operation in STRING_OPS and not _is_text(df, name):
+            return f"Cannot apply '{operation}' to non-text column '{name}'."
+        if operation in NUMERIC_OPS and not _is_numeric(df, name):
+            return f"Cannot apply '{operation}' to non-numeric column '{name}'."
+    return None
+
+
+def validate_recipe(df: DataSource, steps: Sequence[CleaningStep]) -> Optional[str]:
+    """
+    Check a recipe's steps against the dataset before any of them runs.
+
+    Columns are followed through earlier renames and drops. Type checks
+    apply to columns no earlier step has changed; the type of a changed
+    column is only known once the recipe runs. A selector is checked for
+    the unchanged columns it matches, plus any changed columns, which may
+    match it by then.
+    """
+    columns = list(df.columns)
+    changed: Set[str] = set()
+    for i, step in enumerate(steps, 1):
+        if isinstance(step.column, str) and step.column in COLUMN_SELECTORS:
+            names = [
+                name
+                for name in _selected(df, step.column)
+                if name in columns and name not in changed
+            ]
+            if not names and not changed & set(columns):
+                label = COLUMN_SELECTORS[step.column]
+                return f"Step {i}: there will be no {label} at that point."
+        else:
+            names = (
+                [step.column]
+                if isinstance(step.column, str)
+                else list(dict.fromkeys(step.column))
+            )
+            if not names:
+                return f"Step {i}: select at least one column."
+            missing = [name for name in names if name not in columns]
+            if missing:
+                return f"Step {i}: column '{missing[0]}' will not exist at that point."
+        if step.operation == "rename_column" and len(names) != 1:
+            return f"Step {i}: rename one column at a time."
+        unchanged = [name for name in names if name not in changed]
+        if unchanged:
+            error = validate_cleaning_compatibility(df, step.operation, unchanged)
+            if error:
+                return f"Step {i}: {error}"
+        changed.update(names)
+        if step.operation == "drop_column":
+            columns = [name for name in columns if name not in names]
+        elif step.operation == "rename_column" and step.new_name:
+            columns[columns.index(names[0])] = step.new_name
+            changed.add(step.new_name)
     return None
 
 
 def validate_ml_inputs(
-    df: pd.DataFrame, x_col: str, y_col: str, min_samples: int = 10
+    df: DataSource, x_col: str, y_col: str, min_samples: int = 10
 ) -> Optional[str]:
     for col in [x_col, y_col]:
         err = validate_column_exists(df, col)
@@ -66,15 +153,55 @@ def validate_ml_inputs(
         err = validate_numeric_column(df, col)
         if err:
             return err
-    if len(df) < min_samples:
-        return f"Need at least {min_samples} rows, but only {len(df)} available."
+    n_rows = _row_count(df)
+    if n_rows < min_samples:
+        return f"Need at least {min_samples} rows, but only {n_rows} available."
     return None
 
 
 def validate_classification_target(
-    df: pd.DataFrame, target_col: str, min_classes: int = 2
+    df: DataSource, target_col: str, min_classes: int = 2
 ) -> Optional[str]:
-    n_classes = df[target_col].nunique()
+    if isinstance(df, DatasetCatalog):
+        n_classes = df.columns[target_col].distinct
+        if n_classes is None:
+            return None
+    else:
+        n_classes = df[target_col].nunique()
     if n_classes < min_classes:
         return f"Target '{target_col}' has {n_classes} class(es), need at least {min_classes}."
     return None
+
+
+# ---------------------------------------------------------------------------
+# DataFrame / catalog accessors
+# ---------------------------------------------------------------------------
+
+
+def _selected(df: DataSource, selector: str) -> List[str]:
+    try:
+        return resolve_columns(df, selector)
+    except ValueError:
+        return []
+
+
+def _row_count(df: DataSource) -> int:
+    return df.rows if isinstance(df, DatasetCatalog) else len(df)
+
+
+def _dtype(df: DataSource, column: str) -> str:
+    if isinstance(df, DatasetCatalog):
+        return df.columns[column].dtype
+    return str(df[column].dtype)
+
+
+def _is_numeric(df: DataSource, column: str) -> bool:
+    if isinstance(df, DatasetCatalog):
+        return df.columns[column].numeric
+    return pd.api.types.is_numeric_dtype(df[column])
+
+
+def _is_text(df: DataSource, column: str) -> bool:
+    if isinstance(df, DatasetCatalog):
+        return df.columns[column].text
+    return pd.api.types.is_string_dtype(df[column])
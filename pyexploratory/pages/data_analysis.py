@@ -14,9 +14,14 @@ from dash.dependencies import Input, Output
 import dash_bootstrap_components as dbc
 
 from pyexploratory.config import (
+    DROPDOWN_STYLE,
+    GREEN_BUTTON_STYLE,
     GREY,
+    INPUT_STYLE,
     LIGHT_GREEN,
+    MAX_CHUNKED_UPLOAD_MB,
     MAX_UPLOAD_SIZE_MB,
+    OPTIMIZE_DTYPES_ON_UPLOAD,
     SECTION_CARD_STYLE,
     SELECTED_TAB_STYLE,
     TAB_STYLE,
@@ -76,7 +81,8 @@ layout = html.Div(
                             style={"color": "#cccccc"},
                         ),
                         html.Small(
-                            f"Supports CSV, Excel, JSON — max {MAX_UPLOAD_SIZE_MB}MB",
+                            "Supports CSV, Excel, JSON/NDJSON, Parquet, Feather/Arrow, "
+                            f"also as .gz, .bz2 or .zip — max {MAX_UPLOAD_SIZE_MB}MB",
                             style={"color": "#aaaaaa", "marginTop": "4px"},
                         ),
                     ],
@@ -87,6 +93,99 @@ layout = html.Div(
             ),
             style=SECTION_CARD_STYLE,
         ),
+        # Handled in assets/chunked_upload.js, which sends the file to
+        # /api/uploads in resumable chunks and fills the two components below
+        html.Div(
+            [
+                html.Button(
+                    f"Upload a large file (resumable, max {MAX_CHUNKED_UPLOAD_MB}MB)",
+                    id="chunked-upload-button",
+                    style={
+                        **GREEN_BUTTON_STYLE,
+                        "border": "none",
+                        "padding": "5px 15px",
+                    },
+                ),
+                html.Div(id="chunked-upload-status", style={"color": "#cccccc"}),
+                dcc.Store(id="chunked-upload-done"),
+            ],
+            style={"textAlign": "center", "marginBottom": "10px"},
+        ),
+        dcc.Checklist(
+            id="upload-options",
+            options=[
+                {
+                    "label": " Compact dtypes on upload (downcast numbers, "
+                    "categorical text)",
+                    "value": "optimize",
+                }
+            ],
+            value=["optimize"] if OPTIMIZE_DTYPES_ON_UPLOAD else [],
+            style={"color": "#cccccc", "textAlign": "center", "marginBottom": "10px"},
+        ),
+        dcc.RadioItems(
+            id="multi-file-mode",
+            options=[
+                {
+                    "label": " Keep multiple files as separate datasets",
+                    "value": "separate",
+                },
+                {
+                    "label": " Combine multiple files into one dataset",
+                    "value": "concat",
+                },
+            ],
+            value="separate",
+            inline=True,
+            inputStyle={"marginLeft": "16px"},
+            style={"color": "#cccccc", "textAlign": "center", "marginBottom": "10px"},
+        ),
+        html.Div(
+            [
+                dcc.RadioItems(
+                    id="excel-sheets",
+                    options=[
+                        {"label": " Excel: first sheet", "value": "first"},
+                        {"label": " Excel: every sheet as a dataset", "value": "all"},
+                    ],
+                    value="first",
+                    inline=True,
+                    inputStyle={"marginLeft": "16px"},
+                    style={"color": "#cccccc"},
+                ),
+                dcc.Input(
+                    id="excel-nrows",
+                    type="number",
+                    min=1,
+                    placeholder="Row limit",
+                    style={**INPUT_STYLE, "width": "120px", "margin": "0 0 0 16px"},
+                ),
+                dcc.Input(
+                    id="excel-usecols",
+                    type="text",
+                    placeholder="Columns (comma-separated)",
+                    style={**INPUT_STYLE, "width": "240px", "margin": "0 0 0 8px"},
+                ),
+            ],
+            style={
+                "display": "flex",
+                "justifyContent": "center",
+                "alignItems": "center",
+                "marginBottom": "10px",
+            },
+        ),
+        dcc.Dropdown(
+            id="active-dataset",
+            placeholder="Switch dataset...",
+            clearable=False,
+            style={**DROPDOWN_STYLE, "width": "50%", "margin": "0 auto 10px"},
+        ),
+        # Filled by the upload callbacks while they run (callbacks/upload.py)
+        html.Div(
+            id="upload-progress",
+            style={"display": "none"},
+            className="w-50 mx-auto mb-2 text-center",
+        ),
         dcc.Loading(
             id="loading-upload",
             type="circle",
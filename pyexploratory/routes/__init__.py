@@ -0,0 +1,14 @@
+"""
+Plain Flask routes served alongside the Dash app.
+
+Register them on the app's Flask server with register_routes(app.server).
+"""
+
+from flask import Flask
+
+from pyexploratory.routes.uploads import uploads_blueprint
+
+
+def register_routes(server: Flask) -> None:
+    """Attach every blueprint to the Flask server behind the Dash app."""
+    server.register_blueprint(uploads_blueprint)
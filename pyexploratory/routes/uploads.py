@@ -0,0 +1,96 @@
+"""
+HTTP API for resumable chunked uploads (see core.chunked_upload).
+
+    POST   /api/uploads        {"filename", "size"}  -> upload state
+    GET    /api/uploads/<id>                         -> upload state
+    PATCH  /api/uploads/<id>   raw bytes, Upload-Offset header -> state
+    DELETE /api/uploads/<id>                         -> 204
+
+A PATCH whose offset does not match the received byte count gets 409
+with the current state, telling the client where to resume. Once every
+byte has arrived, the page hands the upload id to a Dash callback, which
+parses the file from disk.
+"""
+
+from flask import Blueprint, jsonify, request
+
+from pyexploratory.config import UPLOAD_CHUNK_MB
+from pyexploratory.core.chunked_upload import (
+    OffsetMismatch,
+    UploadState,
+    append_chunk,
+    create_upload,
+    discard_upload,
+    upload_state,
+)
+
+uploads_blueprint = Blueprint("uploads", __name__, url_prefix="/api/uploads")
+
+_CHUNK_BYTES = UPLOAD_CHUNK_MB * 1024 * 1024
+
+
+def _state_json(state: UploadState, status: int = 200):
+    return (
+        jsonify(
+            upload_id=state.upload_id,
+            filename=state.filename,
+            size=state.size,
+            received=state.received,
+            chunk_size=_CHUNK_BYTES,
+        ),
+        status,
+    )
+
+
+def _error(message: str, status: int):
+    return jsonify(error=message), status
+
+
+@uploads_blueprint.post("")
+def start():
+    """Create an upload and return its id."""
+    body = request.get_json(silent=True) or {}
+    filename, size = body.get("filename"), body.get("size")
+    if not isinstance(filename, str) or not isinstance(size, int):
+        return _error("Expected JSON with 'filename' and integer 'size'.", 400)
+    try:
+        return _state_json(create_upload(filename, size), 201)
+    except ValueError as e:
+        return _error(str(e), 413)
+
+
+@uploads_blueprint.get("/<upload_id>")
+def status(upload_id):
+    """Report how many bytes have arrived, i.e. where to resume."""
+    try:
+        return _state_json(upload_state(upload_id))
+    except KeyError as e:
+        return _error(e.args[0], 404)
+
+
+@uploads_blueprint.patch("/<upload_id>")
+def receive(upload_id):
+    """Append one chunk at the offset given in the Upload-Offset header."""
+    offset = request.headers.get("Upload-Offset", type=int)
+    if offset is None:
+        return _error("Missing integer Upload-Offset header.", 400)
+    if (request.content_length or 0) > 2 * _CHUNK_BYTES:
+        return _error(f"Chunks may be at most {2 * UPLOAD_CHUNK_MB} MB.", 413)
+    try:
+        return _state_json(append_chunk(upload_id, offset, request.get_data()))
+    except KeyError as e:
+        return _error(e.args[0], 404)
+    except OffsetMismatch as e:
+        return _state_json(e.state, 409)
+    except ValueError as e:
+        return _error(str(e), 400)
+
+
+@uploads_blueprint.delete("/<upload_id>")
+def cancel(upload_id):
+    """Abandon an upload and delete what was received."""
+    try:
+        discard_upload(upload_id)
+    except KeyError as e:
+        return _error(e.args[0], 404)
+    return "", 204
@@ -8,7 +8,7 @@ import dash_bootstrap_components as dbc
 from dash import dcc, html
 
 from pyexploratory.config import DROPDOWN_STYLE, LIGHT_GREEN, SECTION_CARD_STYLE, TEXT_MUTED
-from pyexploratory.core.data_store import column_options, numeric_column_options, read_data
+from pyexploratory.core.data_store import column_options, get_catalog, numeric_column_options
 
 CHART_TYPE_OPTIONS = [
     {"label": "Histogram", "value": "histogram"},
@@ -49,12 +49,12 @@ CHART_CONTROLS = {
 def render() -> html.Div:
     """Build the Charts tab content."""
     try:
-        df = read_data()
+        catalog = get_catalog()
     except FileNotFoundError:
-        df = None
+        catalog = None
 
-    col_opts = column_options(df) if df is not None else []
-    num_opts = numeric_column_options(df) if df is not None else []
+    col_opts = column_options(catalog) if catalog is not None else []
+    num_opts = numeric_column_options(catalog) if catalog is not None else []
 
     return html.Div(
         [
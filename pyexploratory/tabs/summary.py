@@ -2,7 +2,8 @@
 Summary tab layout builder.
 
 Renders overview metrics row and per-column summary cards
-with statistics and distribution charts.
+with statistics and distribution charts. Datasets in chunked mode are
+summarized incrementally in one streaming pass.
 """
 
 import dash_bootstrap_components as dbc
@@ -16,10 +17,18 @@ from pyexploratory.components.tables import (
     SUMMARY_TABLE_STYLE,
 )
 from pyexploratory.config import LIGHT_GREEN, SECTION_CARD_STYLE, TEXT_MUTED
-from pyexploratory.core.data_store import read_data
+from pyexploratory.core.catalog import DatasetCatalog
+from pyexploratory.core.data_store import (
+    get_catalog,
+    is_chunked_mode,
+    iter_chunks,
+    read_data,
+)
+from pyexploratory.core.result_cache import cached_result
+from pyexploratory.core.summary_stats import summarize_chunks
 
 
-def _metric_tile(label: str, value: str) -> dbc.Col:
+def _metric_tile(label: str, value: str, detail: str = "") -> dbc.Col:
     """Build a single KPI tile for the overview row."""
     return dbc.Col(
         dbc.Card(
@@ -41,6 +50,10 @@ def _metric_tile(label: str, value: str) -> dbc.Col:
                             "fontWeight": "700",
                         },
                     ),
+                    html.Div(
+                        detail,
+                        style={"color": TEXT_MUTED, "fontSize": "12px"},
+                    ),
                 ]
             ),
             style={**SECTION_CARD_STYLE, "textAlign": "center"},
@@ -52,9 +65,9 @@ def _metric_tile(label: str, value: str) -> dbc.Col:
 
 
 def render() -> html.Div:
-    """Build the Summary tab content."""
+    """Build the Summary tab content, memoized per dataset version."""
     try:
-        df = read_data()
+        return cached_result("summary", {}, _build_summary)
     except FileNotFoundError:
         return html.Div(
             dbc.Alert(
@@ -63,104 +76,174 @@ def render() -> html.Div:
             )
         )
 
+
+def _build_summary() -> html.Div:
+    """Compute overview metrics and per-column cards from the dataset."""
+    catalog = get_catalog()
+
     # --- Overview metrics row ---
-    total_rows = len(df)
-    total_cols = len(df.columns)
+    total_rows = catalog.rows
+    total_cols = len(catalog.columns)
+    total_missing = sum(info.nulls for info in catalog.columns.values())
     missing_pct = (
-        f"{(df.isnull().sum().sum() / (total_rows * total_cols)) * 100:.1f}%"
-        if total_rows > 0
+        f"{(total_missing / (total_rows * total_cols)) * 100:.1f}%"
+        if total_rows > 0 and total_cols > 0
         else "0%"
     )
-    memory_mb = f"{df.memory_usage(deep=True).sum() / (1024 * 1024):.2f} MB"
+    memory_mb = f"{catalog.memory / (1024 * 1024):.2f} MB"
+    memory_detail = ""
+    if catalog.source_memory:
+        saved = (1 - catalog.memory / catalog.source_memory) * 100
+        memory_detail = (
+            f"{saved:.0f}% saved vs. "
+            f"{catalog.source_memory / (1024 * 1024):.2f} MB as parsed"
+        )
 
     overview = dbc.Row(
         [
             _metric_tile("Total Rows", f"{total_rows:,}"),
             _metric_tile("Total Columns", str(total_cols)),
             _metric_tile("Missing Values", missing_pct),
-            _metric_tile("Memory Usage", memory_mb),
+            _metric_tile("Memory Usage", memory_mb, memory_detail),
         ],
         className="mb-3",
     )
 
     # --- Per-column cards ---
+    if is_chunked_mode():
+        cards = _chunked_column_cards(catalog)
+    else:
+        cards = _column_cards(read_data())
+    return html.Div([overview, dbc.Row(cards)])
+
+
+def _column_cards(df: pd.DataFrame) -> list:
+    """Build exact per-column cards from a fully loaded DataFrame."""
     cards = []
     for col in df.columns:
         summary = df[col].describe().reset_index()
         summary.columns = ["Statistic", "Value"]
 
-        additional_stats = pd.DataFrame(
-            {
-                "Statistic": [
-                    "Data Type",
-                    "Missing Values",
-                    "Missing Values (%)",
-                ],
-                "Value": [
-                    str(df[col].dtype),
-                    df[col].isnull().sum(),
-                    "{:.2f}%".format(
-                        (df[col].isnull().sum() / len(df[col])) * 100
-                        if len(df[col]) > 0
-                        else 0
-                    ),
-                ],
-            }
-        )
-        summary = pd.concat([summary, additional_stats], ignore_index=True)
-
-        summary_table = dash_table.DataTable(
-            data=summary.to_dict("records"),
-            columns=[{"name": i, "id": i} for i in summary.columns],
-            style_data={"whiteSpace": "normal", "height": "auto"},
-            style_cell=SUMMARY_DARK_CELL_STYLE,
-            style_header=SUMMARY_DARK_HEADER_STYLE,
-            style_table=SUMMARY_TABLE_STYLE,
-            fill_width=False,
-        )
-
         if pd.api.types.is_numeric_dtype(df[col]):
             fig = px.histogram(
                 df,
                 x=col,
                 title=f"Distribution of {col}",
                 template="plotly_dark",
+                color_discrete_sequence=[LIGHT_GREEN],
             )
         else:
             data = df[col].value_counts().reset_index()
             data.columns = [col, "count"]
+            fig = _value_count_figure(col, data)
+
+        cards.append(
+            _column_card(
+                col, summary, str(df[col].dtype), df[col].isnull().sum(), len(df), fig
+            )
+        )
+    return cards
+
+
+def _chunked_column_cards(catalog: DatasetCatalog) -> list:
+    """Build per-column cards in one streaming pass over the dataset."""
+    cards = []
+    summaries = summarize_chunks(iter_chunks(), catalog)
+    for col, column_summary in summaries.items():
+        summary = pd.DataFrame(
+            column_summary.statistics, columns=["Statistic", "Value"]
+        )
+        if column_summary.bin_edges is not None:
+            edges = column_summary.bin_edges
             fig = px.bar(
-                data,
-                x=col,
-                y="count",
+                x=(edges[:-1] + edges[1:]) / 2,
+                y=column_summary.bin_counts,
+                labels={"x": col, "y": "count"},
                 title=f"Distribution of {col}",
                 template="plotly_dark",
                 color_discrete_sequence=[LIGHT_GREEN],
             )
+            fig.update_traces(width=edges[1] - edges[0])
+        else:
+            data = pd.DataFrame(
+                {col: [], "count": []}
+                if column_summary.top_values is None
+                else {
+                    col: column_summary.top_values.index.astype(str),
+                    "count": column_summary.top_values.to_numpy(),
+                }
+            )
+            fig = _value_count_figure(col, data)
 
-        fig.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            margin=dict(l=10, r=10, t=40, b=10),
+        info = catalog.columns[col]
+        cards.append(
+            _column_card(col, summary, info.dtype, info.nulls, catalog.rows, fig)
         )
+    return cards
 
-        card = dbc.Card(
-            dbc.CardBody(
-                [
-                    html.H5(
-                        col,
-                        style={
-                            "color": LIGHT_GREEN,
-                            "fontWeight": "600",
-                            "marginBottom": "12px",
-                        },
-                    ),
-                    dcc.Graph(figure=fig, config={"displayModeBar": False}),
-                    summary_table,
-                ]
-            ),
-            style=SECTION_CARD_STYLE,
-        )
-        cards.append(dbc.Col(card, xs=12, sm=6, lg=4, xl=3, className="mb-3"))
 
-    return html.Div([overview, dbc.Row(cards)])
+def _value_count_figure(col: str, data: pd.DataFrame):
+    return px.bar(
+        data,
+        x=col,
+        y="count",
+        title=f"Distribution of {col}",
+        template="plotly_dark",
+        color_discrete_sequence=[LIGHT_GREEN],
+    )
+
+
+def _column_card(
+    col: str, summary: pd.DataFrame, dtype: str, nulls: int, rows: int, fig
+) -> dbc.Col:
+    """Build the card for one column: distribution chart plus statistics."""
+    additional_stats = pd.DataFrame(
+        {
+            "Statistic": [
+                "Data Type",
+                "Missing Values",
+                "Missing Values (%)",
+            ],
+            "Value": [
+                dtype,
+                nulls,
+                "{:.2f}%".format((nulls / rows) * 100 if rows > 0 else 0),
+            ],
+        }
+    )
+    summary = pd.concat([summary, additional_stats], ignore_index=True)
+
+    summary_table = dash_table.DataTable(
+        data=summary.to_dict("records"),
+        columns=[{"name": i, "id": i} for i in summary.columns],
+        style_data={"whiteSpace": "normal", "height": "auto"},
+        style_cell=SUMMARY_DARK_CELL_STYLE,
+        style_header=SUMMARY_DARK_HEADER_STYLE,
+        style_table=SUMMARY_TABLE_STYLE,
+        fill_width=False,
+    )
+
+    fig.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        margin=dict(l=10, r=10, t=40, b=10),
+    )
+
+    card = dbc.Card(
+        dbc.CardBody(
+            [
+                html.H5(
+                    col,
+                    style={
+                        "color": LIGHT_GREEN,
+                        "fontWeight": "600",
+                        "marginBottom": "12px",
+                    },
+                ),
+                dcc.Graph(figure=fig, config={"displayModeBar": False}),
+                summary_table,
+            ]
+        ),
+        style=SECTION_CARD_STYLE,
+    )
+    return dbc.Col(card, xs=12, sm=6, lg=4, xl=3, className="mb-3")
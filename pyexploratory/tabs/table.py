@@ -23,7 +23,10 @@ from pyexploratory.config import (
     TEXT_MUTED,
     WHITE,
 )
-from pyexploratory.core.data_store import read_data
+from pyexploratory.core.data_store import is_chunked_mode, iter_chunks, read_data
+
+# Rows shown for datasets in chunked mode, which are too large to load whole
+CHUNKED_PREVIEW_ROWS = 1000
 
 # Operations that delete data — require confirmation
 DESTRUCTIVE_OPS = {"drop_column", "dropna", "drop_duplicates", "remove_outliers"}
@@ -63,7 +66,11 @@ _UNDO_REDO_BTN = {
 def render() -> html.Div:
     """Build the Table tab content."""
     try:
-        df = read_data()
+        chunked = is_chunked_mode()
+        if chunked:
+            df = next(iter_chunks(chunk_rows=CHUNKED_PREVIEW_ROWS))
+        else:
+            df = read_data()
     except FileNotFoundError:
         return html.Div(
             dbc.Alert(
@@ -76,6 +83,8 @@ def render() -> html.Div:
         [
             # Hidden stores
             dcc.Store(id="pending-operation", data=None),
+            # Steps queued to be applied together (CleaningStep dicts)
+            dcc.Store(id="cleaning-queue", data=[]),
             dcc.Store(id="history-trigger", data=0),
             # Confirmation modal
             dbc.Modal(
@@ -129,6 +138,13 @@ def render() -> html.Div:
                     "zIndex": 9999,
                 },
             ),
+            # Large datasets: read-only preview of the first rows
+            dbc.Alert(
+                f"This dataset is too large to edit inline. Showing the first "
+                f"{len(df):,} rows; cleaning operations still apply to all rows.",
+                color="info",
+                is_open=chunked,
+            ),
             # Data table
             dash_table.DataTable(
                 id="table",
@@ -139,7 +155,7 @@ def render() -> html.Div:
                 style_table=DATA_TABLE_STYLE,
                 style_cell=DATA_TABLE_CELL_STYLE,
                 style_header=TABLE_HEADER_STYLE,
-                editable=True,
+                editable=not chunked,
             ),
             # Save + Undo/Redo buttons row
             html.Div(
@@ -214,7 +230,7 @@ def render() -> html.Div:
                                     dcc.Input(
                                         id="column-to-clean",
                                         type="text",
-                                        placeholder="Column to clean...",
+                                        placeholder="Column(s), or @text, @numeric...",
                                         style=INPUT_STYLE,
                                     ),
                                 ],
@@ -271,10 +287,62 @@ def render() -> html.Div:
                                     "color": "white",
                                 },
                             ),
+                            dcc.Checklist(
+                                id="preview-exact",
+                                options=[{"label": " Exact preview", "value": "exact"}],
+                                value=[],
+                                style={"color": TEXT_MUTED, "fontSize": "13px"},
+                            ),
+                            html.Button(
+                                "Add to Queue",
+                                id="queue-add-btn",
+                                n_clicks=0,
+                                style={
+                                    **_UNDO_REDO_BTN,
+                                    "backgroundColor": "#3498db",
+                                    "color": "white",
+                                },
+                            ),
                         ],
                         style={"display": "flex", "alignItems": "center", "gap": "8px"},
                     ),
                     html.Div(id="cleaning-result", style={"marginTop": "10px"}),
+                    # Queued steps run with one snapshot and one write
+                    html.Div(
+                        [
+                            html.Div(
+                                id="cleaning-queue-list",
+                                style={"color": TEXT_MUTED, "fontSize": "13px"},
+                            ),
+                            html.Div(
+                                [
+                                    html.Button(
+                                        "Apply Queue",
+                                        id="queue-apply-btn",
+                                        n_clicks=0,
+                                        style=CLEAN_BUTTON_STYLE,
+                                    ),
+                                    html.Button(
+                                        "Clear Queue",
+                                        id="queue-clear-btn",
+                                        n_clicks=0,
+                                        style={
+                                            **_UNDO_REDO_BTN,
+                                            "backgroundColor": "#7f8c8d",
+                                            "color": "white",
+                                        },
+                                    ),
+                                ],
+                                style={
+                                    "display": "flex",
+                                    "alignItems": "center",
+                                    "gap": "8px",
+                                    "marginTop": "8px",
+                                },
+                            ),
+                        ],
+                        style={"marginTop": "10px"},
+                    ),
                 ],
                 style=SECTION_CARD_STYLE,
             ),
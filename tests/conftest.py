@@ -9,6 +9,7 @@ import pandas as pd
 import pytest
 
 from pyexploratory import config
+from pyexploratory.core import data_store
 
 
 @pytest.fixture
@@ -35,11 +36,16 @@ def iris_df():
 
 @pytest.fixture
 def tmp_data_file(sample_df, monkeypatch):
-    """Write sample_df to a temp CSV and patch DATA_FILE to point there."""
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-        sample_df.to_csv(f, index=False)
+    """Write sample_df to a temp Parquet file and patch DATA_FILE to point there."""
+    with tempfile.NamedTemporaryFile(suffix=".parquet", delete=False) as f:
         tmp_path = f.name
+    sample_df.to_parquet(tmp_path, index=False)
 
     monkeypatch.setattr(config, "DATA_FILE", tmp_path)
+    monkeypatch.setattr(data_store, "DATA_FILE", tmp_path)
+    data_store.invalidate_cache()
+    data_store._frames.clear()
     yield tmp_path
+    data_store.invalidate_cache()
+    data_store._frames.clear()
     os.unlink(tmp_path)
@@ -0,0 +1,63 @@
+"""
+Tests for pyexploratory.core.arrow_csv.
+"""
+
+import io
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from pyexploratory.config import PROJECT_ROOT
+from pyexploratory.core import arrow_csv
+from pyexploratory.core.arrow_csv import read_csv_arrow
+
+
+def _both(csv_bytes: bytes):
+    df, skipped = read_csv_arrow(io.BytesIO(csv_bytes))
+    return df, pd.read_csv(io.BytesIO(csv_bytes)), skipped
+
+
+class TestParity:
+    def test_iris_matches_read_csv(self):
+        with open(os.path.join(PROJECT_ROOT, "data", "iris.csv"), "rb") as f:
+            df, expected, skipped = _both(f.read())
+        pd.testing.assert_frame_equal(df, expected)
+        assert skipped == 0
+
+    def test_missing_values_dates_and_empty_column(self):
+        csv_bytes = (
+            b"n,s,d,f,e\n1,x,2024-01-01,1.5,\n,y,2024-01-02,,\n3,,2024-01-03,2,\n"
+        )
+        df, expected, _ = _both(csv_bytes)
+        pd.testing.assert_frame_equal(df, expected)
+        assert df["e"].dtype == "float64"
+
+
+class TestMalformedRows:
+    def test_rows_with_wrong_field_count_skipped(self):
+        df, skipped = read_csv_arrow(io.BytesIO(b"a,b\n1,2\n3,4,5\n6,7\n"))
+        assert df["a"].tolist() == [1, 6]
+        assert skipped == 1
+
+    def test_short_rows_raise(self):
+        with pytest.raises(pa.ArrowInvalid):
+            read_csv_arrow(io.BytesIO(b"a,b,c\n1,2,3\n4,5\n7,8,9"))
+
+
+class TestSampledTypes:
+    def test_late_type_conflict_raises(self, monkeypatch):
+        monkeypatch.setattr(arrow_csv, "SAMPLE_BYTES", 16)
+        csv_bytes = b"a,b\n" + b"1,2\n" * 10 + b"x,3\n"
+        with pytest.raises(pa.ArrowInvalid):
+            read_csv_arrow(io.BytesIO(csv_bytes))
+
+    def test_type_settles_within_sample(self, monkeypatch):
+        monkeypatch.setattr(arrow_csv, "SAMPLE_BYTES", 16)
+        df, _ = read_csv_arrow(io.BytesIO(b"a\n1\n2.5\n3\n4\n"))
+        assert df["a"].dtype == "float64"
+
+    def test_duplicate_header_rejected(self):
+        with pytest.raises(ValueError):
+            read_csv_arrow(io.BytesIO(b"a,a\n1,2\n"))
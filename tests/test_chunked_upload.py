@@ -0,0 +1,158 @@
+"""
+Tests for pyexploratory.core.chunked_upload and the /api/uploads routes.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from pyexploratory.core import chunked_upload
+from pyexploratory.routes import register_routes
+
+
+@pytest.fixture(autouse=True)
+def uploads_dir(tmp_path, monkeypatch):
+    directory = str(tmp_path / "uploads")
+    monkeypatch.setattr(chunked_upload, "UPLOADS_DIR", directory)
+    return directory
+
+
+class TestChunkedUpload:
+    def test_chunks_assemble_the_file(self):
+        state = chunked_upload.create_upload("data.csv", 6)
+        chunked_upload.append_chunk(state.upload_id, 0, b"a\n1")
+        done = chunked_upload.append_chunk(state.upload_id, 3, b"\n2\n")
+        assert done.complete
+        with open(chunked_upload.completed_file(state.upload_id), "rb") as f:
+            assert f.read() == b"a\n1\n2\n"
+
+    def test_state_reports_resume_point(self):
+        state = chunked_upload.create_upload("data.csv", 10)
+        chunked_upload.append_chunk(state.upload_id, 0, b"abcd")
+        resumed = chunked_upload.upload_state(state.upload_id)
+        assert (resumed.filename, resumed.size, resumed.received) == ("data.csv", 10, 4)
+        assert not resumed.complete
+
+    def test_wrong_offset_rejected_with_state(self):
+        state = chunked_upload.create_upload("data.csv", 10)
+        chunked_upload.append_chunk(state.upload_id, 0, b"abcd")
+        # A resent chunk must not be appended twice
+        with pytest.raises(chunked_upload.OffsetMismatch) as info:
+            chunked_upload.append_chunk(state.upload_id, 0, b"abcd")
+        assert info.value.state.received == 4
+
+    def test_offset_checked_again_before_writing(self, monkeypatch):
+        state = chunked_upload.create_upload("data.csv", 10)
+        chunked_upload.append_chunk(state.upload_id, 0, b"abcd")
+        # A concurrent request read the size before the first one appended
+        monkeypatch.setattr(chunked_upload, "upload_state", lambda _: state)
+        with pytest.raises(chunked_upload.OffsetMismatch) as info:
+            chunked_upload.append_chunk(state.upload_id, 0, b"abcd")
+        assert info.value.state.received == 4
+
+    def test_concurrent_resends_append_once(self):
+        state = chunked_upload.create_upload("data.csv", 4)
+        barrier = threading.Barrier(8)
+
+        def send():
+            barrier.wait()
+            try:
+                chunked_upload.append_chunk(state.upload_id, 0, b"abcd")
+            except chunked_upload.OffsetMismatch:
+                pass
+
+        threads = [threading.Thread(target=send) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert chunked_upload.upload_state(state.upload_id).received == 4
+
+    def test_size_limits(self, monkeypatch):
+        monkeypatch.setattr(chunked_upload, "MAX_CHUNKED_UPLOAD_MB", 1)
+        with pytest.raises(ValueError):
+            chunked_upload.create_upload("big.csv", 2 * 1024 * 1024)
+        state = chunked_upload.create_upload("data.csv", 2)
+        with pytest.raises(ValueError, match="declared size"):
+            chunked_upload.append_chunk(state.upload_id, 0, b"abc")
+
+    def test_incomplete_upload_not_returned(self):
+        state = chunked_upload.create_upload("data.csv", 2)
+        with pytest.raises(ValueError, match="incomplete"):
+            chunked_upload.completed_file(state.upload_id)
+
+    def test_unknown_and_malformed_ids(self):
+        with pytest.raises(KeyError):
+            chunked_upload.upload_state("0" * 32)
+        with pytest.raises(KeyError):
+            chunked_upload.upload_state("../../etc/passwd")
+
+    def test_filename_path_stripped(self):
+        assert chunked_upload.create_upload("../x/data.csv", 1).filename == "data.csv"
+
+    def test_discard_and_purge(self, uploads_dir):
+        kept = chunked_upload.create_upload("a.csv", 1)
+        dropped = chunked_upload.create_upload("b.csv", 1)
+        chunked_upload.discard_upload(dropped.upload_id)
+        assert sorted(os.listdir(uploads_dir)) == [
+            f"{kept.upload_id}.json",
+            f"{kept.upload_id}.part",
+        ]
+        old = time.time() - 48 * 3600
+        for name in os.listdir(uploads_dir):
+            os.utime(os.path.join(uploads_dir, name), (old, old))
+        chunked_upload.purge_expired_uploads()
+        assert os.listdir(uploads_dir) == []
+
+
+@pytest.fixture
+def client():
+    server = Flask(__name__)
+    register_routes(server)
+    return server.test_client()
+
+
+class TestUploadRoutes:
+    def test_upload_round_trip(self, client):
+        created = client.post("/api/uploads", json={"filename": "a.csv", "size": 4})
+        assert created.status_code == 201
+        upload_id = created.get_json()["upload_id"]
+        sent = client.patch(
+            f"/api/uploads/{upload_id}", data=b"a\n1\n", headers={"Upload-Offset": "0"}
+        )
+        assert sent.status_code == 200
+        assert sent.get_json()["received"] == 4
+        assert client.get(f"/api/uploads/{upload_id}").get_json()["received"] == 4
+        assert client.delete(f"/api/uploads/{upload_id}").status_code == 204
+        assert client.get(f"/api/uploads/{upload_id}").status_code == 404
+
+    def test_offset_mismatch_returns_resume_point(self, client):
+        upload_id = client.post(
+            "/api/uploads", json={"filename": "a.csv", "size": 4}
+        ).get_json()["upload_id"]
+        response = client.patch(
+            f"/api/uploads/{upload_id}", data=b"1\n", headers={"Upload-Offset": "2"}
+        )
+        assert response.status_code == 409
+        assert response.get_json()["received"] == 0
+
+    def test_bad_requests(self, client, monkeypatch):
+        assert (
+            client.post("/api/uploads", json={"filename": "a.csv"}).status_code == 400
+        )
+        monkeypatch.setattr(chunked_upload, "MAX_CHUNKED_UPLOAD_MB", 1)
+        too_big = client.post("/api/uploads", json={"filename": "a", "size": 2 << 20})
+        assert too_big.status_code == 413
+        upload_id = client.post(
+            "/api/uploads", json={"filename": "a.csv", "size": 4}
+        ).get_json()["upload_id"]
+        assert client.patch(f"/api/uploads/{upload_id}", data=b"a").status_code == 400
+        assert (
+            client.patch(
+                "/api/uploads/nope", data=b"a", headers={"Upload-Offset": "0"}
+            ).status_code
+            == 404
+        )
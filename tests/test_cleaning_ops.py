@@ -9,7 +9,16 @@ import numpy as np
 import pandas as pd
 import pytest
 
-from pyexploratory.core.cleaning_ops import OPERATIONS, apply_operation
+from pyexploratory.core.cleaning_ops import (
+    OPERATIONS,
+    CleaningStep,
+    apply_operation,
+    can_stream,
+    column_label,
+    parse_columns,
+    recipe_description,
+    resolve_columns,
+)
 
 
 class TestApplyOperationDispatch:
@@ -136,6 +145,11 @@ class TestFillna:
         result = apply_operation(sample_df.copy(), "fillna", "age", fill_value="0")
         assert result["age"].notna().all()
 
+    def test_fillna_text_value_keeps_numeric_column_numeric(self, sample_df):
+        result = apply_operation(sample_df.copy(), "fillna", "age", fill_value="0")
+        assert pd.api.types.is_numeric_dtype(result["age"])
+        assert result["age"].iloc[2] == 0
+
     def test_fillna_default_numeric_uses_mean(self):
         df = pd.DataFrame({"val": [10.0, 20.0, None, 40.0]})
         result = apply_operation(df.copy(), "fillna", "val")
@@ -202,3 +216,176 @@ class TestRemoveOutliers:
         outlier_df = pd.DataFrame({"val": normal + [99999]})
         result = apply_operation(outlier_df, "remove_outliers", "val")
         assert pd.isna(result["val"].iloc[-1])
+
+
+class TestCategoricalColumns:
+    def test_fillna_with_new_category(self):
+        df = pd.DataFrame({"cat": pd.Categorical(["a", None, "b"])})
+        result = apply_operation(df, "fillna", "cat", fill_value="z")
+        assert list(result["cat"]) == ["a", "z", "b"]
+
+    @pytest.mark.parametrize(
+        "operation", ["lstrip", "rstrip", "alnum", "lowercase", "uppercase", "trim"]
+    )
+    def test_string_ops_same_values_as_text(self, operation):
+        values = [" A-b ", None, "a-B", " A-b ", "!"]
+        result = apply_operation(
+            pd.DataFrame({"s": pd.Categorical(values)}), operation, "s"
+        )
+        expected = apply_operation(pd.DataFrame({"s": values}), operation, "s")
+        assert isinstance(result["s"].dtype, pd.CategoricalDtype)
+        assert result["s"].astype(object).tolist() == expected["s"].tolist()
+
+    def test_colliding_categories_merged(self):
+        df = pd.DataFrame({"city": pd.Categorical(["NY", " ny", "LA", None, "ny "])})
+        result = apply_operation(
+            apply_operation(df, "trim", "city"), "lowercase", "city"
+        )
+        assert sorted(result["city"].cat.categories) == ["la", "ny"]
+        assert result["city"].tolist()[:3] == ["ny", "ny", "la"]
+        assert pd.isna(result["city"][3])
+
+    def test_unmerged_categories_keep_codes(self):
+        df = pd.DataFrame({"c": pd.Categorical(["b", "a", "b"], ordered=True)})
+        result = apply_operation(df, "uppercase", "c")
+        assert list(result["c"].cat.categories) == ["A", "B"]
+        assert result["c"].cat.ordered
+        assert (result["c"].cat.codes == df["c"].cat.codes).all()
+
+    def test_fillna_mode_from_category_counts(self):
+        df = pd.DataFrame({"c": pd.Categorical(["b", "a", None, "b"])})
+        assert apply_operation(df, "fillna", "c")["c"].tolist() == ["b", "a", "b", "b"]
+
+    def test_fillna_mode_ties_match_mode(self):
+        df = pd.DataFrame({"c": pd.Categorical(["b", "a", None], ["b", "a"])})
+        expected = df["c"].mode()[0]
+        assert apply_operation(df, "fillna", "c")["c"][2] == expected
+
+
+class TestCanStream:
+    def test_whole_column_operations_rejected(self):
+        assert can_stream("lowercase")
+        assert not can_stream("sort_asc")
+        assert not can_stream("fillna")
+        assert can_stream("fillna", fill_value="x")
+
+
+class TestRecipes:
+    STEPS = [
+        CleaningStep("fillna", "name", "unknown"),
+        CleaningStep("lowercase", "name"),
+        CleaningStep("rename_column", "city", new_name="town"),
+        CleaningStep("trim", "town"),
+        CleaningStep("dropna", "age"),
+    ]
+
+    def test_description(self):
+        assert recipe_description(self.STEPS[:1]) == "fillna on name"
+        assert recipe_description(self.STEPS[:2]).startswith("2 steps: fillna on")
+
+
+class TestColumnSets:
+    def test_resolve(self, sample_df):
+        assert resolve_columns(sample_df, "age") == ["age"]
+        assert resolve_columns(sample_df, ["city", "age", "city"]) == ["city", "age"]
+        assert resolve_columns(sample_df, "@numeric") == ["age", "salary"]
+        assert resolve_columns(sample_df, "@text") == ["name", "city"]
+        assert resolve_columns(sample_df, "@all") == list(sample_df.columns)
+
+    def test_resolve_errors(self, sample_df):
+        with pytest.raises(KeyError):
+            resolve_columns(sample_df, ["age", "missing"])
+        with pytest.raises(ValueError):
+            resolve_columns(sample_df, "@datetime")
+        with pytest.raises(ValueError):
+            resolve_columns(sample_df, [])
+
+    def test_column_named_like_selector(self):
+        df = pd.DataFrame({"@text": [1], "b": ["x"]})
+        assert resolve_columns(df, "@text") == ["@text"]
+
+    def test_parse_columns(self):
+        columns = ["a", "b", "x,y"]
+        assert parse_columns(" a ", columns) == "a"
+        assert parse_columns("a, b", columns) == ["a", "b"]
+        assert parse_columns("x,y", columns) == "x,y"
+        assert parse_columns("@text", columns) == "@text"
+
+    def test_column_label(self):
+        assert column_label("a") == "a"
+        assert column_label(["a", "b"]) == "a, b"
+        assert column_label("@text") == "all text columns"
+        assert CleaningStep("trim", "@text").description == "trim on all text columns"
+
+    @pytest.mark.parametrize(
+        "operation,fill_value",
+        [
+            ("lowercase", None),
+            ("alnum", None),
+            ("fillna", None),
+            ("fillna", "x"),
+            ("to_string", None),
+            ("to_numeric", None),
+            ("to_datetime", None),
+        ],
+    )
+    def test_same_as_one_column_at_a_time(self, sample_df, operation, fill_value):
+        columns = ["name", "city"]
+        expected = sample_df.copy()
+        for col in columns:
+            expected = apply_operation(expected, operation, col, fill_value)
+        result = apply_operation(sample_df.copy(), operation, columns, fill_value)
+        pd.testing.assert_frame_equal(result, expected)
+
+    @pytest.mark.parametrize("operation", ["normalize", "remove_outliers"])
+    def test_numeric_ops_same_as_one_at_a_time(self, operation):
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(
+            {"a": rng.normal(size=200), "b": rng.normal(size=200), "c": ["x"] * 200}
+        )
+        df.loc[[3, 7], "a"] = [50.0, np.nan]
+        df.loc[5, "b"] = -40.0
+        expected = df.copy()
+        for col in ["a", "b"]:
+            expected = apply_operation(expected, operation, col)
+        result = apply_operation(df.copy(), operation, "@numeric")
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_row_ops_use_columns_together(self, sample_df):
+        result = apply_operation(sample_df.copy(), "dropna", ["name", "age"])
+        assert len(result) == 3
+        result = apply_operation(sample_df.copy(), "drop_duplicates", ["name", "city"])
+        assert len(result) == 4
+        result = apply_operation(sample_df.copy(), "sort_asc", ["city", "salary"])
+        assert result["salary"].tolist() == [
+            60000.0,
+            80000.0,
+            50000.0,
+            50000.0,
+            70000.0,
+        ]
+
+    def test_drop_and_rename(self, sample_df):
+        result = apply_operation(sample_df.copy(), "drop_column", "@text")
+        assert list(result.columns) == ["age", "salary"]
+        with pytest.raises(ValueError):
+            apply_operation(
+                sample_df.copy(), "rename_column", ["name", "city"], None, "x"
+            )
+
+
+class TestArrowStringOps:
+    @pytest.mark.parametrize(
+        "operation", ["lstrip", "rstrip", "alnum", "lowercase", "uppercase", "trim"]
+    )
+    def test_object_text_cleaned_as_arrow_strings(self, operation):
+        df = pd.DataFrame({"s": pd.Series([" A-b ", None, "c"], dtype=object)})
+        result = apply_operation(df, operation, "s")
+        assert result["s"].dtype.storage == "pyarrow"
+        assert pd.isna(result["s"][1])
+
+    def test_mixed_object_column_keeps_str_semantics(self):
+        df = pd.DataFrame({"s": pd.Series(["A", 5, None], dtype=object)})
+        result = apply_operation(df, "lowercase", "s")
+        assert result["s"][0] == "a"
+        assert result["s"][1:].isna().all()
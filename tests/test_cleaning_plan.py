@@ -0,0 +1,320 @@
+"""
+Tests for pyexploratory.core.cleaning_plan.
+
+Every optimized plan must give the same result as applying its steps
+eagerly, one apply_operation call at a time.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyexploratory.core.cleaning_ops import CleaningStep, apply_operation
+from pyexploratory.core.cleaning_plan import CleaningPlan, FusedStringStep
+from pyexploratory.core.dtype_optimizer import ARROW_STRING_DTYPE
+
+
+def _chunks(df, size=2):
+    return [df.iloc[i : i + size] for i in range(0, len(df), size)]
+
+
+def _eager(df, steps):
+    for step in steps:
+        df = apply_operation(df, *step)
+    return df
+
+
+def _assert_same_as_eager(df, plan):
+    expected = _eager(df.copy(), plan.steps)
+    pd.testing.assert_frame_equal(plan.collect(df.copy()), expected)
+
+
+class TestLazy:
+    def test_then_only_records_steps(self):
+        plan = CleaningPlan().then("to_numeric", "age").then("sort_asc", "age")
+        assert plan.steps == (
+            CleaningStep("to_numeric", "age"),
+            CleaningStep("sort_asc", "age"),
+        )
+
+    def test_collect_matches_eager(self, sample_df):
+        plan = (
+            CleaningPlan()
+            .then("to_numeric", "age")
+            .then("fillna", "age")
+            .then("drop_column", "salary")
+            .then("sort_asc", "age")
+        )
+        _assert_same_as_eager(sample_df, plan)
+
+    def test_collect_rejects_empty_frame(self):
+        with pytest.raises(ValueError):
+            CleaningPlan().then("trim", "a").collect(pd.DataFrame({"a": []}))
+
+    def test_collect_unknown_column(self, sample_df):
+        with pytest.raises(KeyError):
+            CleaningPlan().then("trim", "missing").collect(sample_df)
+
+
+class TestPruneDropped:
+    def test_ops_on_dropped_column_removed(self):
+        plan = (
+            CleaningPlan()
+            .then("to_numeric", "salary")
+            .then("fillna", "salary")
+            .then("trim", "name")
+            .then("drop_column", "salary")
+        )
+        assert plan.optimized().steps == (
+            CleaningStep("trim", "name"),
+            CleaningStep("drop_column", "salary"),
+        )
+
+    def test_row_ops_on_dropped_column_kept(self, sample_df):
+        plan = (
+            CleaningPlan()
+            .then("fillna", "age", "0")
+            .then("dropna", "name")
+            .then("sort_desc", "age")
+            .then("drop_column", "age")
+        )
+        # sort_desc orders the rows, so age must still be filled before it
+        assert CleaningStep("fillna", "age", "0") in plan.optimized().steps
+        _assert_same_as_eager(sample_df, plan)
+
+    def test_followed_through_rename(self, sample_df):
+        plan = (
+            CleaningPlan()
+            .then("uppercase", "city")
+            .then("rename_column", "city", new_name="town")
+            .then("drop_column", "town")
+        )
+        assert plan.optimized().steps == plan.steps[1:]
+        _assert_same_as_eager(sample_df, plan)
+
+    def test_column_set_narrowed(self, sample_df):
+        plan = (
+            CleaningPlan()
+            .then("uppercase", ["name", "city"])
+            .then("drop_column", ["city", "salary"])
+        )
+        assert plan.optimized().steps[0] == CleaningStep("uppercase", ["name"])
+        _assert_same_as_eager(sample_df, plan)
+
+    def test_selector_left_in_place(self, sample_df):
+        plan = (
+            CleaningPlan()
+            .then("to_numeric", "salary")
+            .then("lowercase", "@text")
+            .then("drop_column", "salary")
+        )
+        assert plan.optimized().steps == plan.steps[1:]
+        columns, projected = plan.optimized().projection(list(sample_df.columns))
+        # The selector step might read salary, so it is still loaded
+        assert "salary" in columns
+        _assert_same_as_eager(sample_df, plan)
+
+
+class TestPushFilters:
+    def test_filter_moves_before_value_ops(self, sample_df):
+        plan = (
+            CleaningPlan()
+            .then("lowercase", "city")
+            .then("fillna", "name", "nobody")
+            .then("dropna", "age")
+        )
+        assert plan.optimized().steps[0] == CleaningStep("dropna", "age")
+        _assert_same_as_eager(sample_df, plan)
+
+    def test_filter_stays_after_ops_on_its_column(self, sample_df):
+        plan = CleaningPlan().then("fillna", "age", "0").then("dropna", "age")
+        assert plan.optimized().steps == plan.steps
+        _assert_same_as_eager(sample_df, plan)
+
+
+class TestCollapseSorts:
+    def test_repeated_sort_collapsed(self, sample_df):
+        plan = (
+            CleaningPlan()
+            .then("sort_asc", "salary")
+            .then("trim", "name")
+            .then("sort_desc", "salary")
+        )
+        assert plan.optimized().steps == plan.steps[1:]
+        _assert_same_as_eager(sample_df, plan)
+
+    def test_ties_keep_eager_order(self):
+        df = pd.DataFrame({"k": [2, 1, 2, 1, 2], "v": range(5)})
+        plan = CleaningPlan().then("sort_asc", "k").then("sort_desc", "k")
+        result = plan.collect(df.copy())
+        assert list(result["v"]) == [0, 2, 4, 1, 3]
+        _assert_same_as_eager(df, plan)
+
+    def test_sort_kept_when_column_changes_in_between(self, sample_df):
+        plan = (
+            CleaningPlan()
+            .then("sort_asc", "age")
+            .then("fillna", "age", "0")
+            .then("sort_asc", "age")
+        )
+        assert plan.optimized().steps == plan.steps
+
+    def test_sort_kept_before_drop_duplicates(self, sample_df):
+        plan = (
+            CleaningPlan()
+            .then("sort_desc", "age")
+            .then("drop_duplicates", "name")
+            .then("sort_asc", "age")
+        )
+        assert plan.optimized().steps == plan.steps
+        _assert_same_as_eager(sample_df, plan)
+
+
+class TestFuseStrings:
+    def test_string_ops_on_one_column_fused(self, sample_df):
+        plan = (
+            CleaningPlan()
+            .then("trim", "city")
+            .then("lowercase", "name")
+            .then("alnum", "city")
+            .then("uppercase", "city")
+        )
+        steps = plan.optimized().steps
+        assert steps == (
+            FusedStringStep("city", (plan.steps[0], plan.steps[2], plan.steps[3])),
+            plan.steps[1],
+        )
+        assert steps[0].description == "trim+alnum+uppercase on city"
+        _assert_same_as_eager(sample_df, plan)
+
+    def test_not_fused_across_other_use_of_column(self):
+        plan = (
+            CleaningPlan()
+            .then("trim", "city")
+            .then("fillna", "city", "x")
+            .then("lowercase", "city")
+        )
+        assert plan.optimized().steps == plan.steps
+
+    def test_column_lists_not_fused(self, sample_df):
+        plan = CleaningPlan().then("trim", ["city"]).then("lowercase", ["city"])
+        assert plan.optimized().steps == plan.steps
+        _assert_same_as_eager(sample_df, plan)
+
+    @pytest.mark.parametrize("dtype", [object, ARROW_STRING_DTYPE, "category"])
+    def test_dtypes_and_missing_values(self, dtype):
+        df = pd.DataFrame({"s": pd.Series([" A-b ", None, "xY!", " "], dtype=dtype)})
+        plan = (
+            CleaningPlan()
+            .then("lstrip", "s", " ")
+            .then("alnum", "s")
+            .then("rstrip", "s", "b")
+            .then("lowercase", "s")
+        )
+        _assert_same_as_eager(df, plan)
+
+    def test_object_non_strings_become_nan(self):
+        df = pd.DataFrame({"s": pd.Series(["A", 5, None, np.nan], dtype=object)})
+        plan = CleaningPlan().then("lowercase", "s").then("trim", "s")
+        _assert_same_as_eager(df, plan)
+
+    def test_non_text_column_rejected(self):
+        plan = CleaningPlan().then("lowercase", "n").then("trim", "n")
+        with pytest.raises(AttributeError):
+            plan.collect(pd.DataFrame({"n": [1, 2]}))
+
+
+class TestProjection:
+    def test_dropped_columns_not_read(self, sample_df):
+        plan = (
+            CleaningPlan()
+            .then("to_numeric", "salary")
+            .then("drop_column", "salary")
+            .then("drop_column", "city")
+            .then("trim", "name")
+        ).optimized()
+        columns, projected = plan.projection(list(sample_df.columns))
+        assert columns == ["name", "age"]
+        assert projected.steps == (CleaningStep("trim", "name"),)
+        expected = _eager(sample_df.copy(), plan.steps)
+        pd.testing.assert_frame_equal(projected.collect(sample_df[columns]), expected)
+
+    def test_keeps_one_column(self):
+        plan = CleaningPlan().then("drop_column", "a").then("drop_column", "b")
+        columns, projected = plan.projection(["a", "b"])
+        assert columns == ["a"]
+        assert projected.steps == (CleaningStep("drop_column", "a"),)
+
+
+class TestStream:
+    STEPS = (
+        CleaningStep("fillna", "name", "unknown"),
+        CleaningStep("lowercase", "name"),
+        CleaningStep("rename_column", "city", new_name="town"),
+        CleaningStep("trim", "town"),
+        CleaningStep("dropna", "age"),
+    )
+
+    @pytest.mark.parametrize(
+        "operation,column,fill_value",
+        [
+            ("lowercase", "name", None),
+            ("trim", "city", None),
+            ("fillna", "age", "0"),
+            ("dropna", "name", None),
+        ],
+    )
+    def test_single_step_matches_eager(self, sample_df, operation, column, fill_value):
+        plan = CleaningPlan().then(operation, column, fill_value)
+        streamed = pd.concat(plan.stream(_chunks(sample_df)))
+        expected = apply_operation(sample_df.copy(), operation, column, fill_value)
+        pd.testing.assert_frame_equal(streamed, expected)
+
+    def test_in_one_pass(self, sample_df):
+        chunks = _chunks(sample_df)
+        read = []
+
+        def source():
+            for chunk in chunks:
+                read.append(len(chunk))
+                yield chunk
+
+        streamed = CleaningPlan(self.STEPS).stream(source())
+        first = next(streamed)
+        # The first output chunk has been through every step already
+        assert read == [2]
+        assert "town" in first.columns
+        expected = _eager(sample_df.copy(), self.STEPS)
+        pd.testing.assert_frame_equal(pd.concat([first, *streamed]), expected)
+
+    def test_to_numeric_chunks_share_dtype(self, sample_df):
+        df = pd.DataFrame({"col": ["1", "2", "x", "4"]})
+        chunks = list(CleaningPlan().then("to_numeric", "col").stream(_chunks(df)))
+        assert [c["col"].dtype for c in chunks] == ["float64", "float64"]
+        plan = CleaningPlan().then("to_numeric", ["age", "salary"])
+        streamed = pd.concat(plan.stream(_chunks(sample_df)))
+        assert (streamed.dtypes[["age", "salary"]] == "float64").all()
+
+    def test_matches_collect(self, sample_df):
+        plan = (
+            CleaningPlan()
+            .then("trim", "city")
+            .then("lowercase", "city")
+            .then("to_numeric", "salary")
+            .then("drop_column", "salary")
+            .then("dropna", "name")
+        )
+        streamed = pd.concat(plan.stream(_chunks(sample_df)))
+        pd.testing.assert_frame_equal(streamed, plan.collect(sample_df.copy()))
+
+    def test_emptied_chunk_passes_through(self):
+        df = pd.DataFrame({"a": [None, None, "x"], "b": [" p ", " q ", " r "]})
+        plan = CleaningPlan().then("trim", "b").then("dropna", "a")
+        chunks = list(plan.stream(_chunks(df)))
+        assert [len(chunk) for chunk in chunks] == [0, 1]
+        assert chunks[1]["b"].tolist() == ["r"]
+
+    def test_rejects_whole_column_step(self, sample_df):
+        plan = CleaningPlan().then("sort_asc", "age")
+        with pytest.raises(ValueError):
+            plan.stream(_chunks(sample_df))
@@ -0,0 +1,75 @@
+"""
+Tests for pyexploratory.core.column_executor.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from pyexploratory.core import column_executor
+from pyexploratory.core.cleaning_ops import apply_operation
+from pyexploratory.core.column_executor import map_columns, shutdown_pools
+from pyexploratory.core.dtype_optimizer import ARROW_STRING_DTYPE
+
+
+def _upper(series):
+    return series.str.upper()
+
+
+def _frame(dtype):
+    return pd.DataFrame(
+        {
+            "a": pd.Series(["x-1", "Y 2", None], dtype=dtype),
+            "b": pd.Series(["2024-01-02", "bad", None], dtype=dtype),
+            "c": pd.Series([" p ", "q", "r"], dtype=dtype),
+        }
+    )
+
+
+@pytest.fixture(scope="module", autouse=True)
+def pools():
+    # Shared by the tests, as by operations: workers start once
+    yield
+    shutdown_pools()
+
+
+@pytest.fixture
+def parallel(monkeypatch):
+    monkeypatch.setattr(column_executor, "CLEANING_WORKERS", 2)
+    monkeypatch.setattr(column_executor, "PARALLEL_CLEANING_MIN_ROWS", 1)
+
+
+class TestSerial:
+    def test_small_frame_runs_in_process(self, monkeypatch):
+        monkeypatch.setattr(column_executor, "_pool_for", None)
+        df = map_columns(_frame(ARROW_STRING_DTYPE), ["a", "c"], _upper)
+        assert df["c"].tolist() == [" P ", "Q", "R"]
+
+    def test_single_column_runs_in_process(self, parallel, monkeypatch):
+        monkeypatch.setattr(column_executor, "_pool_for", None)
+        assert (
+            map_columns(_frame(ARROW_STRING_DTYPE), ["c"], _upper)["c"].tolist()[1]
+            == "Q"
+        )
+
+
+class TestParallel:
+    @pytest.mark.parametrize("dtype", [ARROW_STRING_DTYPE, object])
+    @pytest.mark.parametrize("operation", ["alnum", "lowercase", "trim", "to_numeric"])
+    def test_same_as_serial(self, parallel, monkeypatch, dtype, operation):
+        result = apply_operation(_frame(dtype), operation, ["a", "b", "c"])
+        monkeypatch.setattr(column_executor, "CLEANING_WORKERS", 1)
+        expected = apply_operation(_frame(dtype), operation, ["a", "b", "c"])
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_pool_by_dtype(self, parallel):
+        frame = _frame(object)
+        assert isinstance(column_executor._pool_for(frame["a"]), ProcessPoolExecutor)
+        frame = _frame(ARROW_STRING_DTYPE)
+        assert isinstance(column_executor._pool_for(frame["a"]), ThreadPoolExecutor)
+
+    def test_error_raised(self, parallel):
+        df = pd.DataFrame({"a": ["x"], "n": [1]})
+        with pytest.raises(AttributeError):
+            map_columns(df, ["a", "n"], _upper)
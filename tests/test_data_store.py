@@ -0,0 +1,349 @@
+"""
+Tests for pyexploratory.core.data_store — columnar persistence and caching.
+
+Uses the tmp_data_file fixture to redirect DATA_FILE to a temp Parquet file.
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyexploratory.core import data_store
+from pyexploratory.core.catalog import CatalogBuilder, build_catalog
+from pyexploratory.core.dataset_cache import DatasetCache
+from pyexploratory.core.dtype_optimizer import ARROW_STRING_DTYPE
+
+
+class TestRoundTrip:
+    def test_read_returns_written_data(self, tmp_data_file, sample_df):
+        df = data_store.read_data()
+        pd.testing.assert_frame_equal(df, sample_df)
+
+    def test_dtypes_preserved_exactly(self, tmp_data_file):
+        df = pd.DataFrame(
+            {
+                "when": pd.to_datetime(["2024-01-01", "2024-06-15"]),
+                "small": pd.Series([1, 2], dtype="int8"),
+                "cat": pd.Categorical(["a", "b"]),
+                "flag": [True, False],
+            }
+        )
+        data_store.write_data(df)
+        result = data_store.read_data()
+        assert result.dtypes.to_dict() == df.dtypes.to_dict()
+
+    def test_write_invalidates_cache(self, tmp_data_file):
+        data_store.read_data()
+        data_store.write_data(pd.DataFrame({"x": [1, 2, 3]}))
+        assert list(data_store.read_data().columns) == ["x"]
+
+    def test_mixed_object_column_stored_as_text(self, tmp_data_file):
+        df = pd.DataFrame({"mixed": [1, "two", None]})
+        data_store.write_data(df)
+        result = data_store.read_data()
+        assert list(result["mixed"][:2]) == ["1", "two"]
+        assert pd.isna(result["mixed"].iloc[2])
+
+    def test_non_string_column_names(self, tmp_data_file):
+        data_store.write_data(pd.DataFrame({0: [1], 1: [2]}))
+        assert list(data_store.read_data().columns) == ["0", "1"]
+
+    def test_missing_file_raises(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(data_store, "DATA_FILE", str(tmp_path / "none.parquet"))
+        data_store.invalidate_cache()
+        with pytest.raises(FileNotFoundError):
+            data_store.read_data()
+
+
+class TestExport:
+    def test_export_csv(self, tmp_data_file, sample_df, tmp_path):
+        out = tmp_path / "export.csv"
+        data_store.export_csv(out)
+        assert list(pd.read_csv(out).columns) == list(sample_df.columns)
+
+    @pytest.mark.parametrize(
+        "export,read",
+        [
+            (data_store.export_parquet, pd.read_parquet),
+            (data_store.export_feather, pd.read_feather),
+        ],
+    )
+    def test_export_columnar_round_trips(self, tmp_data_file, sample_df, export, read):
+        buf = io.BytesIO()
+        export(buf)
+        buf.seek(0)
+        pd.testing.assert_frame_equal(read(buf), data_store.read_data())
+
+    def test_export_feather_to_path(self, tmp_data_file, sample_df, tmp_path):
+        out = tmp_path / "export.feather"
+        data_store.export_feather(out)
+        assert len(pd.read_feather(out)) == len(sample_df)
+
+    def test_export_xlsx_streams_rows(self, tmp_data_file, sample_df):
+        buf = io.BytesIO()
+        data_store.export_xlsx(buf)
+        buf.seek(0)
+        result = pd.read_excel(buf)
+        assert list(result.columns) == list(sample_df.columns)
+        assert len(result) == len(sample_df)
+        assert pd.isna(result["age"].iloc[2])
+
+    def test_export_xlsx_rejects_too_many_rows(self, tmp_data_file, monkeypatch):
+        monkeypatch.setattr(data_store, "EXCEL_MAX_ROWS", 3)
+        with pytest.raises(ValueError, match="CSV or Parquet"):
+            data_store.export_xlsx(io.BytesIO())
+
+
+class TestCopyOnWrite:
+    def test_reads_share_buffers(self, tmp_data_file):
+        a = data_store.read_data()
+        b = data_store.read_data()
+        assert a is not b
+        assert np.shares_memory(a["salary"].to_numpy(), b["salary"].to_numpy())
+
+    def test_mutation_does_not_leak_into_cache(self, tmp_data_file):
+        df = data_store.read_data()
+        df["salary"] = 0.0
+        df.loc[0, "age"] = -1
+        df.drop(columns=["city"], inplace=True)
+        fresh = data_store.read_data()
+        assert fresh["salary"].iloc[0] == 50000.0
+        assert fresh["age"].iloc[0] == 25
+        assert "city" in fresh.columns
+
+
+class TestColumnProjection:
+    def test_reads_only_requested_columns(self, tmp_data_file):
+        df = data_store.read_data(columns=["age", "city"])
+        assert list(df.columns) == ["age", "city"]
+        cached = data_store._frames.cached_columns(data_store.dataset_version())
+        assert set(cached) == {"age", "city"}
+
+    def test_duplicate_columns_ignored(self, tmp_data_file):
+        df = data_store.read_data(columns=["age", "age"])
+        assert list(df.columns) == ["age"]
+
+    def test_projection_reuses_cached_columns(self, tmp_data_file):
+        first = data_store.read_data(columns=["salary"])
+        full = data_store.read_data()
+        assert list(full.columns) == ["name", "age", "salary", "city"]
+        assert np.shares_memory(first["salary"].to_numpy(), full["salary"].to_numpy())
+
+    def test_unknown_column_raises(self, tmp_data_file):
+        with pytest.raises(KeyError):
+            data_store.read_data(columns=["nope"])
+
+    def test_list_columns_reads_no_rows(self, tmp_data_file):
+        assert data_store.list_columns() == ["name", "age", "salary", "city"]
+        assert data_store.cache_stats().entries == 0
+
+
+class TestCatalog:
+    def test_catalog_written_with_data(self, tmp_data_file):
+        data_store.write_data(
+            pd.DataFrame({"n": [1.0, None, 3.0], "s": ["a", "b", "a"]})
+        )
+        catalog = data_store.get_catalog()
+        assert catalog.rows == 3
+        assert catalog.columns["n"].numeric
+        assert catalog.columns["n"].nulls == 1
+        assert (catalog.columns["n"].min, catalog.columns["n"].max) == (1.0, 3.0)
+        assert catalog.columns["s"].categorical
+        assert catalog.columns["s"].distinct == 2
+        assert catalog.columns["s"].memory > 0
+
+    def test_catalog_reads_no_rows(self, tmp_data_file):
+        data_store.write_data(pd.DataFrame({"x": [1, 2]}))
+        data_store.get_catalog()
+        assert data_store.cache_stats().entries == 0
+
+    def test_catalog_built_for_foreign_files(self, tmp_data_file):
+        # tmp_data_file is written by pandas directly, without a catalog
+        assert data_store.get_catalog().columns["age"].nulls == 1
+
+    def test_dropdown_options_from_catalog(self, tmp_data_file):
+        numeric = [o["value"] for o in data_store.numeric_column_options()]
+        categorical = [o["value"] for o in data_store.categorical_column_options()]
+        assert numeric == ["age", "salary"]
+        assert categorical == ["name", "city"]
+
+    def test_source_memory_recorded(self, tmp_data_file):
+        data_store.write_data(pd.DataFrame({"x": [1, 2]}), source_memory=4096)
+        assert data_store.get_catalog().source_memory == 4096
+
+
+class TestDatasetVersion:
+    def test_same_content_same_version(self, tmp_data_file):
+        df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", None]})
+        data_store.write_data(df)
+        first = data_store.dataset_version()
+        data_store.write_data(pd.DataFrame({"a": [0]}))
+        assert data_store.dataset_version() != first
+        data_store.write_data(df.copy())
+        assert data_store.dataset_version() == first
+
+    def test_version_for_foreign_files(self, tmp_data_file):
+        assert len(data_store.dataset_version()) == 32
+
+
+class TestVersionCache:
+    def test_repeated_reads_hit(self, tmp_data_file):
+        data_store.read_data()
+        data_store.read_data()
+        stats = data_store.cache_stats()
+        assert (stats.hits, stats.misses) == (1, 1)
+
+    def test_previous_version_stays_cached(self, tmp_data_file):
+        original = data_store.read_data()
+        data_store.write_data(pd.DataFrame({"z": [1]}))
+        data_store.read_data()
+        data_store.write_data(original)
+        data_store.read_data()
+        stats = data_store.cache_stats()
+        assert stats.entries == 2
+        assert stats.misses == 2
+
+
+class TestDatasetCache:
+    @staticmethod
+    def _loader(missing):
+        return pd.DataFrame({c: np.zeros(1000) for c in missing})
+
+    def test_lru_eviction_over_budget(self):
+        cache = DatasetCache(budget_bytes=20_000)
+        cache.get_columns("v1", ["a"], self._loader)
+        cache.get_columns("v2", ["a"], self._loader)
+        cache.get_columns("v1", ["a"], self._loader)  # v1 is now most recent
+        cache.get_columns("v3", ["a"], self._loader)
+        stats = cache.stats()
+        assert stats.evictions == 1
+        assert cache.cached_columns("v2") == []
+        assert cache.cached_columns("v1") == ["a"]
+        assert stats.bytes <= stats.budget
+
+    def test_single_entry_over_budget_kept(self):
+        cache = DatasetCache(budget_bytes=10)
+        result = cache.get_columns("v1", ["a"], self._loader)
+        assert len(result["a"]) == 1000
+        assert cache.stats().entries == 1
+
+    def test_only_missing_columns_loaded(self):
+        requested = []
+
+        def loader(missing):
+            requested.append(list(missing))
+            return self._loader(missing)
+
+        cache = DatasetCache(budget_bytes=10**6)
+        cache.get_columns("v1", ["a"], loader)
+        cache.get_columns("v1", ["a", "b"], loader)
+        assert requested == [["a"], ["b"]]
+
+
+class TestChunkedMode:
+    @staticmethod
+    def _chunks(df, size):
+        return [
+            df.iloc[i : i + size].reset_index(drop=True)
+            for i in range(0, len(df), size)
+        ]
+
+    def test_chunks_round_trip(self, tmp_data_file, sample_df):
+        data_store.write_data_chunks(self._chunks(sample_df, 2))
+        parts = list(data_store.iter_chunks(chunk_rows=2))
+        assert [len(p) for p in parts] == [2, 2, 1]
+        pd.testing.assert_frame_equal(pd.concat(parts, ignore_index=True), sample_df)
+
+    def test_chunked_write_matches_single_write(self, tmp_data_file, sample_df):
+        data_store.write_data(sample_df)
+        version, catalog = data_store.dataset_version(), data_store.get_catalog()
+        data_store.write_data_chunks(self._chunks(sample_df, 2))
+        assert data_store.dataset_version() == version
+        chunked = data_store.get_catalog()
+        assert chunked.rows == catalog.rows
+        for col, info in catalog.columns.items():
+            assert chunked.columns[col]._replace(memory=0) == info._replace(memory=0)
+
+    def test_iter_chunks_projection_keeps_dtypes(self, tmp_data_file):
+        df = pd.DataFrame({"cat": pd.Categorical(["a", "b", "a"]), "x": [1, 2, 3]})
+        data_store.write_data(df)
+        (chunk,) = data_store.iter_chunks(columns=["cat"])
+        assert list(chunk.columns) == ["cat"]
+        assert isinstance(chunk["cat"].dtype, pd.CategoricalDtype)
+
+    def test_schema_mismatch_keeps_previous_file(self, tmp_data_file, sample_df):
+        chunks = [pd.DataFrame({"x": [1, 2]}), pd.DataFrame({"x": ["a", "b"]})]
+        with pytest.raises(ValueError, match="schema"):
+            data_store.write_data_chunks(chunks)
+        pd.testing.assert_frame_equal(data_store.read_data(), sample_df)
+
+    def test_uncastable_chunk_rejected(self, tmp_data_file, sample_df):
+        # The first chunk's all-missing text column gets Arrow's null type
+        chunks = [
+            pd.DataFrame({"x": pd.Series([None, None], dtype=object)}),
+            pd.DataFrame({"x": pd.Series(["a", "b"], dtype=ARROW_STRING_DTYPE)}),
+        ]
+        with pytest.raises(ValueError, match="schema"):
+            data_store.write_data_chunks(chunks)
+        pd.testing.assert_frame_equal(data_store.read_data(), sample_df)
+
+    def test_empty_stream_rejected(self, tmp_data_file):
+        with pytest.raises(ValueError):
+            data_store.write_data_chunks([])
+
+    def test_transform_chunks(self, tmp_data_file, monkeypatch):
+        monkeypatch.setattr(data_store, "CHUNK_ROWS", 2)
+        data_store.transform_chunks(
+            lambda chunks: (c.assign(age=c["age"] * 2) for c in chunks)
+        )
+        assert data_store.read_data()["age"].tolist()[:2] == [50.0, 60.0]
+
+    def test_transform_chunks_reads_only_columns(self, tmp_data_file, monkeypatch):
+        monkeypatch.setattr(data_store, "CHUNK_ROWS", 2)
+        seen = []
+
+        def transform(chunks):
+            for chunk in chunks:
+                seen.append(list(chunk.columns))
+                yield chunk
+
+        data_store.transform_chunks(transform, columns=["name", "age"])
+        assert seen[0] == ["name", "age"]
+        assert data_store.list_columns() == ["name", "age"]
+
+    def test_chunked_mode_threshold(self, tmp_data_file, monkeypatch):
+        assert not data_store.is_chunked_mode()
+        monkeypatch.setattr(data_store, "CHUNKED_MODE_THRESHOLD_MB", 0)
+        assert data_store.is_chunked_mode()
+
+    def test_export_streams_all_rows(
+        self, tmp_data_file, sample_df, monkeypatch, tmp_path
+    ):
+        monkeypatch.setattr(data_store, "CHUNK_ROWS", 2)
+        buf = io.StringIO()
+        data_store.export_csv(buf)
+        buf.seek(0)
+        assert len(pd.read_csv(buf)) == len(sample_df)
+        data_store.export_csv(tmp_path / "export.csv")
+        assert len(pd.read_csv(tmp_path / "export.csv")) == len(sample_df)
+
+
+class TestCatalogBuilder:
+    def test_distinct_exact_below_sketch_size(self):
+        df = pd.DataFrame({"x": np.arange(1000) % 37})
+        assert build_catalog(df).columns["x"].distinct == 37
+
+    def test_distinct_estimated_above_sketch_size(self):
+        df = pd.DataFrame({"x": np.arange(100_000)})
+        estimate = build_catalog(df).columns["x"].distinct
+        assert 80_000 < estimate < 120_000
+
+    def test_min_max_merged_across_chunks(self):
+        builder = CatalogBuilder()
+        builder.add(pd.DataFrame({"x": [5.0, None]})).add(
+            pd.DataFrame({"x": [-1.0, 3.0]})
+        )
+        info = builder.result().columns["x"]
+        assert (info.min, info.max, info.nulls) == (-1.0, 5.0, 1)
@@ -0,0 +1,86 @@
+"""
+Tests for pyexploratory.core.datasets — the uploaded dataset registry.
+"""
+
+import pandas as pd
+import pytest
+
+from pyexploratory.core import data_store, datasets
+
+
+@pytest.fixture
+def registry(tmp_data_file, tmp_path, monkeypatch):
+    """Point the registry at a temp dir and DATA_FILE at the temp data file."""
+    monkeypatch.setattr(datasets, "DATASETS_DIR", str(tmp_path))
+    monkeypatch.setattr(datasets, "DATA_FILE", tmp_data_file)
+    return tmp_path
+
+
+def _store(name, df):
+    data_store.write_file(df, datasets.dataset_path(name))
+
+
+class TestNames:
+    def test_dataset_name_from_filename(self):
+        assert datasets.dataset_name("sales 2024/Jan.csv") == "Jan"
+        assert datasets.dataset_name("my report (v2).xlsx") == "my_report_v2"
+        assert datasets.dataset_name("sales.csv.gz") == "sales"
+        assert datasets.dataset_name("book.xlsx", "Q1 totals") == "book_Q1_totals"
+
+    def test_list_datasets(self, registry):
+        _store("b", pd.DataFrame({"x": [1]}))
+        _store("a", pd.DataFrame({"x": [2]}))
+        assert datasets.list_datasets() == ["a", "b"]
+
+
+class TestActivate:
+    def test_activate_loads_dataset(self, registry):
+        _store("jan", pd.DataFrame({"x": [1, 2]}))
+        datasets.activate_dataset("jan")
+        assert datasets.active_dataset() == "jan"
+        assert data_store.read_data()["x"].tolist() == [1, 2]
+
+    def test_switch_keeps_changes_of_previous(self, registry):
+        _store("jan", pd.DataFrame({"x": [1, 2]}))
+        _store("feb", pd.DataFrame({"x": [3]}))
+        datasets.activate_dataset("jan")
+        data_store.write_data(pd.DataFrame({"x": [10, 20]}))
+        datasets.activate_dataset("feb")
+        datasets.activate_dataset("jan")
+        assert data_store.read_data()["x"].tolist() == [10, 20]
+
+    def test_unknown_dataset(self, registry):
+        with pytest.raises(KeyError):
+            datasets.activate_dataset("missing")
+
+
+class TestConcat:
+    def test_columns_aligned_and_widened(self, registry, tmp_path):
+        _store("jan", pd.DataFrame({"x": [1, 2], "city": ["a", "b"]}))
+        _store("feb", pd.DataFrame({"x": [1.5], "extra": [True]}))
+        dest = str(tmp_path / "all.parquet")
+        datasets.concat_files(
+            [datasets.dataset_path("jan"), datasets.dataset_path("feb")], dest
+        )
+        result = pd.read_parquet(dest)
+        assert list(result.columns) == ["x", "city", "extra"]
+        assert result["x"].tolist() == [1.0, 2.0, 1.5]
+        assert result["city"].isna().tolist() == [False, False, True]
+
+    def test_categorical_and_text_combine(self, registry, tmp_path):
+        _store("jan", pd.DataFrame({"c": pd.Categorical(["a", "b"])}))
+        _store("feb", pd.DataFrame({"c": ["z"]}))
+        dest = str(tmp_path / "all.parquet")
+        datasets.concat_files(
+            [datasets.dataset_path("jan"), datasets.dataset_path("feb")], dest
+        )
+        assert pd.read_parquet(dest)["c"].astype(str).tolist() == ["a", "b", "z"]
+
+    def test_incompatible_types(self, registry, tmp_path):
+        _store("jan", pd.DataFrame({"x": [1]}))
+        _store("feb", pd.DataFrame({"x": pd.to_datetime(["2024-01-01"])}))
+        with pytest.raises(ValueError, match="incompatible"):
+            datasets.concat_files(
+                [datasets.dataset_path("jan"), datasets.dataset_path("feb")],
+                str(tmp_path / "all.parquet"),
+            )
@@ -0,0 +1,81 @@
+"""
+Tests for pyexploratory.core.dtype_optimizer.
+"""
+
+import numpy as np
+import pandas as pd
+
+from pyexploratory.core.dtype_optimizer import (
+    ARROW_STRING_DTYPE,
+    as_arrow_strings,
+    optimize_dtypes,
+    to_arrow_strings,
+)
+
+
+class TestOptimizeDtypes:
+    def test_integers_downcast(self):
+        df = pd.DataFrame({"small": [1, 2, 3], "big": [1, 2, 10**12]})
+        result, report = optimize_dtypes(df)
+        assert result["small"].dtype == np.int8
+        assert result["big"].dtype == np.int64
+        assert "big" not in report.converted
+
+    def test_floats_downcast_only_when_lossless(self):
+        df = pd.DataFrame({"exact": [0.5, 1.25, None], "precise": [0.1, 0.2, 0.3]})
+        result, _ = optimize_dtypes(df)
+        assert result["exact"].dtype == np.float32
+        assert result["precise"].dtype == np.float64
+
+    def test_low_cardinality_text_becomes_category(self, iris_df):
+        result, report = optimize_dtypes(iris_df)
+        assert result["Species"].dtype.name == "category"
+        assert report.memory_after < report.memory_before
+        assert report.saved_pct > 0
+
+    def test_high_cardinality_text_unchanged(self):
+        df = pd.DataFrame({"id": ["a", "b", "c", "d"]})
+        result, report = optimize_dtypes(df)
+        assert result["id"].dtype == df["id"].dtype
+        assert report.converted == {}
+
+    def test_values_unchanged(self, sample_df):
+        result, _ = optimize_dtypes(sample_df)
+        pd.testing.assert_frame_equal(
+            result.astype(object), sample_df.astype(object), check_dtype=False
+        )
+
+    def test_input_not_modified(self, sample_df):
+        before = sample_df.dtypes.copy()
+        optimize_dtypes(sample_df)
+        pd.testing.assert_series_equal(sample_df.dtypes, before)
+
+
+class TestArrowStrings:
+    def test_object_text_converted(self):
+        series = pd.Series(["a", None, "c"] * 1000, dtype=object)
+        result = as_arrow_strings(series)
+        assert result.dtype == ARROW_STRING_DTYPE
+        assert result.dtype.storage == "pyarrow"
+        assert result.isna().tolist()[:3] == [False, True, False]
+        assert result.memory_usage(deep=True) < series.memory_usage(deep=True)
+
+    def test_mixed_and_empty_object_kept(self):
+        mixed = pd.Series(["a", 1], dtype=object)
+        empty = pd.Series([None, None], dtype=object)
+        assert as_arrow_strings(mixed) is mixed
+        assert as_arrow_strings(empty) is empty
+
+    def test_python_strings_keep_missing_marker(self):
+        series = pd.Series(["a", None], dtype="string[python]")
+        result = as_arrow_strings(series)
+        assert result.dtype.storage == "pyarrow"
+        assert result[1] is pd.NA
+
+    def test_frame_converted_without_touching_input(self):
+        df = pd.DataFrame({"s": pd.Series(["x", "y"], dtype=object), "n": [1, 2]})
+        result = to_arrow_strings(df)
+        assert result["s"].dtype == ARROW_STRING_DTYPE
+        assert result["n"].dtype == np.int64
+        assert df["s"].dtype == object
+        assert to_arrow_strings(result) is result
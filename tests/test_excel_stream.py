@@ -0,0 +1,80 @@
+"""
+Tests for pyexploratory.core.excel_stream — streaming workbook reads.
+"""
+
+import datetime
+import io
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from pyexploratory.core import excel_stream
+from pyexploratory.core.excel_stream import ExcelOptions, list_sheets, read_excel
+
+
+def _workbook(*sheets) -> bytes:
+    """Build an .xlsx from (title, rows) pairs."""
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for title, rows in sheets:
+        sheet = workbook.create_sheet(title)
+        for row in rows:
+            sheet.append(row)
+    out = io.BytesIO()
+    workbook.save(out)
+    return out.getvalue()
+
+
+ROWS = [
+    ["n", "x", "n", None, "when", "text"],
+    [1, 2.0, 3, "a", datetime.datetime(2024, 1, 1), "p"],
+    [None] * 6,
+    [4, 2.5, 6, 7, datetime.datetime(2024, 1, 2), None],
+    [8, None, 9, "b", None, "q"],
+    [None] * 6,
+]
+BOOK = _workbook(("Data", ROWS), ("Other", [["k"], [1], [2]]))
+
+
+class TestReadExcel:
+    def test_matches_pandas(self):
+        pd.testing.assert_frame_equal(
+            read_excel(io.BytesIO(BOOK)), pd.read_excel(io.BytesIO(BOOK))
+        )
+
+    def test_batches_share_dtypes(self, monkeypatch):
+        monkeypatch.setattr(excel_stream, "EXCEL_BATCH_ROWS", 1)
+        pd.testing.assert_frame_equal(
+            read_excel(io.BytesIO(BOOK)), pd.read_excel(io.BytesIO(BOOK))
+        )
+
+    def test_sheet_selection(self):
+        df = read_excel(io.BytesIO(BOOK), ExcelOptions(sheet="Other"))
+        assert df["k"].tolist() == [1, 2]
+        with pytest.raises(KeyError):
+            read_excel(io.BytesIO(BOOK), ExcelOptions(sheet="Missing"))
+
+    def test_row_limit(self):
+        df = read_excel(io.BytesIO(BOOK), ExcelOptions(nrows=1))
+        assert len(df) == 1
+        assert df["n"].tolist() == [1]
+
+    def test_column_subset_in_sheet_order(self):
+        df = read_excel(io.BytesIO(BOOK), ExcelOptions(usecols=("text", "x")))
+        assert list(df.columns) == ["x", "text"]
+        assert len(df) == 4
+
+    def test_unknown_column_rejected(self):
+        with pytest.raises(ValueError, match="nope"):
+            read_excel(io.BytesIO(BOOK), ExcelOptions(usecols=("nope",)))
+
+    def test_header_only_sheet(self):
+        df = read_excel(io.BytesIO(_workbook(("S", [["a", "b"]]))))
+        assert list(df.columns) == ["a", "b"]
+        assert df.empty
+
+
+class TestListSheets:
+    def test_sheet_names_in_order(self):
+        assert list_sheets(io.BytesIO(BOOK)) == ["Data", "Other"]
@@ -3,12 +3,31 @@ Tests for pyexploratory.core.file_parser.
 """
 
 import base64
+import bz2
+import codecs
+import gzip
+import io
 import json
+import tracemalloc
+import zipfile
 
 import pandas as pd
+import pyarrow as pa
 import pytest
 
-from pyexploratory.core.file_parser import parse_upload
+from pyexploratory.core import arrow_csv, file_parser
+from pyexploratory.core.data_store import write_chunks
+from pyexploratory.core.dtype_optimizer import to_arrow_strings
+from pyexploratory.core.file_parser import (
+    decode_upload,
+    iter_csv_chunks,
+    open_upload,
+    parse_upload,
+    parse_upload_chunks,
+    parse_upload_with_stats,
+    sniff_encoding,
+    upload_chunks,
+)
 
 
 def _encode(content: bytes, content_type: str = "text/csv") -> str:
@@ -56,3 +75,264 @@ class TestUnsupportedFormat:
     def test_pdf_returns_none(self):
         result = parse_upload(_encode(b"%PDF-fake"), "doc.pdf")
         assert result is None
+
+
+class TestCsvChunks:
+    def test_chunks_share_widest_dtypes(self):
+        csv_bytes = b"a,b,c\n1,x,1\n2,y,2\n3,z,\n4.5,1,3"
+        chunks = list(iter_csv_chunks(io.BytesIO(csv_bytes), chunk_rows=2))
+        assert len(chunks) == 2
+        for chunk in chunks:
+            assert chunk["a"].dtype == "float64"
+            assert chunk["c"].dtype == "float64"
+            assert pd.api.types.is_string_dtype(chunk["b"])
+        assert pd.concat(chunks)["b"].tolist() == ["x", "y", "z", "1"]
+
+    def test_latin1_fallback(self):
+        csv_bytes = "name\nJos\u00e9\n".encode("latin-1")
+        (chunk,) = iter_csv_chunks(io.BytesIO(csv_bytes))
+        assert chunk["name"].iloc[0] == "Jos\u00e9"
+
+    def test_text_column_empty_in_first_chunk(self, tmp_path):
+        rows = [f"{i}," for i in range(2000)] + [f"{i},x{i}" for i in range(2000)]
+        upload = open_upload(_encode("\n".join(["a,b"] + rows).encode()), "d.csv")
+        streamed = upload_chunks(upload, chunk_rows=1000)
+        assert streamed.schema.field("b").type == pa.large_string()
+        path = str(tmp_path / "d.parquet")
+        chunks = map(to_arrow_strings, streamed.chunks)
+        write_chunks(chunks, path, schema=streamed.schema)
+        df = pd.read_parquet(path)
+        assert len(df) == 4000
+        assert df["b"].isna().sum() == 2000
+        assert df["b"].iloc[-1] == "x1999"
+
+    def test_csv_streams_but_excel_does_not(self):
+        assert parse_upload_chunks(_encode(b"x"), "data.xlsx") is None
+        chunks = parse_upload_chunks(_encode(b"a\n1\n2\n3"), "d.csv", chunk_rows=2)
+        assert [len(c) for c in chunks] == [2, 1]
+
+
+class TestStreamingDecode:
+    def test_decode_across_blocks(self, monkeypatch):
+        monkeypatch.setattr(file_parser, "DECODE_BLOCK_CHARS", 8)
+        payload = bytes(range(256)) * 3
+        assert decode_upload(_encode(payload)).getvalue() == payload
+
+    def test_decode_peak_memory_near_file_size(self):
+        payload = b"x" * (8 * 1024 * 1024)
+        contents = _encode(payload)
+        tracemalloc.start()
+        buffer = decode_upload(contents)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert len(buffer.getvalue()) == len(payload)
+        assert peak < 1.5 * len(payload)
+
+    @pytest.mark.parametrize(
+        "prefix,expected",
+        [
+            (b"a,b\n1,2", "utf-8"),
+            ("caf\u00e9".encode("utf-8"), "utf-8"),
+            ("caf\u00e9".encode("latin-1"), "latin-1"),
+            (codecs.BOM_UTF8 + b"a", "utf-8-sig"),
+            ("a,b".encode("utf-16"), "utf-16"),
+        ],
+    )
+    def test_sniff_encoding(self, prefix, expected):
+        assert sniff_encoding(io.BytesIO(prefix)) == expected
+
+    def test_sniff_tolerates_split_character(self, monkeypatch):
+        monkeypatch.setattr(file_parser, "SNIFF_BYTES", 4)
+        # The 4-byte prefix ends inside the two-byte "\u00e9"
+        assert sniff_encoding(io.BytesIO("caf\u00e9".encode("utf-8"))) == "utf-8"
+
+    def test_late_latin1_byte_falls_back(self, monkeypatch):
+        monkeypatch.setattr(file_parser, "SNIFF_BYTES", 8)
+        csv_bytes = "name\nplain\nJos\u00e9\n".encode("latin-1")
+        result = parse_upload(_encode(csv_bytes), "late.csv")
+        assert result["name"].tolist() == ["plain", "Jos\u00e9"]
+
+    def test_utf8_bom_stripped(self):
+        csv_bytes = codecs.BOM_UTF8 + b"a,b\n1,2"
+        assert list(parse_upload(_encode(csv_bytes), "bom.csv").columns) == ["a", "b"]
+
+
+class TestParseStats:
+    def test_pyarrow_engine_reports_throughput(self):
+        df, stats = parse_upload_with_stats(_encode(b"a,b\n1,2\n3,4\n"), "d.csv")
+        assert stats.engine == "pyarrow"
+        assert not stats.fallback
+        assert stats.rows == len(df) == 2
+        assert stats.bytes == 12
+        assert stats.mb_per_s > 0
+
+    def test_falls_back_to_c_engine(self, monkeypatch):
+        monkeypatch.setattr(arrow_csv, "SAMPLE_BYTES", 16)
+        csv_bytes = b"a,b\n" + b"1,2\n" * 10 + b"x,3\n"
+        df, stats = parse_upload_with_stats(_encode(csv_bytes), "d.csv")
+        assert stats.engine == "c"
+        assert stats.fallback
+        assert df["a"].iloc[-1] == "x"
+
+    def test_short_rows_padded_by_c_engine(self):
+        csv_bytes = b"a,b,c\n1,2,3\n4,5\n7,8,9"
+        df, stats = parse_upload_with_stats(_encode(csv_bytes), "d.csv", "pyarrow")
+        assert stats.fallback
+        assert df["a"].tolist() == [1, 4, 7]
+        assert df["c"].isna().tolist() == [False, True, False]
+
+    def test_engines_agree(self):
+        csv_bytes = b"a,b,c\n1,x,\n2,,1.5\n"
+        arrow_df, _ = parse_upload_with_stats(_encode(csv_bytes), "d.csv", "pyarrow")
+        c_df, stats = parse_upload_with_stats(_encode(csv_bytes), "d.csv", "c")
+        assert stats.engine == "c"
+        pd.testing.assert_frame_equal(arrow_df, c_df)
+
+    def test_malformed_rows_counted(self):
+        _, stats = parse_upload_with_stats(_encode(b"a,b\n1,2\n3,4,5\n"), "d.csv")
+        assert stats.skipped_rows == 1
+
+
+def _zip(members: dict) -> bytes:
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return out.getvalue()
+
+
+class TestCompressedUploads:
+    CSV = b"a,b\n1,x\n2,y\n3,z\n"
+
+    @pytest.mark.parametrize(
+        "payload,filename",
+        [
+            (gzip.compress(CSV), "data.csv.gz"),
+            (bz2.compress(CSV), "data.csv.bz2"),
+            (_zip({"inner/data.csv": CSV}), "export.zip"),
+        ],
+    )
+    def test_compressed_csv(self, payload, filename):
+        result = parse_upload(_encode(payload), filename)
+        pd.testing.assert_frame_equal(result, pd.read_csv(io.BytesIO(self.CSV)))
+
+    def test_compressed_json(self):
+        payload = gzip.compress(json.dumps([{"a": 1}, {"a": 2}]).encode())
+        assert parse_upload(_encode(payload), "d.json.gz")["a"].tolist() == [1, 2]
+
+    def test_recorded_sizes(self):
+        assert open_upload(_encode(gzip.compress(self.CSV)), "d.csv.gz").size == len(
+            self.CSV
+        )
+        assert open_upload(_encode(_zip({"d.csv": self.CSV})), "d.zip").size == len(
+            self.CSV
+        )
+        assert open_upload(_encode(bz2.compress(self.CSV)), "d.csv.bz2").size is None
+
+    def test_file_closed_after_use(self, tmp_path):
+        path = tmp_path / "upload.part"
+        path.write_bytes(gzip.compress(self.CSV))
+        with file_parser.open_file(str(path), "d.csv.gz") as upload:
+            raw = upload.stream.fileobj
+            assert not raw.closed
+        assert raw.closed
+
+    def test_file_closed_on_error(self, tmp_path):
+        path = tmp_path / "upload.part"
+        path.write_bytes(self.CSV)
+        with pytest.raises(RuntimeError):
+            with file_parser.open_file(str(path), "d.csv") as upload:
+                raise RuntimeError
+        assert upload.stream.closed
+
+    def test_stats_count_decompressed_bytes(self):
+        _, stats = parse_upload_with_stats(_encode(bz2.compress(self.CSV)), "d.csv.bz2")
+        assert stats.bytes == len(self.CSV)
+
+    def test_unsupported_inner_format(self):
+        assert parse_upload(_encode(gzip.compress(b"x")), "notes.txt.gz") is None
+        assert parse_upload(_encode(_zip({"notes.txt": b"x"})), "n.zip") is None
+
+    def test_zip_needs_exactly_one_file(self):
+        payload = _zip({"a.csv": self.CSV, "b.csv": self.CSV, "__MACOSX/._a.csv": b""})
+        with pytest.raises(ValueError, match="exactly one file"):
+            parse_upload(_encode(payload), "both.zip")
+
+    def test_compressed_csv_streams_in_chunks(self):
+        chunks = parse_upload_chunks(
+            _encode(gzip.compress(self.CSV)), "d.csv.gz", chunk_rows=2
+        )
+        assert [len(c) for c in chunks] == [2, 1]
+
+    def test_arrow_reads_compressed_stream_past_sample(self, monkeypatch):
+        monkeypatch.setattr(arrow_csv, "SAMPLE_BYTES", 8)
+        csv_bytes = b"a,b\n" + b"1,x\n" * 500
+        df, stats = parse_upload_with_stats(
+            _encode(gzip.compress(csv_bytes)), "d.csv.gz"
+        )
+        assert stats.engine == "pyarrow"
+        assert len(df) == 500
+
+
+def _columnar(df: pd.DataFrame, fmt: str) -> bytes:
+    out = io.BytesIO()
+    if fmt == "parquet":
+        df.to_parquet(out, index=False)
+    elif fmt == "feather":
+        df.to_feather(out)
+    else:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.ipc.new_stream(out, table.schema) as writer:
+            writer.write_table(table, max_chunksize=2)
+    return out.getvalue()
+
+
+class TestColumnarUploads:
+    DF = pd.DataFrame(
+        {
+            "n": [1, 2, 3],
+            "when": pd.to_datetime(["2024-01-01", "2024-02-01", None]),
+            "cat": pd.Categorical(["a", "b", "a"]),
+        }
+    )
+
+    @pytest.mark.parametrize(
+        "fmt,filename",
+        [("parquet", "d.parquet"), ("feather", "d.feather"), ("arrow", "d.arrow")],
+    )
+    def test_types_survive_upload(self, fmt, filename):
+        df, stats = parse_upload_with_stats(_encode(_columnar(self.DF, fmt)), filename)
+        assert stats.engine == fmt
+        pd.testing.assert_frame_equal(df, self.DF)
+
+    def test_parquet_size_is_uncompressed(self):
+        df = pd.DataFrame({"x": [0] * 100_000})
+        upload = open_upload(_encode(_columnar(df, "parquet")), "d.parquet")
+        assert upload.size > len(upload.stream.getbuffer())
+
+    @pytest.mark.parametrize("fmt", ["parquet", "feather", "arrow"])
+    def test_columnar_streams_in_chunks(self, fmt):
+        df = pd.DataFrame({"x": range(5)})
+        chunks = parse_upload_chunks(
+            _encode(_columnar(df, fmt)), f"d.{fmt}", chunk_rows=2
+        )
+        assert [len(c) for c in chunks] == [2, 2, 1]
+
+
+class TestNdjsonUploads:
+    NDJSON = b'{"a": 1, "u": {"n": "x"}}\n{"a": 2, "u": {"n": "y"}}\n'
+
+    @pytest.mark.parametrize("filename", ["events.ndjson", "events.jsonl"])
+    def test_ndjson_upload(self, filename):
+        result = parse_upload(_encode(self.NDJSON, "application/json"), filename)
+        assert list(result.columns) == ["a", "u.n"]
+        assert result["a"].tolist() == [1, 2]
+
+    def test_ndjson_in_json_file(self):
+        result = parse_upload(_encode(self.NDJSON, "application/json"), "events.json")
+        assert len(result) == 2
+
+    def test_json_streams_in_chunks(self):
+        payload = _encode(gzip.compress(self.NDJSON))
+        chunks = parse_upload_chunks(payload, "e.jsonl.gz", chunk_rows=1)
+        assert [len(c) for c in chunks] == [1, 1]
@@ -15,7 +15,7 @@ from pyexploratory.core import history
 @pytest.fixture(autouse=True)
 def tmp_history(tmp_path, monkeypatch):
     """Redirect history to temp directory."""
-    data_file = str(tmp_path / "local_data.csv")
+    data_file = str(tmp_path / "local_data.parquet")
     hist_dir = str(tmp_path / ".pyexploratory_history")
     monkeypatch.setattr("pyexploratory.core.history.DATA_FILE", data_file)
     monkeypatch.setattr("pyexploratory.core.history.HISTORY_DIR", hist_dir)
@@ -23,7 +23,7 @@ def tmp_history(tmp_path, monkeypatch):
     # Reset redo stack between tests
     history._redo_stack.clear()
     # Write initial data
-    pd.DataFrame({"a": [1, 2, 3]}).to_csv(data_file, index=False)
+    pd.DataFrame({"a": [1, 2, 3]}).to_parquet(data_file, index=False)
     history.init_history()
     return data_file, hist_dir
 
@@ -40,7 +40,7 @@ class TestSaveAndUndo:
         # Save snapshot of original (3 rows)
         history.save_snapshot("dropna", "a", "Drop NA on a")
         # Simulate cleaning: overwrite with 2 rows
-        pd.DataFrame({"a": [1, 2]}).to_csv(data_file, index=False)
+        pd.DataFrame({"a": [1, 2]}).to_parquet(data_file, index=False)
         # Undo should restore 3 rows
         df = history.undo()
         assert df is not None
@@ -49,7 +49,7 @@ class TestSaveAndUndo:
     def test_redo_after_undo(self, tmp_history):
         data_file, _ = tmp_history
         history.save_snapshot("dropna", "a", "Drop NA")
-        pd.DataFrame({"a": [1, 2]}).to_csv(data_file, index=False)
+        pd.DataFrame({"a": [1, 2]}).to_parquet(data_file, index=False)
         history.undo()  # back to 3 rows
         df = history.redo()  # forward to 2 rows
         assert df is not None
@@ -70,7 +70,7 @@ class TestSaveAndUndo:
     def test_new_save_clears_redo(self, tmp_history):
         data_file, _ = tmp_history
         history.save_snapshot("dropna", "a", "Op 1")
-        pd.DataFrame({"a": [1, 2]}).to_csv(data_file, index=False)
+        pd.DataFrame({"a": [1, 2]}).to_parquet(data_file, index=False)
         history.undo()
         # Now save a new operation — redo should be cleared
         history.save_snapshot("fillna", "a", "Op 2")
@@ -83,21 +83,3 @@ class TestClearHistory:
         history.save_snapshot("fillna", "a", "Op 2")
         history.clear_history()
         assert len(history.get_history_log()) == 0
-
-
-class TestPreview:
-    def test_preview_returns_metadata(self, tmp_history):
-        data_file, _ = tmp_history
-        df = pd.read_csv(data_file)
-        result = history.preview_operation(df, "dropna", "a")
-        assert "rows_before" in result
-        assert "rows_after" in result
-        assert result["rows_before"] == 3
-
-    def test_preview_does_not_modify_original(self, tmp_history):
-        data_file, _ = tmp_history
-        df = pd.read_csv(data_file)
-        original_len = len(df)
-        history.preview_operation(df, "dropna", "a")
-        # Original df should be unchanged
-        assert len(df) == original_len
@@ -0,0 +1,253 @@
+"""
+Tests for pyexploratory.core.ingest — parsing uploads into dataset files.
+"""
+
+import base64
+import bz2
+import io
+import os
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from pyexploratory.core import data_store, ingest, ingest_cache
+from pyexploratory.core.excel_stream import ExcelOptions
+
+
+@pytest.fixture(autouse=True)
+def tmp_ingest_cache(tmp_path, monkeypatch):
+    """Redirect the ingest cache to a temp directory."""
+    cache_dir = str(tmp_path / ".pyexploratory_ingest")
+    monkeypatch.setattr(ingest_cache, "INGEST_CACHE_DIR", cache_dir)
+    return cache_dir
+
+
+def _encode(content: bytes) -> str:
+    return "data:text/csv;base64," + base64.b64encode(content).decode("utf-8")
+
+
+class TestIngestUpload:
+    def test_writes_dataset_file(self, tmp_path):
+        path = str(tmp_path / "a.parquet")
+        result = ingest.ingest_upload(_encode(b"a,b\n1,2\n3,4"), "a.csv", path)
+        assert (result.status, result.rows, result.columns) == ("ok", 2, ("a", "b"))
+        assert pd.read_parquet(path)["a"].tolist() == [1, 3]
+
+    def test_optimize_reports_savings(self, tmp_path):
+        path = str(tmp_path / "a.parquet")
+        result = ingest.ingest_upload(_encode(b"a\n1\n2"), "a.csv", path, optimize=True)
+        assert result.report is not None
+        assert "a" in result.report.converted
+
+    def test_unsupported_and_errors_reported(self, tmp_path):
+        path = str(tmp_path / "a.parquet")
+        assert (
+            ingest.ingest_upload(_encode(b"x"), "a.txt", path).status == "unsupported"
+        )
+        result = ingest.ingest_upload(_encode(b"{not json"), "a.json", path)
+        assert result.status == "error"
+        assert result.error
+
+    def test_bz2_csv_written_in_chunks(self, tmp_path):
+        # bz2 does not record the decompressed size, so the upload is streamed
+        path = str(tmp_path / "a.parquet")
+        result = ingest.ingest_upload(
+            _encode(bz2.compress(b"a\n1\n2")), "a.csv.bz2", path
+        )
+        assert (result.status, result.rows, result.chunked) == ("ok", 2, True)
+        assert pd.read_parquet(path)["a"].tolist() == [1, 2]
+
+    def test_optimize_skipped_for_streamed_file(self, tmp_path):
+        path = str(tmp_path / "a.parquet")
+        payload = _encode(bz2.compress(b"a\n1\n2"))
+        result = ingest.ingest_upload(payload, "a.csv.bz2", path, optimize=True)
+        assert result.chunked and result.optimize_skipped
+        assert result.report is None
+        assert not ingest.ingest_upload(payload, "a.csv.bz2", path).optimize_skipped
+
+
+class TestIngestUploads:
+    def test_parallel_batch_keeps_order(self, tmp_path):
+        uploads = [(_encode(f"v\n{i}\n".encode()), f"m{i}.csv") for i in range(3)]
+        uploads.append((_encode(b"x"), "bad.txt"))
+        paths = [str(tmp_path / f"{i}.parquet") for i in range(4)]
+        results = ingest.ingest_uploads(uploads, paths)
+        assert [r.status for r in results] == ["ok", "ok", "ok", "unsupported"]
+        for i in range(3):
+            assert pd.read_parquet(paths[i])["v"].tolist() == [i]
+
+    def test_single_worker_runs_in_process(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(ingest, "UPLOAD_WORKERS", 1)
+        monkeypatch.setattr(ingest, "_get_pool", None)
+        uploads = [(_encode(b"v\n1"), "a.csv"), (_encode(b"v\n2"), "b.csv")]
+        paths = [str(tmp_path / "a.parquet"), str(tmp_path / "b.parquet")]
+        assert [r.rows for r in ingest.ingest_uploads(uploads, paths)] == [1, 1]
+
+
+class TestIngestFile:
+    def test_file_on_disk_ingested(self, tmp_path):
+        # Received files keep an opaque name; the original filename decides format
+        source = tmp_path / "0123.part"
+        source.write_bytes(b"a,b\n1,2\n3,4")
+        path = str(tmp_path / "a.parquet")
+        result = ingest.ingest_file(str(source), "a.csv", path)
+        assert (result.status, result.rows, result.filename) == ("ok", 2, "a.csv")
+        assert pd.read_parquet(path)["b"].tolist() == [2, 4]
+
+    def test_batch_of_files(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(ingest, "UPLOAD_WORKERS", 1)
+        monkeypatch.setattr(ingest, "_get_pool", None)
+        source = tmp_path / "in.part"
+        source.write_bytes(bz2.compress(b"v\n1\n2"))
+        paths = [str(tmp_path / "a.parquet"), str(tmp_path / "b.parquet")]
+        results = ingest.ingest_files(
+            [(str(source), "v.csv.bz2"), (str(source), "v.txt")], paths
+        )
+        assert [r.status for r in results] == ["ok", "unsupported"]
+        assert pd.read_parquet(paths[0])["v"].tolist() == [1, 2]
+
+
+class TestIngestDeduplication:
+    def test_same_upload_reused(self, tmp_path, monkeypatch):
+        upload = [(_encode(b"a,b\n1,x\n2,y"), "a.csv")]
+        first = ingest.ingest_uploads(upload, [str(tmp_path / "1.parquet")])[0]
+        # A second parse would fail; the cached file must be used instead
+        monkeypatch.setattr(ingest, "ingest_upload", None)
+        second = ingest.ingest_uploads(upload, [str(tmp_path / "2.parquet")])[0]
+        assert (first.reused, second.reused) == (False, True)
+        assert (second.rows, second.columns, second.path) == (
+            2,
+            ("a", "b"),
+            str(tmp_path / "2.parquet"),
+        )
+        pd.testing.assert_frame_equal(
+            pd.read_parquet(tmp_path / "1.parquet"),
+            pd.read_parquet(tmp_path / "2.parquet"),
+        )
+
+    def test_reused_copy_keeps_dataset_version(self, tmp_path):
+        upload = [(_encode(b"a\n1\n2"), "a.csv")]
+        paths = [str(tmp_path / "1.parquet"), str(tmp_path / "2.parquet")]
+        ingest.ingest_uploads(upload, paths[:1])
+        ingest.ingest_uploads(upload, paths[1:])
+        # Results cached for the first copy's version apply to the second
+        versions = {data_store.read_version(p) for p in paths}
+        assert len(versions) == 1
+
+    def test_key_covers_options_and_format(self, tmp_path):
+        contents = _encode(b"a\n1\n2")
+        path = str(tmp_path / "a.parquet")
+
+        def reused(contents, filename, optimize=False):
+            result = ingest.ingest_uploads([(contents, filename)], [path], optimize)
+            return result[0].reused
+
+        assert not reused(contents, "a.csv")
+        assert not reused(contents, "a.csv", optimize=True)
+        assert not reused(contents, "a.tsv")
+        # The MIME header and the file's name are not part of the key
+        renamed = contents.replace("text/csv", "application/vnd.ms-excel")
+        assert reused(renamed, "b.csv")
+
+    def test_failed_upload_not_cached(self, tmp_path, tmp_ingest_cache):
+        path = str(tmp_path / "a.parquet")
+        ingest.ingest_uploads([(_encode(b"{not json"), "a.json")], [path])
+        assert not os.path.exists(tmp_ingest_cache)
+
+    def test_files_on_disk_deduplicated(self, tmp_path):
+        source = tmp_path / "in.part"
+        source.write_bytes(b"v\n1\n2")
+        path = str(tmp_path / "a.parquet")
+        ingest.ingest_files([(str(source), "v.csv")], [path])
+        assert ingest.ingest_files([(str(source), "v.csv")], [path])[0].reused
+
+    def test_least_recently_used_entries_pruned(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(ingest_cache, "INGEST_CACHE_MAX_ENTRIES", 1)
+        path = str(tmp_path / "a.parquet")
+        ingest.ingest_uploads([(_encode(b"v\n1"), "a.csv")], [path])
+        ingest.ingest_uploads([(_encode(b"v\n2"), "a.csv")], [path])
+        results = ingest.ingest_uploads([(_encode(b"v\n1"), "a.csv")], [path])
+        assert not results[0].reused
+
+
+class TestIngestProgress:
+    def test_phases_of_one_file(self, tmp_path):
+        updates = []
+        ingest.ingest_uploads(
+            [(_encode(b"a\n1\n2\n3"), "a.csv")],
+            [str(tmp_path / "a.parquet")],
+            progress=updates.append,
+        )
+        assert [u.phase for u in updates] == ["checking", "parsing", "writing", "done"]
+        writing = updates[2]
+        assert (writing.rows, writing.bytes_parsed, writing.bytes_total) == (3, 7, 7)
+        assert updates[-1].fraction == 1.0
+
+    def test_streamed_file_reports_rows(self, tmp_path):
+        updates = []
+        ingest.ingest_uploads(
+            [(_encode(bz2.compress(b"a\n1\n2")), "a.csv.bz2")],
+            [str(tmp_path / "a.parquet")],
+            progress=updates.append,
+        )
+        parsing = [u for u in updates if u.phase == "parsing"]
+        # The decompressed size is unknown, but bytes read are counted
+        assert parsing[-1].rows == 2
+        assert parsing[-1].bytes_total is None
+        assert parsing[-1].bytes_parsed > 0
+
+    def test_batch_in_pool_counts_files(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(ingest, "UPLOAD_WORKERS", 2)
+        updates = []
+        uploads = [(_encode(f"v\n{i}\n".encode()), f"m{i}.csv") for i in range(3)]
+        paths = [str(tmp_path / f"{i}.parquet") for i in range(3)]
+        ingest.ingest_uploads(uploads, paths, progress=updates.append)
+        assert updates[-1] == ingest.IngestProgress("done", 3, 3, rows=3)
+        done = [u.files_done for u in updates if u.phase == "parsing"]
+        assert done == sorted(done) and done[-1] == 3
+
+    def test_reused_files_count_as_done(self, tmp_path):
+        upload = [(_encode(b"v\n1"), "a.csv")]
+        path = str(tmp_path / "a.parquet")
+        ingest.ingest_uploads(upload, [path])
+        updates = []
+        ingest.ingest_uploads(upload, [path], progress=updates.append)
+        assert [u.phase for u in updates] == ["checking", "done"]
+
+    def test_fraction(self):
+        progress = ingest.IngestProgress("parsing", 1, 4, bytes_parsed=50)
+        assert progress.fraction == 0.25
+        assert progress._replace(bytes_total=100).fraction == 0.375
+
+
+class TestExcelIngest:
+    def test_sheets_ingested_in_parallel(self, tmp_path):
+        workbook = openpyxl.Workbook()
+        workbook.active.append(["a"])
+        workbook.active.append([1])
+        second = workbook.create_sheet("Second")
+        for row in (["b", "c"], [2, 3], [4, 5]):
+            second.append(row)
+        out = io.BytesIO()
+        workbook.save(out)
+        contents = _encode(out.getvalue())
+
+        uploads = [(contents, "book.xlsx")] * 2
+        paths = [str(tmp_path / "1.parquet"), str(tmp_path / "2.parquet")]
+        options = [None, ExcelOptions(sheet="Second", nrows=1, usecols=("c",))]
+        first, second = ingest.ingest_uploads(uploads, paths, excel=options)
+        assert (first.rows, first.columns) == (1, ("a",))
+        assert (second.rows, second.columns) == (1, ("c",))
+
+    def test_text_stored_as_arrow_strings(self, tmp_path):
+        workbook = openpyxl.Workbook()
+        for row in (["name", "n"], ["x", 1], [None, 2], ["z", 3]):
+            workbook.active.append(row)
+        out = io.BytesIO()
+        workbook.save(out)
+        path = str(tmp_path / "a.parquet")
+        ingest.ingest_upload(_encode(out.getvalue()), "book.xlsx", path)
+        names = pd.read_parquet(path)["name"]
+        assert isinstance(names.dtype, pd.StringDtype)
+        assert names.dtype.storage == "pyarrow"
@@ -0,0 +1,81 @@
+"""
+Tests for pyexploratory.core.json_stream — incremental JSON parsing.
+"""
+
+import io
+import json
+
+import pandas as pd
+import pytest
+
+from pyexploratory.core import json_stream
+from pyexploratory.core.json_stream import iter_json_chunks, iter_records, read_json
+
+RECORDS = [
+    {"id": i, "user": {"name": f"u{i}", "age": 20 + i}, "ok": i % 2 == 0}
+    for i in range(25)
+]
+
+
+def _array(records) -> io.BytesIO:
+    return io.BytesIO(json.dumps(records, indent=1).encode("utf-8"))
+
+
+def _ndjson(records) -> io.BytesIO:
+    return io.BytesIO("\n".join(json.dumps(r) for r in records).encode("utf-8"))
+
+
+@pytest.fixture
+def small_reads(monkeypatch):
+    """Split every value across several reads."""
+    monkeypatch.setattr(json_stream, "READ_CHARS", 5)
+
+
+class TestIterRecords:
+    @pytest.mark.parametrize("source", [_array, _ndjson])
+    def test_records_across_reads(self, source, small_reads):
+        assert list(iter_records(source(RECORDS))) == RECORDS
+
+    def test_number_at_read_boundary(self, small_reads):
+        assert list(iter_records(io.BytesIO(b"1234567\n89"))) == [1234567, 89]
+
+    def test_single_object_is_one_record(self):
+        assert list(iter_records(io.BytesIO(b'{"a": [1, 2]}'))) == [{"a": [1, 2]}]
+
+    def test_utf16_detected(self):
+        stream = io.BytesIO(json.dumps([{"a": "é"}]).encode("utf-16"))
+        assert list(iter_records(stream)) == [{"a": "é"}]
+
+    def test_invalid_json_raises(self):
+        with pytest.raises(ValueError):
+            list(iter_records(io.BytesIO(b"[{not json}]")))
+
+
+class TestReadJson:
+    @pytest.mark.parametrize("source", [_array, _ndjson])
+    def test_matches_whole_document_normalize(self, source, monkeypatch):
+        monkeypatch.setattr(json_stream, "JSON_BATCH_RECORDS", 4)
+        pd.testing.assert_frame_equal(
+            read_json(source(RECORDS)), pd.json_normalize(RECORDS)
+        )
+
+    def test_key_missing_from_a_batch(self, monkeypatch):
+        monkeypatch.setattr(json_stream, "JSON_BATCH_RECORDS", 2)
+        df = read_json(_ndjson([{"a": 1}, {"a": 2}, {"b": "x"}]))
+        assert list(df.columns) == ["a", "b"]
+        assert df["a"].dtype == "float64"
+        assert df["a"].isna().tolist() == [False, False, True]
+
+    def test_empty_array(self):
+        assert read_json(io.BytesIO(b" [ ] ")).empty
+
+
+class TestJsonChunks:
+    def test_chunks_share_columns_and_dtypes(self):
+        records = [{"a": 1}, {"a": None}, {"a": 2.5, "b": True}, {"a": 3}]
+        chunks = list(iter_json_chunks(_ndjson(records), chunk_rows=2))
+        assert [len(c) for c in chunks] == [2, 2]
+        for chunk in chunks:
+            assert list(chunk.columns) == ["a", "b"]
+            assert chunk["a"].dtype == "float64"
+            assert chunk["b"].dtype == object
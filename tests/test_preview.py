@@ -0,0 +1,150 @@
+"""
+Tests for pyexploratory.core.preview.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyexploratory.core import data_store
+from pyexploratory.core.cleaning_ops import apply_operation
+from pyexploratory.core.dtype_optimizer import ARROW_STRING_DTYPE
+from pyexploratory.core.preview import (
+    preview_chunks,
+    preview_operation,
+    stratified_sample,
+)
+
+
+@pytest.fixture
+def large_df():
+    n = 20_000
+    rng = np.random.default_rng(1)
+    age = rng.integers(18, 80, n).astype(float)
+    # 2% missing, clustered at the end of the file
+    age[-400:] = np.nan
+    return pd.DataFrame(
+        {
+            "age": age,
+            "city": pd.Series(
+                rng.choice(["NY", "la", "Rome"], n), dtype=ARROW_STRING_DTYPE
+            ),
+        }
+    )
+
+
+def _chunks(df, size):
+    return [df.iloc[i : i + size] for i in range(0, len(df), size)]
+
+
+class TestExact:
+    def test_row_counts(self, sample_df):
+        result = preview_operation(sample_df, "dropna", "age", exact=True)
+        assert (result.rows_before, result.rows_after, result.rows_affected) == (
+            5,
+            4,
+            1,
+        )
+        assert result.sample_rows is None
+
+    def test_does_not_modify_original(self, sample_df):
+        original = sample_df.copy()
+        preview_operation(sample_df, "fillna", "age", "0", exact=True)
+        pd.testing.assert_frame_equal(sample_df, original)
+
+    def test_changed_cells_and_nulls(self, sample_df):
+        result = preview_operation(sample_df, "fillna", ["age", "name"], "0")
+        assert result.changed_cells == 2
+        assert result.null_delta == {"age": -1, "name": -1}
+
+    def test_changed_cells_match_full_run(self, sample_df):
+        result = preview_operation(sample_df, "lowercase", "city")
+        after = apply_operation(sample_df.copy(), "lowercase", "city")
+        assert result.changed_cells == (after["city"] != sample_df["city"]).sum()
+
+    def test_sort_changes_no_cells(self, sample_df):
+        result = preview_operation(sample_df, "sort_desc", "salary")
+        assert result.changed_cells == 0
+        assert result.rows_affected == 0
+
+    def test_dtype_changes(self):
+        df = pd.DataFrame({"n": ["1", "2", "x"]})
+        result = preview_operation(df, "to_numeric", "n")
+        assert result.dtype_changes == {"n": (str(df["n"].dtype), "float64")}
+        assert result.changed_cells == 3
+        assert result.null_delta == {"n": 1}
+
+    def test_rename_and_drop(self, sample_df):
+        renamed = preview_operation(sample_df, "rename_column", "city", new_name="town")
+        assert renamed.changed_cells == 0
+        assert renamed.columns_dropped == []
+        dropped = preview_operation(sample_df, "drop_column", "city")
+        assert dropped.columns_dropped == ["city"]
+
+    def test_empty_frame_rejected(self):
+        with pytest.raises(ValueError):
+            preview_operation(pd.DataFrame({"a": []}), "trim", "a")
+
+
+class TestSampled:
+    def test_small_sample_estimates_dropna(self, large_df):
+        result = preview_operation(large_df, "dropna", "age", sample_rows=500)
+        assert result.sample_rows == 500
+        assert result.rows_before == 20_000
+        # Missing rows are a stratum of their own, so the estimate is exact
+        assert result.rows_affected == 400
+        assert result.null_delta == {"age": -400}
+
+    def test_estimates_changed_cells(self, large_df):
+        result = preview_operation(large_df, "lowercase", "city", sample_rows=2_000)
+        expected = (large_df["city"] != large_df["city"].str.lower()).sum()
+        assert result.changed_cells == pytest.approx(expected, rel=0.1)
+        assert result.estimated_seconds > 0
+
+    def test_exact_mode_uses_every_row(self, large_df):
+        result = preview_operation(
+            large_df, "lowercase", "city", exact=True, sample_rows=500
+        )
+        assert result.sample_rows is None
+
+    def test_drop_duplicates_always_exact(self, large_df):
+        result = preview_operation(large_df, "drop_duplicates", "city", sample_rows=10)
+        assert result.sample_rows is None
+        assert result.rows_after == 3
+
+
+class TestStratifiedSample:
+    def test_weights_sum_to_rows(self, large_df):
+        sample, weights = stratified_sample(large_df, ["age"], 1_000)
+        assert weights.sum() == pytest.approx(len(large_df))
+        assert sample.index.is_monotonic_increasing
+
+    def test_rare_stratum_represented(self):
+        df = pd.DataFrame({"a": [1.0] * 9_999 + [np.nan]})
+        sample, _ = stratified_sample(df, ["a"], 100)
+        assert sample["a"].isna().sum() == 1
+
+    def test_spans_whole_frame(self, large_df):
+        sample, _ = stratified_sample(large_df, ["city"], 100)
+        assert sample.index.min() < 200
+        assert sample.index.max() > 19_800
+
+
+class TestChunks:
+    def test_matches_in_memory_estimate(self, large_df):
+        result = preview_chunks(
+            _chunks(large_df, 5_000), len(large_df), "dropna", "age", sample_rows=800
+        )
+        assert result.rows_before == 20_000
+        assert result.rows_affected == 400
+        assert result.sample_rows == 800
+
+    def test_whole_column_ops_refused(self, tmp_data_file, sample_df):
+        data_store.write_data_chunks(_chunks(sample_df, 2))
+        with pytest.raises(ValueError, match="chunk by chunk"):
+            preview_chunks(
+                data_store.iter_chunks(chunk_rows=2),
+                len(sample_df),
+                "drop_duplicates",
+                "city",
+            )
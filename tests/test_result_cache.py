@@ -0,0 +1,70 @@
+"""
+Tests for pyexploratory.core.result_cache — version-keyed memoization.
+"""
+
+import pandas as pd
+import pytest
+
+from pyexploratory.core import data_store, result_cache
+
+
+@pytest.fixture(autouse=True)
+def tmp_cache(tmp_path, monkeypatch, tmp_data_file):
+    """Redirect the result cache to a temp directory."""
+    cache_dir = str(tmp_path / ".pyexploratory_cache")
+    monkeypatch.setattr(result_cache, "RESULT_CACHE_DIR", cache_dir)
+    return cache_dir
+
+
+class _Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {"value": self.calls}
+
+
+class TestCachedResult:
+    def test_second_call_hits(self):
+        compute = _Counter()
+        first = result_cache.cached_result("summary", {"col": "a"}, compute)
+        second = result_cache.cached_result("summary", {"col": "a"}, compute)
+        assert first == second
+        assert compute.calls == 1
+
+    def test_params_are_part_of_the_key(self):
+        compute = _Counter()
+        result_cache.cached_result("chart", {"x": "a"}, compute)
+        result_cache.cached_result("chart", {"x": "b"}, compute)
+        assert compute.calls == 2
+
+    def test_new_data_misses(self):
+        compute = _Counter()
+        result_cache.cached_result("summary", {}, compute)
+        data_store.write_data(pd.DataFrame({"z": [1]}))
+        result_cache.cached_result("summary", {}, compute)
+        assert compute.calls == 2
+
+    def test_returning_to_previous_state_hits(self):
+        original = data_store.read_data()
+        compute = _Counter()
+        result_cache.cached_result("summary", {}, compute)
+        data_store.write_data(pd.DataFrame({"z": [1]}))
+        data_store.write_data(original)
+        result_cache.cached_result("summary", {}, compute)
+        assert compute.calls == 1
+
+    def test_errors_are_not_cached(self):
+        def failing():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            result_cache.cached_result("ml", {}, failing)
+        assert result_cache.cached_result("ml", {}, _Counter()) == {"value": 1}
+
+    def test_old_versions_pruned(self, monkeypatch, tmp_cache):
+        monkeypatch.setattr(result_cache, "RESULT_CACHE_MAX_VERSIONS", 2)
+        for version in ["v1", "v2", "v3"]:
+            result_cache.cached_result("summary", {}, _Counter(), version=version)
+        assert len(list(__import__("os").listdir(tmp_cache))) == 2
@@ -0,0 +1,66 @@
+"""
+Tests for pyexploratory.core.summary_stats — incremental Summary statistics.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyexploratory.core.catalog import build_catalog
+from pyexploratory.core.summary_stats import summarize_chunks
+
+
+def _chunks(df, size):
+    return [df.iloc[i : i + size] for i in range(0, len(df), size)]
+
+
+@pytest.fixture
+def numbers():
+    rng = np.random.default_rng(0)
+    values = rng.normal(50, 10, 1000)
+    values[::50] = np.nan
+    return pd.DataFrame({"x": values})
+
+
+class TestNumericColumns:
+    def test_moments_exact(self, numbers):
+        summary = summarize_chunks(_chunks(numbers, 128), build_catalog(numbers))
+        stats = dict(summary["x"].statistics)
+        expected = numbers["x"].describe()
+        for key in ("count", "mean", "std", "min", "max"):
+            assert stats[key] == pytest.approx(expected[key])
+
+    def test_quartiles_approximate(self, numbers):
+        summary = summarize_chunks(_chunks(numbers, 128), build_catalog(numbers))
+        stats = dict(summary["x"].statistics)
+        expected = numbers["x"].describe()
+        for key in ("25%", "50%", "75%"):
+            assert stats[key] == pytest.approx(expected[key], abs=1.5)
+
+    def test_histogram_counts_every_value(self, numbers):
+        summary = summarize_chunks(_chunks(numbers, 128), build_catalog(numbers))
+        assert summary["x"].bin_counts.sum() == numbers["x"].notna().sum()
+
+    def test_constant_column(self):
+        df = pd.DataFrame({"x": [3.0] * 5})
+        stats = dict(
+            summarize_chunks(_chunks(df, 2), build_catalog(df))["x"].statistics
+        )
+        assert stats["50%"] == 3.0
+
+
+class TestValueColumns:
+    def test_value_counts_merged_across_chunks(self, sample_df):
+        summary = summarize_chunks(_chunks(sample_df, 2), build_catalog(sample_df))
+        stats = dict(summary["city"].statistics)
+        assert (stats["count"], stats["unique"]) == (5, 2)
+        assert (stats["top"], stats["freq"]) == ("NYC", 3)
+        assert summary["city"].top_values.to_dict() == {"NYC": 3, "LA": 2}
+
+    def test_high_cardinality_skips_counts(self, sample_df, monkeypatch):
+        from pyexploratory.core import summary_stats
+
+        monkeypatch.setattr(summary_stats, "MAX_TRACKED_VALUES", 1)
+        summary = summarize_chunks(_chunks(sample_df, 2), build_catalog(sample_df))
+        assert summary["name"].top_values is None
+        assert dict(summary["name"].statistics)["top"] is None
@@ -8,15 +8,19 @@ ML input validation, and classification target validation.
 import pandas as pd
 import pytest
 
+from pyexploratory.core.catalog import build_catalog
+from pyexploratory.core.cleaning_ops import CleaningStep
 from pyexploratory.core.validators import (
     validate_classification_target,
     validate_cleaning_compatibility,
     validate_column_exists,
+    validate_columns,
     validate_min_rows,
     validate_ml_inputs,
     validate_not_all_nan,
     validate_not_empty,
     validate_numeric_column,
+    validate_recipe,
     validate_string_column,
 )
 
@@ -98,6 +102,70 @@ class TestCleaningCompatibility:
         assert validate_cleaning_compatibility(sample_df, "normalize", "age") is None
 
 
+class TestRecipe:
+    def test_valid_recipe(self, sample_df):
+        steps = [CleaningStep("trim", "name"), CleaningStep("normalize", "age")]
+        assert validate_recipe(sample_df, steps) is None
+
+    def test_renamed_column_followed(self, sample_df):
+        steps = [
+            CleaningStep("rename_column", "name", new_name="label"),
+            CleaningStep("lowercase", "label"),
+        ]
+        assert validate_recipe(sample_df, steps) is None
+        assert "Step 2" in validate_recipe(sample_df, steps[:1] * 2)
+
+    def test_dropped_column_rejected(self, sample_df):
+        steps = [CleaningStep("drop_column", "age"), CleaningStep("fillna", "age")]
+        assert "Step 2" in validate_recipe(sample_df, steps)
+
+    def test_type_checked_until_changed(self, sample_df):
+        assert "Step 1" in validate_recipe(sample_df, [CleaningStep("trim", "age")])
+        # After to_string the column is text, which the catalog cannot know yet
+        steps = [CleaningStep("to_string", "age"), CleaningStep("trim", "age")]
+        assert validate_recipe(sample_df, steps) is None
+
+
+class TestColumnSets:
+    def test_list_and_selector(self, sample_df):
+        assert validate_columns(sample_df, ["age", "score"]) is None
+        assert validate_columns(sample_df, "@numeric") is None
+        assert "'xyz'" in validate_columns(sample_df, ["age", "xyz"])
+        assert "datetime" in validate_columns(sample_df, "@datetime")
+
+    def test_every_column_type_checked(self, sample_df):
+        error = validate_cleaning_compatibility(sample_df, "normalize", ["age", "name"])
+        assert "'name'" in error
+        assert validate_cleaning_compatibility(sample_df, "trim", "@text") is None
+
+    def test_rename_takes_one_column(self, sample_df):
+        error = validate_cleaning_compatibility(
+            sample_df, "rename_column", ["age", "score"]
+        )
+        assert error is not None
+
+    def test_recipe_follows_column_sets(self, sample_df):
+        steps = [
+            CleaningStep("drop_column", ["age", "score"]),
+            CleaningStep("normalize", "@numeric"),
+        ]
+        assert "Step 2" in validate_recipe(sample_df, steps)
+        steps = [CleaningStep("to_string", "@all"), CleaningStep("trim", "@text")]
+        assert validate_recipe(sample_df, steps) is None
+
+    def test_arrow_strings_are_text(self, sample_df):
+        df = sample_df.astype({"name": "string[pyarrow]"})
+        for source in (df, build_catalog(df)):
+            assert validate_cleaning_compatibility(source, "trim", "name") is None
+            assert validate_cleaning_compatibility(source, "trim", "@text") is None
+            assert validate_cleaning_compatibility(source, "normalize", "name")
+
+    def test_catalog_selector(self, sample_df):
+        catalog = build_catalog(sample_df)
+        assert validate_cleaning_compatibility(catalog, "normalize", "@numeric") is None
+        assert validate_columns(catalog, "@text") is None
+
+
 class TestMLInputs:
     def test_valid(self, sample_df):
         assert validate_ml_inputs(sample_df, "age", "score", min_samples=3) is None
@@ -116,3 +184,31 @@ class TestClassificationTarget:
         df = pd.DataFrame({"target": ["a", "a", "a"]})
         result = validate_classification_target(df, "target")
         assert result is not None
+
+
+class TestCatalogSource:
+    """Validators give the same answers from the write-time catalog."""
+
+    @pytest.fixture
+    def catalog(self, sample_df):
+        return build_catalog(sample_df)
+
+    def test_column_exists(self, catalog):
+        assert validate_column_exists(catalog, "name") is None
+        assert validate_column_exists(catalog, "xyz") is not None
+
+    def test_numeric_column(self, catalog):
+        assert validate_numeric_column(catalog, "age") is None
+        assert "numeric" in validate_numeric_column(catalog, "name").lower()
+
+    def test_cleaning_compatibility(self, catalog):
+        assert validate_cleaning_compatibility(catalog, "lowercase", "age") is not None
+        assert validate_cleaning_compatibility(catalog, "lowercase", "name") is None
+
+    def test_ml_inputs(self, catalog):
+        assert validate_ml_inputs(catalog, "age", "score", min_samples=3) is None
+        assert validate_ml_inputs(catalog, "age", "score", min_samples=10) is not None
+
+    def test_classification_target(self):
+        catalog = build_catalog(pd.DataFrame({"target": ["a", "a", "a"]}))
+        assert validate_classification_target(catalog, "target") is not None